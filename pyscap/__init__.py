@@ -1,3 +1,26 @@
-from . import arf, cpe, ocil, oval, sds, xccdf
+import os
+from importlib import import_module
+
+from .common import metadata
+from .common.parallel import ParseResult, parse_many
+from .common.utils import get_backend, register_backend, set_backend
 
 __version__ = "0.1.3"
+
+# The subpackages are imported on first access, so that e.g. ``pyscap.oval``
+# does not pay for the XCCDF or ARF bindings.
+SUBPACKAGES = ("arf", "cpe", "ocil", "oval", "sds", "xccdf")
+
+
+def __getattr__(name):
+    if name in SUBPACKAGES:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBPACKAGES))
+
+
+if os.environ.get("PYSCAP_METADATA_CACHE"):
+    metadata.load()
@@ -0,0 +1,113 @@
+"""
+Correctness and speed of the conversion of XCCDF documents.
+
+Run with ``python -m pyscap.benchmarks.conversion``, the exit status is 1
+when a converted document does not parse back with the expected content.
+"""
+import argparse
+import io
+import sys
+import time
+
+from . import documents
+from ..common.utils import scap_parser
+from ..xccdf import xccdf_1_1, xccdf_1_2
+from ..xccdf.conversion import convert_file
+
+XCCDF_1_1 = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    f'<Benchmark xmlns="{xccdf_1_1.XCCDF_1_1_NAMESPACE}" xmlns:h="{documents.XHTML}" '
+    'id="benchmark" resolved="1">'
+    "<status>draft</status><title>Conversion</title>"
+    '<description>Set <sub idref="timeout"/> in <h:code>sshd_config</h:code>.</description>'
+    "<version>1.0</version>"
+    '<Value id="timeout"><title>Timeout</title><value>300</value></Value>'
+    '<Group id="ssh"><title>SSH</title>'
+    '<Rule id="installed" selected="true"><title>Installed</title></Rule>'
+    '<Rule id="configured" selected="true"><title>Configured</title>'
+    '<description>Use <sub idref="timeout"/> seconds.</description>'
+    '<requires idref="installed ssh"/><conflicts idref="installed"/></Rule>'
+    "</Group></Benchmark>"
+).encode()
+NAMESPACE = "org.pyscap"
+
+
+def _id(kind, name):
+    return f"xccdf_{NAMESPACE}_{kind}_{name}"
+
+
+def convert(data, namespace=None):
+    """Return a converted document as bytes."""
+    output = io.BytesIO()
+    convert_file(data, output, namespace)
+    return output.getvalue()
+
+
+def check():
+    """Return the differences between the documents converted back and
+    forth and their expected content, as ``(what, expected, actual)``
+    tuples. Documents that do not parse back fail with their error."""
+    failures = []
+
+    def expect(what, expected, actual):
+        if expected != actual:
+            failures.append((what, expected, actual))
+
+    for version, data, cls in (
+        ("1.2", lambda: convert(XCCDF_1_1, NAMESPACE), xccdf_1_2.Benchmark),
+        ("1.1", lambda: convert(convert(XCCDF_1_1, NAMESPACE)), xccdf_1_1.Benchmark),
+    ):
+        try:
+            benchmark = scap_parser.from_bytes(data(), cls)
+        except Exception as error:
+            failures.append((f"{version} document", "parsed", f"{type(error).__name__}: {error}"))
+            continue
+        ids = (lambda kind, name: name) if version == "1.1" else _id
+        rule = benchmark.group[0].rule[1]
+        expect(f"{version} requires", [ids("rule", "installed"), ids("group", "ssh")],
+               [idref for requires in rule.requires for idref in requires.idref])
+        expect(f"{version} conflicts", [ids("rule", "installed")],
+               [conflicts.idref for conflicts in rule.conflicts])
+        for what, text in (("benchmark", benchmark.description[0]), ("rule", rule.description[0])):
+            subs = [
+                part.idref for part in text.w3_org_1999_xhtml_element
+                if hasattr(part, "idref")
+            ]
+            expect(f"{version} {what} sub", [ids("value", "timeout")], subs)
+    return failures
+
+
+def run(size=1000, repeat=3):
+    """Yield ``(direction, seconds, rules/s)`` rows for a ``size`` rule
+    benchmark converted to 1.1 and back."""
+    data = documents.xccdf_benchmark(size)
+    for direction in ("1.2 -> 1.1", "1.1 -> 1.2"):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            converted = convert(data, NAMESPACE)
+            best = min(best, time.perf_counter() - start)
+        data = converted
+        yield direction, best, size / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="rules per benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    for what, expected, actual in failures:
+        print(f"{what}: {actual!r}, expected {expected!r}")
+    print(f"{len(failures)} failures in the known answer conversions")
+
+    print(f"{'direction':<12}{'seconds':>10}{'rules/s':>12}")
+    for direction, seconds, rate in run(args.size, args.repeat):
+        print(f"{direction:<12}{seconds:>10.3f}{rate:>12,.0f}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Correctness and speed of the dispatch of rule checks in data streams.
+
+Run with ``python -m pyscap.benchmarks.dispatch``, the exit status is 1
+when a check is resolved to the wrong component of a collection.
+"""
+import argparse
+import sys
+import time
+
+from . import documents
+from ..sds import DataStreamCollection
+from ..xccdf import CheckDispatcher
+
+
+def check(streams=3):
+    """Return the checks of the benchmarks of a collection resolved to
+    other definitions than those of their own data stream, as ``(rule,
+    expected component, actual component)`` tuples. Every catalog names its
+    definitions ``oval.xml``, only the catalog of the component reference
+    holding a benchmark may resolve its checks."""
+    collection = DataStreamCollection.parse(documents.data_stream_collection(2, streams))
+    components = {
+        id(component.oval_definitions): component.id
+        for component in collection.component
+        if component.oval_definitions is not None
+    }
+    failures = []
+    for n in range(1, streams + 1):
+        benchmark = collection.get_component(f"scap_org.pyscap_comp_xccdf_{n}").benchmark
+        expected = f"scap_org.pyscap_comp_oval_{n}"
+        definitions = collection.get_component(expected).oval_definitions
+        dispatcher = CheckDispatcher(benchmark, collection)
+        for rule, checks in dispatcher.table.items():
+            for target in (target for targets in checks for target in targets):
+                if target.document is not definitions or target.content is None:
+                    actual = components.get(id(target.document))
+                    failures.append((f"stream {n} {rule}", expected, actual))
+    return failures
+
+
+def run(size=1000, repeat=3):
+    """Return the seconds to resolve the checks of a ``size`` rule
+    benchmark of a parsed collection, and the microseconds to look up the
+    targets of one rule."""
+    collection = DataStreamCollection.parse(documents.data_stream_collection(size))
+    benchmark = collection.get_component("scap_org.pyscap_comp_xccdf_1").benchmark
+    rules = [f"xccdf_org.pyscap_rule_{i}" for i in range(1, size + 1)]
+    prepare = lookup = float("inf")
+    for _ in range(repeat):
+        dispatcher = CheckDispatcher(benchmark, collection)
+        start = time.perf_counter()
+        dispatcher.table
+        prepare = min(prepare, time.perf_counter() - start)
+        start = time.perf_counter()
+        for rule in rules:
+            dispatcher.targets(rule)
+        lookup = min(lookup, time.perf_counter() - start)
+    return prepare, lookup / size * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="rules per benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    for rule, expected, actual in failures:
+        print(f"{rule} resolved to {actual!r}, expected {expected!r}")
+    print(f"{len(failures)} failures in the known answer dispatches")
+
+    prepare, lookup = run(args.size, args.repeat)
+    print(f"{prepare:.3f} s to resolve {args.size} rules, {lookup:.1f} us per rule lookup")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
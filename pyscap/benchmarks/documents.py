@@ -0,0 +1,225 @@
+"""Synthetic SCAP documents used by the benchmarks."""
+
+OVAL_DEFINITIONS = "http://oval.mitre.org/XMLSchema/oval-definitions-5"
+OVAL_LINUX = "http://oval.mitre.org/XMLSchema/oval-definitions-5#linux"
+OVAL_COMMON = "http://oval.mitre.org/XMLSchema/oval-common-5"
+OVAL_SC = "http://oval.mitre.org/XMLSchema/oval-system-characteristics-5"
+OVAL_SC_LINUX = "http://oval.mitre.org/XMLSchema/oval-system-characteristics-5#linux"
+XCCDF = "http://checklists.nist.gov/xccdf/1.2"
+ARF = "http://scap.nist.gov/schema/asset-reporting-format/1.1"
+SDS = "http://scap.nist.gov/schema/scap/source/1.2"
+XLINK = "http://www.w3.org/1999/xlink"
+CATALOG = "urn:oasis:names:tc:entity:xmlns:xml:catalog"
+XHTML = "http://www.w3.org/1999/xhtml"
+
+GENERATOR = (
+    "<generator>"
+    "<oval:product_name>pyscap</oval:product_name>"
+    "<oval:schema_version>5.11.2</oval:schema_version>"
+    "<oval:timestamp>2021-04-20T00:00:00</oval:timestamp>"
+    "</generator>"
+)
+
+
+def oval_definitions(size):
+    """Return an OVAL definitions document with ``size`` rpm checks."""
+    definitions, tests, objects, states = [], [], [], []
+    for i in range(1, size + 1):
+        definitions.append(
+            f'<definition id="oval:pyscap:def:{i}" version="1" class="patch">'
+            f"<metadata><title>Package {i} is patched</title>"
+            f'<affected family="unix"><platform>Linux</platform></affected>'
+            f"<description>Package package-{i} is at least 1.{i}.</description>"
+            f"</metadata>"
+            f'<criteria operator="AND">'
+            f'<criterion test_ref="oval:pyscap:tst:{i}" comment="package-{i}"/>'
+            f"</criteria></definition>"
+        )
+        tests.append(
+            f'<lin:rpminfo_test id="oval:pyscap:tst:{i}" version="1" '
+            f'check="all" comment="package-{i}">'
+            f'<lin:object object_ref="oval:pyscap:obj:{i}"/>'
+            f'<lin:state state_ref="oval:pyscap:ste:{i}"/>'
+            f"</lin:rpminfo_test>"
+        )
+        objects.append(
+            f'<lin:rpminfo_object id="oval:pyscap:obj:{i}" version="1">'
+            f"<lin:name>package-{i}</lin:name></lin:rpminfo_object>"
+        )
+        states.append(
+            f'<lin:rpminfo_state id="oval:pyscap:ste:{i}" version="1">'
+            f'<lin:evr datatype="evr_string" operation="greater than or equal">'
+            f"0:1.{i}-1</lin:evr></lin:rpminfo_state>"
+        )
+
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<oval_definitions xmlns="{OVAL_DEFINITIONS}" '
+        f'xmlns:oval="{OVAL_COMMON}" xmlns:lin="{OVAL_LINUX}">'
+        f"{GENERATOR}"
+        f"<definitions>{''.join(definitions)}</definitions>"
+        f"<tests>{''.join(tests)}</tests>"
+        f"<objects>{''.join(objects)}</objects>"
+        f"<states>{''.join(states)}</states>"
+        f"</oval_definitions>"
+    ).encode()
+
+
+def system_characteristics(size, host="host", index=0):
+    """
+    Return OVAL system characteristics with the ``size`` packages checked
+    by :func:`oval_definitions`.
+
+    One package in seven is outdated, depending on ``index``, and one in
+    fifty is not installed.
+    """
+    objects, items = [], []
+    for i in range(1, size + 1):
+        if i % 50 == 0:
+            objects.append(
+                f'<object id="oval:pyscap:obj:{i}" version="1" flag="does not exist"/>'
+            )
+            continue
+        minor = i - 1 if (i + index) % 7 == 0 else i
+        objects.append(
+            f'<object id="oval:pyscap:obj:{i}" version="1" flag="complete">'
+            f'<reference item_ref="{i}"/></object>'
+        )
+        items.append(
+            f'<lin-sc:rpminfo_item id="{i}" status="exists">'
+            f"<lin-sc:name>package-{i}</lin-sc:name>"
+            f"<lin-sc:arch>x86_64</lin-sc:arch>"
+            f'<lin-sc:evr datatype="evr_string">0:1.{minor}-1</lin-sc:evr>'
+            f"</lin-sc:rpminfo_item>"
+        )
+
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<oval_system_characteristics xmlns="{OVAL_SC}" '
+        f'xmlns:oval="{OVAL_COMMON}" xmlns:lin-sc="{OVAL_SC_LINUX}">'
+        f"{GENERATOR}"
+        f"<system_info><os_name>Linux</os_name><os_version>5.10</os_version>"
+        f"<architecture>x86_64</architecture>"
+        f"<primary_host_name>{host}</primary_host_name>"
+        f"<interfaces/></system_info>"
+        f"<collected_objects>{''.join(objects)}</collected_objects>"
+        f"<system_data>{''.join(items)}</system_data>"
+        f"</oval_system_characteristics>"
+    ).encode()
+
+
+def xccdf_benchmark(size, rules_per_group=10):
+    """Return an XCCDF 1.2 benchmark with ``size`` rules."""
+    groups = []
+    for g in range(0, size, rules_per_group):
+        rules = []
+        for i in range(g + 1, min(g + rules_per_group, size) + 1):
+            rules.append(
+                f'<Rule id="xccdf_org.pyscap_rule_{i}" selected="true" '
+                f'severity="medium">'
+                f"<title>Rule {i}</title>"
+                f"<description>Make sure <html:code>package-{i}</html:code> "
+                f"is <html:b>up to date</html:b>.</description>"
+                f'<ident system="https://ncp.nist.gov/cce">CCE-{i}-0</ident>'
+                f'<fix system="urn:xccdf:fix:script:sh">yum update package-{i}</fix>'
+                f'<check system="{OVAL_DEFINITIONS}">'
+                f'<check-content-ref href="oval.xml" name="oval:pyscap:def:{i}"/>'
+                f"</check></Rule>"
+            )
+        groups.append(
+            f'<Group id="xccdf_org.pyscap_group_{g}">'
+            f"<title>Group {g}</title>{''.join(rules)}</Group>"
+        )
+
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<Benchmark xmlns="{XCCDF}" xmlns:html="{XHTML}" '
+        f'id="xccdf_org.pyscap_benchmark_synthetic" resolved="1">'
+        f"<status>draft</status><title>Synthetic benchmark</title>"
+        f"<version>1.0</version>"
+        f'<Profile id="xccdf_org.pyscap_profile_all"><title>All</title></Profile>'
+        f"{''.join(groups)}"
+        f"</Benchmark>"
+    ).encode()
+
+
+def test_result(size, host="host", index=0):
+    """Return the markup of an XCCDF 1.2 TestResult with ``size`` results."""
+    results = "".join(
+        f'<rule-result idref="xccdf_org.pyscap_rule_{i}" '
+        f'time="2021-04-20T00:00:00" severity="medium" weight="1.0">'
+        f'<result>{"pass" if (i + index) % 3 else "fail"}</result>'
+        f'<ident system="https://ncp.nist.gov/cce">CCE-{i}-0</ident>'
+        f"</rule-result>"
+        for i in range(1, size + 1)
+    )
+    return (
+        f'<TestResult xmlns="{XCCDF}" '
+        f'id="xccdf_org.pyscap_testresult_{host}" '
+        f'start-time="2021-04-20T00:00:00" end-time="2021-04-20T00:01:00">'
+        f'<benchmark href="#xccdf_org.pyscap_benchmark_synthetic"/>'
+        f"<title>Scan of {host}</title>"
+        f"<target>{host}</target>"
+        f"{results}"
+        f'<score system="urn:xccdf:scoring:default">50.0</score>'
+        f"</TestResult>"
+    )
+
+
+def asset_report_collection(size, hosts=10):
+    """Return an ARF collection with one ``size`` rule report per host."""
+    reports = "".join(
+        f'<arf:report id="report_{h}"><arf:content>'
+        f"{test_result(size, f'host{h}', h)}"
+        f"</arf:content></arf:report>"
+        for h in range(hosts)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<arf:asset-report-collection xmlns:arf="{ARF}">'
+        f"<arf:reports>{reports}</arf:reports>"
+        f"</arf:asset-report-collection>"
+    ).encode()
+
+
+def data_stream_collection(size, streams=1):
+    """
+    Return a data stream collection with ``streams`` data streams, each
+    with a ``size`` rule benchmark and the OVAL definitions it checks.
+
+    The catalogs of the benchmarks all name their definitions ``oval.xml``,
+    the components of stream ``n`` have ids ending in ``_<n>``.
+    """
+    prologue = b'<?xml version="1.0" encoding="UTF-8"?>'
+    benchmark = xccdf_benchmark(size)[len(prologue):].decode()
+    oval = oval_definitions(size)[len(prologue):].decode()
+    data_streams, components = [], []
+    for n in range(1, streams + 1):
+        data_streams.append(
+            f'<ds:data-stream id="scap_org.pyscap_datastream_synthetic_{n}" '
+            f'scap-version="1.3" use-case="CONFIGURATION">'
+            f"<ds:checklists>"
+            f'<ds:component-ref id="scap_org.pyscap_cref_xccdf_{n}" '
+            f'xlink:href="#scap_org.pyscap_comp_xccdf_{n}">'
+            f'<cat:catalog><cat:uri name="oval.xml" '
+            f'uri="#scap_org.pyscap_cref_oval_{n}"/></cat:catalog>'
+            f"</ds:component-ref></ds:checklists>"
+            f"<ds:checks>"
+            f'<ds:component-ref id="scap_org.pyscap_cref_oval_{n}" '
+            f'xlink:href="#scap_org.pyscap_comp_oval_{n}"/>'
+            f"</ds:checks></ds:data-stream>"
+        )
+        components.append(
+            f'<ds:component id="scap_org.pyscap_comp_oval_{n}" '
+            f'timestamp="2021-04-20T00:00:00">{oval}</ds:component>'
+            f'<ds:component id="scap_org.pyscap_comp_xccdf_{n}" '
+            f'timestamp="2021-04-20T00:00:00">{benchmark}</ds:component>'
+        )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<ds:data-stream-collection xmlns:ds="{SDS}" xmlns:xlink="{XLINK}" '
+        f'xmlns:cat="{CATALOG}" id="scap_org.pyscap_collection_synthetic" '
+        f'schematron-version="1.3">'
+        f"{''.join(data_streams)}{''.join(components)}"
+        f"</ds:data-stream-collection>"
+    ).encode()
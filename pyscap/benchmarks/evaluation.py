@@ -0,0 +1,202 @@
+"""
+Correctness and speed of the evaluation of OVAL definitions.
+
+Run with ``python -m pyscap.benchmarks.evaluation``, the exit status is 1
+when a truth table entry or a definition is evaluated differently from its
+known result.
+"""
+import argparse
+import sys
+import time
+
+from . import documents
+from ..oval import (
+    OvalDefinitions,
+    OvalEvaluator,
+    OvalSystemCharacteristics,
+    check_existence,
+    combine,
+    combine_check,
+    negate,
+)
+from ..oval.definitions import ExtendDefinitionType
+from ..oval.evaluation import ERROR, FALSE, NOT_APPLICABLE, NOT_EVALUATED, TRUE, UNKNOWN
+
+T, F, E, U, NE, NA = TRUE, FALSE, ERROR, UNKNOWN, NOT_EVALUATED, NOT_APPLICABLE
+EX, DNE, ER, NC = "exists", "does not exist", "error", "not collected"
+
+# (function, first argument, results or statuses, expected result), from
+# the truth tables of the OVAL specification.
+VECTORS = [
+    (negate, None, T, F),
+    (negate, None, F, T),
+    (negate, None, E, E),
+    (negate, None, U, U),
+    (negate, None, NE, NE),
+    (negate, None, NA, NA),
+    (combine, "AND", [T, T], T),
+    (combine, "AND", [T, F, E], F),
+    (combine, "AND", [T, E, U], E),
+    (combine, "AND", [T, U, NE], U),
+    (combine, "AND", [T, NA], T),
+    (combine, "AND", [NA, NA], NA),
+    (combine, "AND", [], NA),
+    (combine, "OR", [F, F], F),
+    (combine, "OR", [F, E, T], T),
+    (combine, "OR", [F, U], U),
+    (combine, "OR", [F, NA], F),
+    (combine, "ONE", [T, F], T),
+    (combine, "ONE", [T, T, E], F),
+    (combine, "ONE", [T, E], E),
+    (combine, "ONE", [F, F], F),
+    (combine, "ONE", [F, NE], NE),
+    (combine, "XOR", [T, T], F),
+    (combine, "XOR", [T, T, T], T),
+    (combine, "XOR", [T, F, E], E),
+    (combine_check, "all", [T, T], T),
+    (combine_check, "all", [T, F], F),
+    (combine_check, "at least one", [F, T], T),
+    (combine_check, "at least one", [F, U], U),
+    (combine_check, "only one", [T, F, F], T),
+    (combine_check, "only one", [T, T], F),
+    (combine_check, "none satisfy", [F, F], T),
+    (combine_check, "none satisfy", [F, T, E], F),
+    (combine_check, "none satisfy", [F, E], E),
+    (combine_check, "none satisfy", [NA], NA),
+    (check_existence, "all_exist", [EX, EX], T),
+    (check_existence, "all_exist", [EX, DNE, ER], F),
+    (check_existence, "all_exist", [EX, ER], E),
+    (check_existence, "all_exist", [EX, NC], U),
+    (check_existence, "all_exist", [], F),
+    (check_existence, "any_exist", [], T),
+    (check_existence, "any_exist", [DNE], T),
+    (check_existence, "any_exist", [NC], T),
+    (check_existence, "any_exist", [EX, ER], T),
+    (check_existence, "any_exist", [DNE, ER], E),
+    (check_existence, "at_least_one_exists", [EX, ER], T),
+    (check_existence, "at_least_one_exists", [DNE], F),
+    (check_existence, "at_least_one_exists", [DNE, ER, NC], E),
+    (check_existence, "at_least_one_exists", [NC], U),
+    (check_existence, "at_least_one_exists", [], F),
+    (check_existence, "none_exist", [DNE], T),
+    (check_existence, "none_exist", [], T),
+    (check_existence, "none_exist", [EX, ER], F),
+    (check_existence, "none_exist", [ER, NC], E),
+    (check_existence, "none_exist", [NC], U),
+    (check_existence, "only_one_exists", [EX, DNE], T),
+    (check_existence, "only_one_exists", [EX, EX, ER], F),
+    (check_existence, "only_one_exists", [EX, ER], E),
+    (check_existence, "only_one_exists", [DNE], F),
+    (check_existence, "only_one_exists", [DNE, NC], U),
+]
+
+
+def expected_results(size, index=0):
+    """Return the known result of every definition of
+    :func:`documents.oval_definitions` on the host of
+    :func:`documents.system_characteristics` with this ``index``: false
+    for the packages not installed or outdated."""
+    return {
+        f"oval:pyscap:def:{i}": FALSE if i % 50 == 0 or (i + index) % 7 == 0 else TRUE
+        for i in range(1, size + 1)
+    }
+
+
+# The results of the definitions of :func:`broken_definitions`, on the
+# first host of :func:`documents.system_characteristics`.
+BROKEN = {
+    "oval:pyscap:def:1": ERROR,
+    "oval:pyscap:def:2": ERROR,
+    "oval:pyscap:def:3": ERROR,
+    "oval:pyscap:def:4": TRUE,
+}
+
+
+def broken_definitions():
+    """Return definitions with dangling references: definition 1 uses an
+    unknown test, the test of definition 2 an unknown state, definition 3
+    extends itself and definition 4 extends an unknown definition in an
+    ``OR``."""
+    definitions = OvalDefinitions.parse(documents.oval_definitions(4))
+    criteria = [definition.criteria for definition in definitions.definitions.definition]
+    criteria[0].criterion[0].test_ref = "oval:pyscap:tst:404"
+    test = definitions.get_test("oval:pyscap:tst:2")
+    state = next(child for child in test.children if child.qname.endswith("}state"))
+    state.attributes["state_ref"] = "oval:pyscap:ste:404"
+    criteria[2].extend_definition.append(ExtendDefinitionType(definition_ref="oval:pyscap:def:3"))
+    criteria[3].operator = "OR"
+    criteria[3].extend_definition.append(ExtendDefinitionType(definition_ref="oval:pyscap:def:404"))
+    return definitions
+
+
+def check(size=100, hosts=3):
+    """Return the truth table entries and definitions evaluated differently
+    from their known results, as ``(what, expected, actual)`` tuples."""
+    failures = []
+    for function, first, argument, expected in VECTORS:
+        args = (argument,) if first is None else (first, argument)
+        actual = function(*args)
+        if actual is not expected:
+            what = f"{function.__name__}({', '.join(map(_name, args))})"
+            failures.append((what, _name(expected), _name(actual)))
+
+    evaluator = OvalEvaluator(OvalDefinitions.parse(documents.oval_definitions(size)))
+    for index in range(hosts):
+        sc = OvalSystemCharacteristics.parse(
+            documents.system_characteristics(size, f"host-{index}", index)
+        )
+        results = evaluator.results(sc)
+        for id, expected in expected_results(size, index).items():
+            if results.get(id) is not expected:
+                failures.append((f"host-{index} {id}", _name(expected), _name(results.get(id))))
+
+    results = OvalEvaluator(broken_definitions()).results(
+        OvalSystemCharacteristics.parse(documents.system_characteristics(4))
+    )
+    for id, expected in BROKEN.items():
+        if results.get(id) is not expected:
+            failures.append((f"broken {id}", _name(expected), _name(results.get(id))))
+    return failures
+
+
+def run(size=1000, hosts=10):
+    """Return the seconds to evaluate the definitions of a ``size``
+    package document on ``hosts`` parsed hosts, and the definitions per
+    second."""
+    evaluator = OvalEvaluator(OvalDefinitions.parse(documents.oval_definitions(size)))
+    characteristics = [
+        OvalSystemCharacteristics.parse(documents.system_characteristics(size, f"host-{h}", h))
+        for h in range(hosts)
+    ]
+    start = time.perf_counter()
+    for sc in characteristics:
+        evaluator.results(sc)
+    seconds = time.perf_counter() - start
+    return seconds, size * hosts / seconds
+
+
+def _name(value):
+    if isinstance(value, list):
+        return f"[{', '.join(map(_name, value))}]"
+    return getattr(value, "value", value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="definitions per document")
+    parser.add_argument("--hosts", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    for what, expected, actual in failures:
+        print(f"{what} gave {actual!r}, expected {expected!r}")
+    print(f"{len(failures)} failures in the known answer evaluations")
+
+    seconds, rate = run(args.size, args.hosts)
+    print(f"{seconds:.3f} s for {args.hosts} hosts, {rate:,.0f} definitions/s")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
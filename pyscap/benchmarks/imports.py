@@ -0,0 +1,82 @@
+"""
+Import time of every subpackage, checked against a budget.
+
+Run with ``python -m pyscap.benchmarks.imports``, the exit status is 1 when
+a subpackage goes over its budget.
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+# Milliseconds to import each module in a fresh interpreter, dependencies
+# included.
+BUDGETS = {
+    "pyscap": 300,
+    "pyscap.cpe": 400,
+    "pyscap.oval": 600,
+    "pyscap.ocil": 600,
+    "pyscap.xccdf": 600,
+    "pyscap.sds": 1200,
+    "pyscap.arf": 1800,
+}
+
+
+def import_time(module, repeat):
+    """Return the best time in milliseconds to import ``module``."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", code])) * 1000
+        for _ in range(repeat)
+    )
+
+
+def breakdown():
+    """Return the milliseconds spent importing each part of pyscap on its
+    own, as reported by ``-X importtime`` when importing everything."""
+    code = "import " + ", ".join(name for name in BUDGETS)
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stderr
+
+    totals = defaultdict(float)
+    for line in output.splitlines()[1:]:
+        _, timings = line.split(":", 1)
+        own, _, name = (part.strip() for part in timings.split("|"))
+        parts = name.split(".")
+        if parts[0] != "pyscap":
+            group = "third party"
+        elif len(parts) > 1 and parts[1] not in ("common", "benchmarks"):
+            group = ".".join(parts[:2])
+        else:
+            group = "pyscap"
+        totals[group] += int(own) / 1000
+    return dict(totals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<16}{'own ms':>10}{'import ms':>12}{'budget ms':>12}")
+    own = breakdown()
+    failed = False
+    for module, budget in BUDGETS.items():
+        elapsed = import_time(module, args.repeat)
+        failed |= elapsed > budget
+        flag = "" if elapsed <= budget else "  over budget"
+        print(f"{module:<16}{own.get(module, 0):>10.1f}{elapsed:>12.1f}{budget:>12}{flag}")
+    print(f"{'third party':<16}{own.get('third party', 0):>10.1f}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
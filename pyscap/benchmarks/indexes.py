@@ -0,0 +1,110 @@
+"""
+Correctness and speed of the cached id indexes of documents.
+
+Run with ``python -m pyscap.benchmarks.indexes``, the exit status is 1
+when a lookup returns a stale element after a modification.
+"""
+import argparse
+import copy
+import sys
+import time
+
+from . import documents
+from ..oval import OvalDefinitions
+from ..oval.definitions import oval_id
+from ..xccdf import Benchmark
+
+
+def _rule(benchmark):
+    return lambda id: benchmark.get_rule(f"xccdf_org.pyscap_rule_{id}").id
+
+
+def check():
+    """Return the lookups giving another element than expected after
+    modifications of the indexed lists, as ``(what, expected, actual)``
+    tuples, a missing element being ``None``."""
+    failures = []
+
+    def expect(what, expected, lookup, id):
+        try:
+            actual = lookup(id)
+        except KeyError:
+            actual = None
+        if actual != expected:
+            failures.append((what, expected, actual))
+
+    benchmark = Benchmark.parse(documents.xccdf_benchmark(30))
+    rule = _rule(benchmark)
+    expect("parsed rule", "xccdf_org.pyscap_rule_25", rule, 25)
+
+    group = copy.deepcopy(benchmark.group[0])
+    group.id = "xccdf_org.pyscap_group_extra"
+    group.rule[0].id = "xccdf_org.pyscap_rule_extra"
+    benchmark.group.append(group)
+    expect("rule of an appended group", "xccdf_org.pyscap_rule_extra", rule, "extra")
+
+    nested = benchmark.group[1].rule
+    nested.append(copy.deepcopy(nested[0]))
+    nested[-1].id = "xccdf_org.pyscap_rule_nested"
+    benchmark.invalidate()
+    expect("nested rule after invalidate", "xccdf_org.pyscap_rule_nested", rule, "nested")
+
+    benchmark.group.pop(0)
+    expect("rule of a removed group", None, rule, 1)
+
+    definitions = OvalDefinitions.parse(documents.oval_definitions(5))
+    # The rpminfo tests of the document are wildcard elements.
+    test = lambda id: oval_id(definitions.get_test(f"oval:pyscap:tst:{id}"))
+    expect("parsed test", "oval:pyscap:tst:1", test, 1)
+    tests = definitions.tests.test
+    added = copy.deepcopy(tests[0])
+    added.attributes["id"] = "oval:pyscap:tst:6"
+    tests.pop(0)
+    tests.append(added)
+    expect("appended test", "oval:pyscap:tst:6", test, 6)
+    expect("popped test", None, test, 1)
+
+    tests[2] = copy.deepcopy(tests[2])
+    tests[2].attributes["id"] = "oval:pyscap:tst:7"
+    definitions.invalidate()
+    expect("replaced test after invalidate", "oval:pyscap:tst:7", test, 7)
+    expect("test replaced in place", None, test, 4)
+    return failures
+
+
+def run(sizes=(200, 2000, 20000), repeat=3):
+    """Yield ``(rules, microseconds per lookup)`` rows for looking up every
+    rule of benchmarks of ``sizes`` rules."""
+    for size in sizes:
+        benchmark = Benchmark.parse(documents.xccdf_benchmark(size))
+        ids = [f"xccdf_org.pyscap_rule_{i}" for i in range(1, size + 1)]
+        benchmark.get_rule(ids[0])
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for id in ids:
+                benchmark.get_rule(id)
+            best = min(best, time.perf_counter() - start)
+        yield size, best / size * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    for what, expected, actual in failures:
+        print(f"{what}: {actual!r}, expected {expected!r}")
+    print(f"{len(failures)} failures in the known answer lookups")
+
+    print(f"{'rules':>8}{'us/lookup':>12}")
+    for size, micros in run(args.sizes, args.repeat):
+        print(f"{size:>8}{micros:>12.2f}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Parse throughput of every xml backend.
+
+Run with ``python -m pyscap.benchmarks.parsing``.
+"""
+import argparse
+import time
+from xml.etree import ElementTree
+
+from . import documents
+from ..arf import AssetReportCollection
+from ..common.utils import backends, get_backend, set_backend
+from ..oval import OvalDefinitions
+from ..xccdf import Benchmark
+
+DOCUMENTS = {
+    "oval": (OvalDefinitions, documents.oval_definitions),
+    "xccdf": (Benchmark, documents.xccdf_benchmark),
+    "arf": (AssetReportCollection, documents.asset_report_collection),
+}
+
+
+def count_elements(data):
+    return sum(1 for _ in ElementTree.fromstring(data).iter())
+
+
+def measure(cls, data, repeat):
+    """Return the best wall clock time of ``repeat`` parses."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cls.parse(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size=1000, repeat=3, names=None):
+    """Yield ``(document, backend, seconds, MB/s, elements/s)`` rows."""
+    active = get_backend()
+    try:
+        for document, (cls, build) in DOCUMENTS.items():
+            data = build(size)
+            elements = count_elements(data)
+            for backend in names or backends:
+                set_backend(backend)
+                seconds = measure(cls, data, repeat)
+                yield (
+                    document,
+                    backend,
+                    seconds,
+                    len(data) / seconds / 1e6,
+                    elements / seconds,
+                )
+    finally:
+        set_backend(active)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="items per document")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", action="append", choices=sorted(backends))
+    args = parser.parse_args(argv)
+
+    print(f"{'document':<10}{'backend':<16}{'seconds':>10}{'MB/s':>10}{'elements/s':>14}")
+    for document, backend, seconds, mbps, eps in run(args.size, args.repeat, args.backend):
+        print(f"{document:<10}{backend:<16}{seconds:>10.3f}{mbps:>10.2f}{eps:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
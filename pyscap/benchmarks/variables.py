@@ -0,0 +1,176 @@
+"""
+Correctness and speed of the computation of OVAL variables.
+
+Run with ``python -m pyscap.benchmarks.variables``, the exit status is 1
+when a variable is computed differently from its known value.
+"""
+import argparse
+import sys
+import time
+
+from .documents import GENERATOR, OVAL_COMMON, OVAL_DEFINITIONS
+from ..oval import OvalDefinitions, VariableGraph
+
+# (function markup, expected values), the components of the functions
+# referencing the constant variables of CONSTANTS.
+VECTORS = [
+    (
+        "<concat><literal_component>/home/</literal_component>"
+        '<variable_component var_ref="oval:pyscap:var:user"/>'
+        "<literal_component>/.bashrc</literal_component></concat>",
+        ["/home/alice/.bashrc", "/home/bob/.bashrc"],
+    ),
+    (
+        '<concat><variable_component var_ref="oval:pyscap:var:user"/>'
+        "<literal_component>@</literal_component>"
+        '<variable_component var_ref="oval:pyscap:var:host"/></concat>',
+        ["alice@example", "bob@example"],
+    ),
+    (
+        '<time_difference format_1="seconds_since_epoch" format_2="seconds_since_epoch">'
+        "<literal_component>100</literal_component>"
+        '<variable_component var_ref="oval:pyscap:var:thirty"/></time_difference>',
+        ["70"],
+    ),
+    (
+        '<time_difference format_1="seconds_since_epoch" format_2="seconds_since_epoch">'
+        '<variable_component var_ref="oval:pyscap:var:thirty"/>'
+        "<literal_component>100</literal_component></time_difference>",
+        ["-70"],
+    ),
+    (
+        '<time_difference format_1="month_day_year" format_2="month_day_year">'
+        "<literal_component>04/02/2009</literal_component>"
+        "<literal_component>02/02/2005</literal_component></time_difference>",
+        ["131328000"],
+    ),
+    (
+        '<arithmetic arithmetic_operation="add"><literal_component>1</literal_component>'
+        '<variable_component var_ref="oval:pyscap:var:thirty"/>'
+        "<literal_component>2</literal_component></arithmetic>",
+        ["33"],
+    ),
+    (
+        '<arithmetic arithmetic_operation="multiply">'
+        '<variable_component var_ref="oval:pyscap:var:thirty"/>'
+        "<literal_component>2.5</literal_component></arithmetic>",
+        ["75.0"],
+    ),
+    (
+        '<unique><variable_component var_ref="oval:pyscap:var:user"/>'
+        "<literal_component>alice</literal_component>"
+        "<literal_component>carol</literal_component></unique>",
+        ["alice", "bob", "carol"],
+    ),
+    (
+        '<count><literal_component>x</literal_component>'
+        '<variable_component var_ref="oval:pyscap:var:user"/></count>',
+        ["3"],
+    ),
+    (
+        '<begin character="/"><concat><literal_component>etc</literal_component>'
+        '<end character="/"><literal_component>/x</literal_component></end></concat></begin>',
+        ["/etc/x/"],
+    ),
+    (
+        '<split delimiter=","><literal_component>a,b,,c</literal_component></split>',
+        ["a", "b", "", "c"],
+    ),
+    (
+        '<substring substring_start="2" substring_length="3">'
+        "<literal_component>abcdef</literal_component></substring>",
+        ["bcd"],
+    ),
+    (
+        '<regex_capture pattern="^([a-z]+)-[0-9]+$">'
+        "<literal_component>kernel-510</literal_component></regex_capture>",
+        ["kernel"],
+    ),
+    (
+        "<escape_regex><literal_component>a.b*c</literal_component></escape_regex>",
+        ["a\\.b\\*c"],
+    ),
+    (
+        "<glob_to_regex><literal_component>/etc/*.conf</literal_component></glob_to_regex>",
+        ["^/etc/(?=[^.])[^/]*\\.conf$"],
+    ),
+    # An invalid pattern leaves the variable out.
+    (
+        '<regex_capture pattern="([a-z"><literal_component>kernel</literal_component></regex_capture>',
+        None,
+    ),
+]
+
+CONSTANTS = {
+    "oval:pyscap:var:user": ("string", ["alice", "bob"]),
+    "oval:pyscap:var:host": ("string", ["example"]),
+    "oval:pyscap:var:thirty": ("int", ["30"]),
+}
+
+
+def known_answer_definitions():
+    """Return a definitions document with a local variable for every
+    vector, ``oval:pyscap:var:<index>``."""
+    constants = "".join(
+        f'<constant_variable id="{id}" version="1" datatype="{datatype}" comment="{id}">'
+        + "".join(f"<value>{value}</value>" for value in values)
+        + "</constant_variable>"
+        for id, (datatype, values) in CONSTANTS.items()
+    )
+    locals_ = "".join(
+        f'<local_variable id="oval:pyscap:var:{index}" version="1" datatype="string" '
+        f'comment="vector {index}">{function}</local_variable>'
+        for index, (function, _) in enumerate(VECTORS)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<oval_definitions xmlns="{OVAL_DEFINITIONS}" xmlns:oval="{OVAL_COMMON}">'
+        f"{GENERATOR}"
+        f"<variables>{constants}{locals_}</variables>"
+        f"</oval_definitions>"
+    ).encode()
+
+
+def check():
+    """Return the vectors computed differently from their known values, as
+    ``(function markup, expected, actual)`` tuples."""
+    definitions = OvalDefinitions.parse(known_answer_definitions())
+    values = VariableGraph(definitions).compute()
+    failures = []
+    for index, (function, expected) in enumerate(VECTORS):
+        actual = values.get(f"oval:pyscap:var:{index}")
+        if actual != expected:
+            failures.append((function, expected, actual))
+    return failures
+
+
+def run(hosts=1000, repeat=3):
+    """Return the microseconds to compute the variables of the known
+    answer document for one host."""
+    graph = VariableGraph(OvalDefinitions.parse(known_answer_definitions()))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(hosts):
+            graph.compute()
+        best = min(best, time.perf_counter() - start)
+    return best / hosts * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    for function, expected, actual in failures:
+        print(f"{function} gave {actual!r}, expected {expected!r}")
+    print(f"{len(failures)} failures in {len(VECTORS)} known answer variables")
+    print(f"{run(args.hosts, args.repeat):.1f} us per host")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
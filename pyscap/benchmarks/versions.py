@@ -0,0 +1,244 @@
+"""
+Correctness and speed of the version comparators.
+
+Run with ``python -m pyscap.benchmarks.versions``, the exit status is 1
+when a comparator disagrees with the known answers of rpm and dpkg.
+"""
+import argparse
+import random
+import sys
+import time
+
+from ..oval import versions
+
+# (datatype, value, other, expected comparison), mostly from the test
+# suites of rpm and dpkg.
+VECTORS = [
+    ("evr_string", "0:1.0-1", "0:1.0-1", 0),
+    ("evr_string", "0:1.0-1", "1.0-1", 0),
+    ("evr_string", "1:1.0-1", "0:2.0-1", 1),
+    ("evr_string", "0:1.0-2", "0:1.0-10", -1),
+    ("evr_string", "0:1.0-1.el8", "0:1.0-1.el8_2", -1),
+    ("evr_string", "0:2.0.1-1", "0:2.0-1", 1),
+    ("evr_string", "0:1.0~rc1-1", "0:1.0-1", -1),
+    *(
+        ("rpm", value, other, expected)
+        for value, other, expected in [
+            ("1.0", "1.0", 0),
+            ("1.0", "2.0", -1),
+            ("2.0", "1.0", 1),
+            ("2.0.1", "2.0.1", 0),
+            ("2.0", "2.0.1", -1),
+            ("2.0.1", "2.0", 1),
+            ("2.0.1a", "2.0.1a", 0),
+            ("2.0.1a", "2.0.1", 1),
+            ("2.0.1", "2.0.1a", -1),
+            ("5.5p1", "5.5p1", 0),
+            ("5.5p1", "5.5p2", -1),
+            ("5.5p2", "5.5p1", 1),
+            ("5.5p10", "5.5p10", 0),
+            ("5.5p1", "5.5p10", -1),
+            ("5.5p10", "5.5p1", 1),
+            ("10xyz", "10.1xyz", -1),
+            ("10.1xyz", "10xyz", 1),
+            ("xyz10", "xyz10", 0),
+            ("xyz10", "xyz10.1", -1),
+            ("xyz10.1", "xyz10", 1),
+            ("xyz.4", "xyz.4", 0),
+            ("xyz.4", "8", -1),
+            ("8", "xyz.4", 1),
+            ("xyz.4", "2", -1),
+            ("2", "xyz.4", 1),
+            ("5.5p2", "5.6p1", -1),
+            ("5.6p1", "5.5p2", 1),
+            ("5.6p1", "6.5p1", -1),
+            ("6.5p1", "5.6p1", 1),
+            ("6.0.rc1", "6.0", 1),
+            ("6.0", "6.0.rc1", -1),
+            ("10b2", "10a1", 1),
+            ("10a2", "10b2", -1),
+            ("1.0aa", "1.0aa", 0),
+            ("1.0a", "1.0aa", -1),
+            ("1.0aa", "1.0a", 1),
+            ("10.0001", "10.0001", 0),
+            ("10.0001", "10.1", 0),
+            ("10.1", "10.0001", 0),
+            ("10.0001", "10.0039", -1),
+            ("10.0039", "10.0001", 1),
+            ("4.999.9", "5.0", -1),
+            ("5.0", "4.999.9", 1),
+            ("20101121", "20101121", 0),
+            ("20101121", "20101122", -1),
+            ("20101122", "20101121", 1),
+            ("2_0", "2_0", 0),
+            ("2.0", "2_0", 0),
+            ("2_0", "2.0", 0),
+            ("a", "a", 0),
+            ("a+", "a+", 0),
+            ("a+", "a_", 0),
+            ("a_", "a+", 0),
+            ("+a", "+a", 0),
+            ("+a", "_a", 0),
+            ("_a", "+a", 0),
+            ("+_", "+_", 0),
+            ("_+", "+_", 0),
+            ("_+", "_+", 0),
+            ("+", "_", 0),
+            ("_", "+", 0),
+            ("1.0~rc1", "1.0~rc1", 0),
+            ("1.0~rc1", "1.0", -1),
+            ("1.0", "1.0~rc1", 1),
+            ("1.0~rc1", "1.0~rc2", -1),
+            ("1.0~rc2", "1.0~rc1", 1),
+            ("1.0~rc1~git123", "1.0~rc1~git123", 0),
+            ("1.0~rc1~git123", "1.0~rc1", -1),
+            ("1.0~rc1", "1.0~rc1~git123", 1),
+            ("1.0^", "1.0^", 0),
+            ("1.0^", "1.0", 1),
+            ("1.0", "1.0^", -1),
+            ("1.0^git1", "1.0^git1", 0),
+            ("1.0^git1", "1.0", 1),
+            ("1.0", "1.0^git1", -1),
+            ("1.0^git1", "1.0^git2", -1),
+            ("1.0^git2", "1.0^git1", 1),
+            ("1.0^git1", "1.01", -1),
+            ("1.01", "1.0^git1", 1),
+            ("1.0^20160101", "1.0^20160101", 0),
+            ("1.0^20160101", "1.0.1", -1),
+            ("1.0.1", "1.0^20160101", 1),
+            ("1.0^20160101^git1", "1.0^20160101^git1", 0),
+            ("1.0^20160102", "1.0^20160101^git1", 1),
+            ("1.0^20160101^git1", "1.0^20160102", -1),
+            ("1.0~rc1^git1", "1.0~rc1^git1", 0),
+            ("1.0~rc1^git1", "1.0~rc1", 1),
+            ("1.0~rc1", "1.0~rc1^git1", -1),
+            ("1.0^git1~pre", "1.0^git1~pre", 0),
+            ("1.0^git1", "1.0^git1~pre", 1),
+            ("1.0^git1~pre", "1.0^git1", -1),
+        ]
+    ),
+    ("debian_evr_string", "1.0", "1.0", 0),
+    ("debian_evr_string", "1.0", "1.0-0", 0),
+    ("debian_evr_string", "0:1.18.36", "1.18.36", 0),
+    ("debian_evr_string", "1.18.36", "1.18.35", 1),
+    ("debian_evr_string", "1:1.0", "2.0", 1),
+    ("debian_evr_string", "10.3", "1:0.4", -1),
+    ("debian_evr_string", "1.0~~", "1.0~~a", -1),
+    ("debian_evr_string", "1.0~~a", "1.0~", -1),
+    ("debian_evr_string", "1.0~", "1.0", -1),
+    ("debian_evr_string", "1.0", "1.0a", -1),
+    ("debian_evr_string", "1.0~rc1", "1.0", -1),
+    ("debian_evr_string", "1.0", "1.0+b1", -1),
+    ("debian_evr_string", "1a", "1.", -1),
+    ("debian_evr_string", "1.2.3", "1.2.3.0", -1),
+    ("debian_evr_string", "2.30-1", "2.3-1", 1),
+    ("debian_evr_string", "1.0-1", "1.0-2", -1),
+    ("debian_evr_string", "1.0-1ubuntu1", "1.0-1", 1),
+    ("debian_evr_string", "1.0-1", "1.0.1-1", -1),
+    ("debian_evr_string", "7.6p2-4", "7.6-0", 1),
+    ("debian_evr_string", "1.0.3-3", "1.0-1", 1),
+    ("debian_evr_string", "1.3", "1.2.2-2", 1),
+    ("debian_evr_string", "0-pre", "0-pre", 0),
+    ("debian_evr_string", "0-pre", "0-pree", -1),
+    ("debian_evr_string", "1.1.6r2-2", "1.1.6r-1", 1),
+    ("debian_evr_string", "2.6b2-1", "2.6b-2", 1),
+    ("debian_evr_string", "98.1p5-1", "98.1-pre2-b6-2", -1),
+    ("debian_evr_string", "0.4a6-2", "0.4-1", 1),
+    ("debian_evr_string", "1:3.0.5-2", "1:3.0.5.1", -1),
+    ("debian_evr_string", "1:1.25-4", "1:1.25-8", -1),
+    ("debian_evr_string", "9:1.18.36:5.4-20", "10:0.5.1-22", -1),
+    ("debian_evr_string", "9:1.18.36:5.4-20", "9:1.18.36:5.5-1", -1),
+    ("debian_evr_string", "1.18.36-0.17.35-18", "1.18.36-19", 1),
+    ("debian_evr_string", "1:1.2.13-3", "1:1.2.13-3.1", -1),
+    ("debian_evr_string", "2.0.7pre1-4", "2.0.7r-1", -1),
+    ("debian_evr_string", "0.2", "1.0-0", -1),
+    ("debian_evr_string", "1.0", "1.0-0+b1", -1),
+    ("debian_evr_string", "1.0", "1.0-0~", 1),
+    ("version", "1.2", "1.2.0", 0),
+    ("version", "1.10", "1.9", 1),
+    ("version", "2", "1.99.99", 1),
+    ("version", "10.0.19041", "10.0.22000", -1),
+    ("ios_version", "12.2(33)SXI4a", "12.2(33)SXI4", 1),
+    ("ios_version", "12.2(33)SXI4", "12.2(33)SXI5", -1),
+    ("ios_version", "15.0(1)M", "12.4(24)T", 1),
+    ("ios_version", "12.4(24)T", "12.4(25)", -1),
+]
+
+
+def check():
+    """Return the vectors the comparators disagree with, as ``(datatype,
+    value, other, expected, actual)`` tuples."""
+    failures = []
+    for datatype, value, other, expected in VECTORS:
+        for a, b, answer in ((value, other, expected), (other, value, -expected)):
+            if datatype == "rpm":
+                actual = versions.rpmvercmp(a, b)
+            else:
+                actual = versions.compare(datatype, a, b)
+            if actual != answer:
+                failures.append((datatype, a, b, answer, actual))
+    return failures
+
+
+def installed_versions(datatype, size, seed=0):
+    """Return ``size`` random versions of a datatype."""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(size):
+        version = ".".join(str(rng.randrange(30)) for _ in range(rng.randrange(1, 5)))
+        if datatype == "evr_string":
+            values.append(f"{rng.randrange(3)}:{version}-{rng.randrange(20)}.el9")
+        elif datatype == "debian_evr_string":
+            suffix = rng.choice(["", "~rc1", "+dfsg", "ubuntu0.1"])
+            values.append(f"{rng.randrange(3)}:{version}{suffix}-{rng.randrange(20)}")
+        elif datatype == "ios_version":
+            values.append(f"{version}({rng.randrange(60)}){rng.choice(['M', 'T', 'SXI'])}")
+        else:
+            values.append(version)
+    return values
+
+
+def run(size=100000, repeat=3):
+    """Yield ``(datatype, cold, warm, batch)`` rows, the nanoseconds per
+    version to parse uncached keys, cached keys, and to compare a batch of
+    versions with one."""
+    for datatype in ("evr_string", "debian_evr_string", "version", "ios_version"):
+        values = installed_versions(datatype, size)
+        key = versions.KEYS[datatype]
+        cold = warm = batch = float("inf")
+        for _ in range(repeat):
+            versions.clear_caches()
+            start = time.perf_counter()
+            for value in values:
+                key(value)
+            cold = min(cold, time.perf_counter() - start)
+            start = time.perf_counter()
+            for value in values:
+                key(value)
+            warm = min(warm, time.perf_counter() - start)
+            start = time.perf_counter()
+            versions.compare_many(datatype, values, values[0])
+            batch = min(batch, time.perf_counter() - start)
+        yield datatype, cold / size * 1e9, warm / size * 1e9, batch / size * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000, help="versions per datatype")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    for datatype, value, other, expected, actual in failures:
+        print(f"{datatype}: {value!r} vs {other!r} gave {actual}, expected {expected}")
+    print(f"{len(failures)} failures in {2 * len(VECTORS)} known answer comparisons")
+
+    print(f"{'datatype':<20}{'cold ns':>10}{'warm ns':>10}{'batch ns':>10}")
+    for datatype, cold, warm, batch in run(args.size, args.repeat):
+        print(f"{datatype:<20}{cold:>10.0f}{warm:>10.0f}{batch:>10.0f}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
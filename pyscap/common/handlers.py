@@ -0,0 +1,101 @@
+from pathlib import Path
+from xml.parsers import expat
+
+from xsdata.exceptions import ParserError
+from xsdata.formats.dataclass.parsers.handlers import XmlEventHandler
+from xsdata.formats.dataclass.parsers.mixins import XmlHandler
+
+
+class ExpatEventHandler(XmlHandler):
+    """
+    Xml handler feeding the parser straight from expat callbacks.
+
+    Unlike the ElementTree and lxml handlers no element tree is built in
+    between, which saves an allocation per element and attribute. Documents
+    with XInclude processing enabled are left to the native handler, which
+    resolves the includes on an element tree. Malformed xml raises a
+    :class:`ParserError`, like the other handlers.
+    """
+
+    __slots__ = ()
+
+    def parse(self, source, ns_map):
+        if self.parser.config.process_xinclude:
+            return XmlEventHandler(clazz=self.clazz, parser=self.parser).parse(source, ns_map)
+
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.buffer_size = 1 << 16
+        parser.ordered_attributes = False
+
+        node_parser = self.parser
+        clazz, queue, objects = self.clazz, self.queue, self.objects
+        # Each open element holds its qualified name, its namespace map and
+        # its text. An end is dispatched only once the tail following it is
+        # known, i.e. on the next start or end.
+        stack = [[None, {}, None]]
+        declared = {}
+        data = []
+        pending = []
+
+        def take():
+            text = "".join(data) if data else None
+            data.clear()
+            return text
+
+        def dispatch():
+            node_parser.end(queue, objects, *pending, take())
+            pending.clear()
+
+        def start_namespace(prefix, uri):
+            declared[prefix] = uri
+            node_parser.register_namespace(ns_map, prefix, uri)
+
+        def start(name, attrs):
+            if pending:
+                dispatch()
+            else:
+                stack[-1][2] = take()
+
+            element_ns_map = stack[-1][1]
+            if declared:
+                element_ns_map = {**element_ns_map, **declared}
+                declared.clear()
+
+            qname = _qname(name)
+            attrs = {_qname(key): value for key, value in attrs.items()}
+            stack.append([qname, element_ns_map, None])
+            node_parser.start(clazz, queue, objects, qname, attrs, element_ns_map)
+
+        def end(name):
+            qname, _, text = stack.pop()
+            if pending:
+                dispatch()
+            else:
+                text = take()
+            pending.extend((qname, text))
+
+        parser.StartNamespaceDeclHandler = start_namespace
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = data.append
+
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                parser.Parse(source, True)
+            elif hasattr(source, "read"):
+                parser.ParseFile(source)
+            else:
+                with open(Path(source), "rb") as fp:
+                    parser.ParseFile(fp)
+        except expat.ExpatError as error:
+            raise ParserError(error) from error
+
+        if pending:
+            dispatch()
+        return objects[-1][1] if objects else None
+
+
+def _qname(name):
+    uri, _, local = name.rpartition(" ")
+    return f"{{{uri}}}{local}" if uri else local
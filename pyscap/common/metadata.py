@@ -0,0 +1,166 @@
+"""
+On disk cache of the xml binding metadata.
+
+Building the binding metadata of the root classes reflects over hundreds of
+dataclasses on the first parse. :func:`save` stores the metadata of every
+root class and :func:`load` restores it into the shared context, so short
+lived processes can skip that step. Set the ``PYSCAP_METADATA_CACHE``
+environment variable to a cache file to load it on ``import pyscap``.
+
+The metadata of every class is pickled on its own and only unpickled when
+the class is first looked up, so loading the cache imports no subpackage
+and ``import pyscap.oval`` still does not pay for the XCCDF bindings. It is
+stored with the :func:`fingerprint` of the class, and built again when the
+fields of the class changed since the cache was saved.
+"""
+import os
+import pickle
+from dataclasses import fields
+from importlib import import_module
+from pathlib import Path
+
+import xsdata
+
+from .utils import scap_context
+
+ROOT_CLASSES = (
+    ("pyscap.oval", "OvalDefinitions"),
+    ("pyscap.oval", "OvalResults"),
+    ("pyscap.oval", "OvalSystemCharacteristics"),
+    ("pyscap.oval", "OvalVariables"),
+    ("pyscap.oval", "OvalDirectives"),
+    ("pyscap.xccdf", "Benchmark"),
+    ("pyscap.xccdf", "Tailoring"),
+    ("pyscap.xccdf", "TestResult"),
+    ("pyscap.xccdf.xccdf_1_1", "Benchmark"),
+    ("pyscap.xccdf.xccdf_1_1", "TestResult"),
+    ("pyscap.ocil", "Ocil"),
+    ("pyscap.cpe", "CpeList"),
+    ("pyscap.sds", "DataStreamCollection"),
+    ("pyscap.arf", "AssetReportCollection"),
+)
+# Version of the layout of the cache file.
+FORMAT = 2
+
+
+def default_path():
+    """Return the cache file, ``PYSCAP_METADATA_CACHE`` or a file in the
+    user cache directory."""
+    path = os.environ.get("PYSCAP_METADATA_CACHE")
+    if path:
+        return Path(path)
+
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pyscap" / "metadata.pickle"
+
+
+class LazyCache(dict):
+    """
+    The metadata of the shared context by class, restoring the pickled
+    metadata of a class on its first lookup.
+
+    :ivar pending: The :func:`fingerprint` of every class with its pickled
+        metadata, by ``(module, qualified name)``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending = {}
+
+    def __contains__(self, clazz):
+        if super().__contains__(clazz):
+            return True
+        entry = self.pending.pop((clazz.__module__, clazz.__qualname__), None)
+        if entry is None:
+            return False
+        saved, data = entry
+        if saved != fingerprint(clazz):
+            return False
+        try:
+            meta = pickle.loads(data)
+        except (pickle.UnpicklingError, EOFError, ImportError, AttributeError, ValueError):
+            return False
+        if meta.clazz is not clazz:
+            return False
+        self[clazz] = meta
+        return True
+
+    def clear(self):
+        super().clear()
+        self.pending.clear()
+
+
+def fingerprint(clazz):
+    """Return what the metadata of a class is built from, as a string: the
+    options of its ``Meta`` class and the names, types and metadata of its
+    fields."""
+    meta = clazz.__dict__.get("Meta")
+    options = sorted(
+        (name, repr(value)) for name, value in vars(meta).items() if not name.startswith("__")
+    ) if meta is not None else []
+    return repr((
+        options,
+        [(field.name, repr(field.type), repr(dict(field.metadata))) for field in fields(clazz)],
+    ))
+
+
+def _versions():
+    from .. import __version__
+
+    return FORMAT, __version__, xsdata.__version__
+
+
+def save(path=None):
+    """
+    Build the metadata of every root class and write it to ``path``.
+
+    :return: The path of the cache file.
+    """
+    for module, name in ROOT_CLASSES:
+        scap_context.build_recursive(getattr(import_module(module), name))
+
+    path = Path(path) if path else default_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(f".{os.getpid()}.tmp")
+    entries = {
+        (clazz.__module__, clazz.__qualname__): (
+            fingerprint(clazz),
+            pickle.dumps(meta, pickle.HIGHEST_PROTOCOL),
+        )
+        for clazz, meta in scap_context.cache.items()
+    }
+    with open(temp, "wb") as fp:
+        pickle.dump((_versions(), entries), fp, pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, path)
+    return path
+
+
+def load(path=None):
+    """
+    Restore the metadata saved by :func:`save` into the shared context.
+
+    The metadata of a class is unpickled on its first lookup, classes
+    whose metadata was already built keep it. A missing, unreadable or
+    stale cache is ignored, as is the metadata of classes whose fields
+    changed.
+
+    :return: Whether the cache was loaded.
+    """
+    path = Path(path) if path else default_path()
+    try:
+        with open(path, "rb") as fp:
+            versions, entries = pickle.load(fp)
+    except (OSError, pickle.UnpicklingError, EOFError, ImportError, AttributeError, ValueError):
+        return False
+
+    if versions != _versions() or not isinstance(entries, dict):
+        return False
+
+    if not isinstance(scap_context.cache, LazyCache):
+        scap_context.cache = LazyCache(scap_context.cache)
+    scap_context.cache.pending.update(entries)
+    return True
+
+
+if __name__ == "__main__":
+    print(save())
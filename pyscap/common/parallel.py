@@ -0,0 +1,83 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class ParseResult:
+    """
+    The outcome of parsing one file with :func:`parse_many`.
+
+    :ivar path: The parsed path.
+    :ivar value: The parsed object, or its projection.
+    :ivar error: The exception raised while parsing, if any.
+    """
+    path: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+def _parse(cls, path, projection, options):
+    try:
+        value = cls.parse(path, **options)
+        if projection is not None:
+            value = projection(value)
+    except Exception as e:
+        return ParseResult(path, error=e)
+    return ParseResult(path, value)
+
+
+def parse_many(paths, cls, workers=None, ordered=True, projection=None, **options):
+    """
+    Parse many files into ``cls`` instances with a pool of processes.
+
+    Every file is parsed independently, a failure is reported on its own
+    :class:`ParseResult` and does not stop the others.
+
+    :param paths: The files to parse.
+    :param cls: The :class:`ParsableElement` subclass to parse into.
+    :param workers: The number of processes, defaults to the cpu count.
+        With ``workers=1`` the files are parsed in the current process.
+    :param ordered: Yield the results in the order of ``paths`` instead of
+        as soon as they complete.
+    :param projection: A picklable callable applied to every parsed object
+        in the worker, so that only its result is sent back.
+    :param options: Keyword arguments passed on to ``cls.parse``.
+    :return: A generator of :class:`ParseResult`. At most twice as many
+        files as workers are submitted ahead of the results consumed, and
+        the files not started yet are cancelled when it is closed.
+    """
+    if workers == 1:
+        for path in paths:
+            yield _parse(cls, path, projection, options)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    paths = iter(paths)
+    # Futures by submission order, with their paths.
+    pending = deque()
+    with ProcessPoolExecutor(workers) as executor:
+        try:
+            while True:
+                for path in paths:
+                    pending.append((executor.submit(_parse, cls, path, projection, options), path))
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    return
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                    done = [entry for entry in pending if entry[0] in finished]
+                    pending = deque(entry for entry in pending if entry[0] not in finished)
+                for future, path in done:
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield ParseResult(path, error=e)
+        finally:
+            for future, _ in pending:
+                future.cancel()
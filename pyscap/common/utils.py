@@ -1,20 +1,294 @@
+import mmap
+from io import BytesIO, RawIOBase
 from pathlib import Path
+from xml.etree import ElementTree
 
 from xsdata.formats.dataclass.context import XmlContext
+from xsdata.formats.dataclass.models.generics import AnyElement
 from xsdata.formats.dataclass.parsers import XmlParser, JsonParser
+from xsdata.formats.dataclass.parsers.handlers import XmlEventHandler
 from xsdata.formats.dataclass.serializers import XmlSerializer, JsonSerializer
+from xsdata.formats.dataclass.serializers.writers import XmlEventWriter
+
+from .handlers import ExpatEventHandler
+
+backends = {
+    "native": XmlEventHandler,
+    "expat": ExpatEventHandler,
+}
+try:
+    from xsdata.formats.dataclass.parsers.handlers import LxmlEventHandler
+except ImportError:
+    DEFAULT_BACKEND = "native"
+else:
+    backends["lxml-iterparse"] = LxmlEventHandler
+    DEFAULT_BACKEND = "lxml-iterparse"
 
 scap_context = XmlContext()
-scap_parser = XmlParser(context=scap_context)
+scap_parser = XmlParser(context=scap_context, handler=backends[DEFAULT_BACKEND])
+# ElementTree elements can only be walked by the native handler.
+scap_element_parser = XmlParser(context=scap_context, handler=XmlEventHandler)
 scap_json_parser = JsonParser(context=scap_context)
 scap_serializer = XmlSerializer(context=scap_context)
+# Writes every element as soon as it is generated, the default writer may
+# build the whole document with lxml first.
+scap_stream_serializer = XmlSerializer(context=scap_context, writer=XmlEventWriter)
 scap_json_serializer = JsonSerializer(context=scap_context)
 
 
+def register_backend(name, handler):
+    """Make an xsdata ``XmlHandler`` subclass available as a backend."""
+    backends[name] = handler
+
+
+def set_backend(name):
+    """
+    Select the xml event handler used to parse every :class:`ParsableElement`.
+
+    :param name: One of ``native``, ``expat``, ``lxml-iterparse`` (only
+        when lxml is installed) or a name added by :func:`register_backend`.
+    """
+    if name not in backends:
+        raise ValueError(f"Unknown backend {name!r}, expected one of {sorted(backends)}")
+    scap_parser.handler = backends[name]
+
+
+def get_backend():
+    """Return the name of the active xml backend."""
+    for name, handler in backends.items():
+        if handler is scap_parser.handler:
+            return name
+
+
+def map_file(path):
+    """Return a read only memory map of the file at ``path``."""
+    with open(path, "rb") as fp:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class BufferReader(RawIOBase):
+    """
+    Read only file object over a memoryview or mmap.
+
+    The parsers pull the data through :meth:`readinto`, so the buffer is
+    never copied as a whole.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self.view = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        chunk = self.view[self.position:self.position + len(b)]
+        size = len(chunk)
+        b[:size] = chunk
+        self.position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.view.release()
+        super().close()
+
+
+def iterparse_source(data):
+    """Return bytes, a buffer or a path as a source for ``iterparse``."""
+    if isinstance(data, bytes):
+        return BytesIO(data)
+    elif isinstance(data, (memoryview, mmap.mmap)):
+        return BufferReader(data)
+    return str(Path(data))
+
+
+def iter_children(data, path, container, name):
+    """
+    Incrementally parse the children of a single container element.
+
+    Every direct child of the element found at ``path`` is parsed as if it
+    was the only child of ``container`` and the values of its ``name`` field
+    are yielded. Elements are dropped as soon as they have been handled, so
+    memory usage does not grow with the size of the document.
+
+    :param data: The xml document as bytes, a buffer or a path.
+    :param path: The qualified tags from the root down to the container.
+    :param container: The dataclass bound to the container element.
+    :param name: The container field holding the parsed children.
+    """
+    source = iterparse_source(data)
+    depth = len(path)
+    stack = []
+    for event, element in ElementTree.iterparse(source, ("start", "end")):
+        if event == "start":
+            stack.append(element)
+            continue
+
+        stack.pop()
+        level = len(stack)
+        inside = level >= depth and all(
+            stack[i].tag == tag for i, tag in enumerate(path)
+        )
+        if inside and level > depth:
+            continue
+
+        if inside:
+            wrapper = ElementTree.Element(stack[-1].tag, stack[-1].attrib)
+            wrapper.append(element)
+            yield from getattr(scap_element_parser.parse(wrapper, container), name)
+
+        if stack:
+            stack[-1].remove(element)
+
+
+class TrackedList(list):
+    """
+    List counting its modifications.
+
+    Indexes built over a tracked list compare its :attr:`version` to find
+    out whether they are stale, which also notices elements replaced in
+    place. Lists of a same tree can also share a :attr:`clock`, a one item
+    list counting the modifications of all of them.
+    """
+
+    version = 0
+    clock = None
+
+    def _track(name):
+        method = getattr(list, name)
+
+        def tracked(self, *args, **kwargs):
+            self.version += 1
+            if self.clock is not None:
+                self.clock[0] += 1
+            return method(self, *args, **kwargs)
+
+        tracked.__name__ = name
+        return tracked
+
+    for _name in (
+        "__setitem__", "__delitem__", "__iadd__", "__imul__", "append",
+        "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+    ):
+        locals()[_name] = _track(_name)
+    del _track, _name
+
+
+def element_id(element, attribute="id"):
+    """Return the id attribute of a bound or wildcard element."""
+    if isinstance(element, AnyElement):
+        return element.attributes.get(attribute)
+    return getattr(element, attribute, None)
+
+
+def cached_index(owner, sources, key=element_id):
+    """
+    Return a dict of the elements of some list fields by their key.
+
+    The index is cached on ``owner`` until one of the lists is replaced,
+    changes length or gets another first or last element, or, for a
+    :class:`TrackedList`, is modified in any way. The lists are left as they
+    are. Other modifications of plain lists, such as replacing an element
+    in the middle, or changing the key of an element, are not detected,
+    call :meth:`ParsableElement.invalidate` after them.
+
+    :param owner: The object keeping the cache.
+    :param sources: Pairs of a container (or ``None``) and the name of a
+        list field of it.
+    :param key: Returns the key of an element.
+    """
+    lists = [getattr(container, name) for container, name in sources if container is not None]
+    snapshot = [_snapshot(values) for values in lists]
+    cache = owner.__dict__.setdefault("_indexes", {})
+    name = tuple(name for _, name in sources)
+    cached = cache.get(name)
+    if (
+        cached is None
+        or cached[1] != snapshot
+        or len(cached[0]) != len(lists)
+        or any(a is not b for a, b in zip(cached[0], lists))
+    ):
+        index = {}
+        for values in lists:
+            for value in values:
+                index.setdefault(key(value), value)
+        # The first and last elements are kept so that their ids are not
+        # reused by other elements.
+        ends = [values[:1] + values[-1:] for values in lists]
+        cached = cache[name] = (lists, snapshot, index, ends)
+
+    return cached[2]
+
+
+def _snapshot(values):
+    """Return what tells whether a list changed: its length, its first and
+    last elements, and the version of a :class:`TrackedList`."""
+    if not values:
+        return 0, None, None, getattr(values, "version", 0)
+    return len(values), id(values[0]), id(values[-1]), getattr(values, "version", 0)
+
+
+def cached_tree_index(owner, fields, nested, key=element_id):
+    """
+    Return a dict of the elements of a tree of list fields by their key.
+
+    The elements are collected from the ``fields`` lists of ``owner`` and,
+    recursively, of the elements of its ``nested`` field. Each key maps to
+    a ``(field name, element, parent)`` tuple.
+
+    Like :func:`cached_index` the index is cached on ``owner`` and the
+    lists are left as they are. It is checked in constant time: the lists
+    of ``owner`` for replacement and length, and the tracked lists of the
+    tree through a shared :attr:`TrackedList.clock` counting all their
+    modifications. Other changes below the root, such as to the plain lists
+    of a parsed document, are not detected, call
+    :meth:`ParsableElement.invalidate` after them.
+
+    :param owner: The root of the tree, keeping the cache.
+    :param fields: The names of the list fields to index, fields missing
+        from an element are skipped.
+    :param nested: The name of the list field holding the subtrees.
+    :param key: Returns the key of an element.
+    """
+    cache = owner.__dict__.setdefault("_indexes", {})
+    cached = cache.get(fields)
+    if cached is not None:
+        clock, time, roots, index = cached
+        if clock[0] == time and all(
+            getattr(owner, name, None) is values and len(values) == size
+            for name, values, size in roots
+        ):
+            return index
+
+    clock = [0]
+    roots = []
+    index = {}
+    pending = [owner]
+    while pending:
+        parent = pending.pop()
+        for name in fields:
+            values = getattr(parent, name, None)
+            if values is None:
+                continue
+            if isinstance(values, TrackedList):
+                values.clock = clock
+            if parent is owner:
+                roots.append((name, values, len(values)))
+            for value in values:
+                index.setdefault(key(value), (name, value, parent))
+            if name == nested:
+                pending.extend(reversed(values))
+
+    cache[fields] = (clock, clock[0], roots, index)
+    return index
+
+
 class ParsableElement:
 
     @classmethod
-    def parse(cls, data, data_format="xml"):
+    def parse(cls, data, data_format="xml", memory_map=False):
         if data_format == "xml":
             parser = scap_parser
         elif data_format == "json":
@@ -24,16 +298,46 @@ class ParsableElement:
 
         if isinstance(data, bytes):
             return parser.from_bytes(data, cls)
+        elif isinstance(data, (memoryview, mmap.mmap)):
+            with BufferReader(data) as reader:
+                return parser.parse(reader, cls)
+        elif memory_map:
+            with map_file(data) as buffer, BufferReader(buffer) as reader:
+                return parser.parse(reader, cls)
         else:
             return parser.from_path(Path(data), cls)
 
-    def write(self, file, data_format="xml"):
+    def invalidate(self):
+        """
+        Drop the indexes cached on the element by its lookups.
+
+        The indexes notice the lists they cover being replaced, the lists of
+        the element changing length and any modification of a
+        :class:`TrackedList`, other modifications of the indexed lists must
+        be followed by a call to this method.
+        """
+        self.__dict__.pop("_indexes", None)
+
+    def write(self, file, data_format="xml", stream=False, buffer_size=-1):
+        """
+        Serialize the element to a path or a text file object.
+
+        With ``stream`` the xml output is written while the object tree is
+        walked, through a buffer of ``buffer_size`` bytes, instead of being
+        built as a whole first. List fields may then hold generators, which
+        are consumed as their elements are written, e.g. to copy the items of
+        :meth:`OvalSystemCharacteristics.iter_items` into a results file.
+        """
         if data_format == "xml":
-            serializer = scap_serializer
+            serializer = scap_stream_serializer if stream else scap_serializer
         elif data_format == "json":
             serializer = scap_json_serializer
         else:
             raise ValueError
 
-        with open(file, "w", encoding="utf8") as fp:
+        if hasattr(file, "write"):
+            serializer.write(file, self)
+            return
+
+        with open(file, "w", buffer_size, encoding="utf8") as fp:
             serializer.write(fp, self)
@@ -171,3 +171,25 @@ from .variables import (
     VariablesType,
     OvalVariables
 )
+from .evaluation import (
+    OvalEvaluator,
+    check_existence,
+    combine,
+    combine_check,
+    compile_entity,
+    compile_state,
+    compile_value,
+    item_entities,
+    negate,
+)
+from .versions import (
+    compare_many,
+    debian_evr_key,
+    dpkg_compare,
+    evr_key,
+    ios_version_key,
+    rpmvercmp,
+    version_key,
+)
+from .computation import VariableGraph, glob_to_regex
+from .binding import BoundVariables, ExternalVariableBinder
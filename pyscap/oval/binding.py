@@ -0,0 +1,154 @@
+"""
+Binding of OVAL variables documents to external variables.
+
+An :class:`ExternalVariableBinder` reads the external variables of a
+definitions document once, compiling their possible values and
+restrictions, so the variables documents of many hosts are checked and
+converted with the compiled tests only.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from .computation import value_string
+from .definitions import ExternalVariable
+from .evaluation import ERROR, KEYS, TRUE, combine, compile_value
+
+
+@dataclass
+class BoundVariables:
+    """
+    The values of external variables bound from a variables document.
+
+    :ivar values: The valid values by variable id as strings, for the
+        ``variables`` of :class:`OvalEvaluator`.
+    :ivar typed: The datatype of every variable with its values
+        converted for it: ints, floats, booleans, sortable version keys,
+        networks or strings. States compare them without parsing them
+        again, see :func:`compile_state`.
+    :ivar errors: ``(variable id, message)`` pairs for the variables left
+        out because of invalid values.
+    :ivar missing: The ids of the external variables without values.
+    """
+    values: Dict[str, List[str]] = field(default_factory=dict)
+    typed: Dict[str, Tuple[str, List[object]]] = field(default_factory=dict)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+
+class ExternalVariableBinder:
+    """
+    Bind variables documents to the external variables of definitions.
+
+    A value must have the datatype of its declaration, and when possible
+    values or restrictions are declared, equal one of the possible values
+    or satisfy one of the restrictions.
+
+    :param definitions: The :class:`OvalDefinitions` declaring the
+        external variables.
+    """
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.declarations = {}
+        if definitions.variables is not None:
+            self.declarations = {
+                variable.id: variable
+                for variable in definitions.variables.external_variable
+                if isinstance(variable, ExternalVariable)
+            }
+        # The datatype and compiled constraints of every variable.
+        self._checks = {id: self._compile(variable) for id, variable in self.declarations.items()}
+
+    def bind(self, variables, strict=False):
+        """
+        Bind the values of a variables document.
+
+        Variables that are not declared external are ignored, a document
+        may serve several definitions documents.
+
+        :param variables: An :class:`OvalVariables` document, its variables,
+            or a mapping of variable ids to lists of values.
+        :param strict: Whether to raise on invalid values rather than leave
+            the variables out.
+        :raises ValueError: If ``strict`` and some values are invalid, with
+            every error in the message.
+        """
+        bound = BoundVariables()
+        for id, datatype, values in _entries(variables):
+            check = self._checks.get(id)
+            if check is None:
+                continue
+            expected, key, constraints = check
+            if datatype is not None and datatype != expected:
+                bound.errors.append((id, f"has datatype {datatype}, expected {expected}"))
+                continue
+            values = [value_string(value) for value in values]
+            try:
+                typed = [key(value) for value in values]
+            except (TypeError, ValueError) as error:
+                bound.errors.append((id, f"has a value that is not a valid {expected}: {error}"))
+                continue
+            invalid = [value for value in values if not _allowed(constraints, value)]
+            if invalid:
+                bound.errors.append((id, f"has values out of its possible values: {invalid!r}"))
+                continue
+            bound.values[id] = values
+            bound.typed[id] = (expected, typed)
+
+        invalid = {id for id, _ in bound.errors}
+        bound.missing = [
+            id for id in self.declarations if id not in bound.values and id not in invalid
+        ]
+        if strict and bound.errors:
+            raise ValueError(
+                "Invalid external variables: "
+                + "; ".join(f"{id} {message}" for id, message in bound.errors)
+            )
+        return bound
+
+    def _compile(self, variable):
+        datatype = getattr(variable.datatype, "value", variable.datatype) or "string"
+        constraints = []
+        for possible in variable.possible_value:
+            constraints.append(("AND", [self._test("equals", datatype, possible.value)]))
+        for possible in variable.possible_restriction:
+            constraints.append((
+                getattr(possible.operator, "value", possible.operator) or "AND",
+                [
+                    self._test(getattr(r.operation, "value", r.operation), datatype, r.value)
+                    for r in possible.restriction
+                ],
+            ))
+        return datatype, KEYS.get(datatype, str), constraints
+
+    def _test(self, operation, datatype, value):
+        try:
+            return compile_value(operation or "equals", datatype, [value_string(value)])
+        except (TypeError, ValueError, re.error):
+            # A constraint that cannot be parsed allows no value.
+            return lambda value: ERROR
+
+
+def _allowed(constraints, value):
+    """Return whether a value equals a possible value or satisfies a
+    possible restriction, any value being allowed without constraints."""
+    if not constraints:
+        return True
+    return any(
+        combine(operator, [test(value) for test in tests]) is TRUE
+        for operator, tests in constraints
+    )
+
+
+def _entries(variables):
+    """Yield the ``(id, datatype, values)`` of the variables of a document,
+    its variables or a mapping."""
+    if isinstance(variables, dict):
+        for id, values in variables.items():
+            yield id, None, values
+        return
+    container = getattr(variables, "variables", variables)
+    for variable in getattr(container, "variable", ()):
+        yield variable.id, getattr(variable.datatype, "value", variable.datatype), variable.value
+
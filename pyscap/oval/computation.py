@@ -0,0 +1,468 @@
+"""
+Computation of the values of OVAL variables.
+
+A :class:`VariableGraph` orders the variables of a definitions document by
+their dependencies, through ``variable_component`` references and through
+the objects of ``object_component`` references with their ``var_ref``,
+filters and sets. Cycles are reported when the graph is built, and every
+host then computes each variable once, in order, from the values of the
+variables before it.
+"""
+import calendar
+import itertools
+import math
+import re
+import time
+from datetime import datetime, timedelta
+
+from xsdata.formats.dataclass.models.generics import AnyElement
+
+from .definitions import (
+    ArithmeticFunctionType,
+    BeginFunctionType,
+    ConcatFunctionType,
+    ConstantVariable,
+    CountFunctionType,
+    EndFunctionType,
+    EscapeRegexFunctionType,
+    ExternalVariable,
+    GlobToRegexFunctionType,
+    LiteralComponentType,
+    ObjectComponentType,
+    RegexCaptureFunctionType,
+    SplitFunctionType,
+    SubstringFunctionType,
+    TimeDifferenceFunctionType,
+    UniqueFunctionType,
+    VariableComponentType,
+    oval_id,
+)
+
+# Fields of functions holding their components, in the order of the schema.
+COMPONENT_FIELDS = (
+    "object_component",
+    "variable_component",
+    "literal_component",
+    "arithmetic",
+    "begin",
+    "concat",
+    "end",
+    "escape_regex",
+    "split",
+    "substring",
+    "time_difference",
+    "regex_capture",
+    "unique",
+    "count",
+    "glob_to_regex",
+)
+VARIABLE_FIELDS = ("local_variable", "constant_variable", "external_variable")
+REGEX_METACHARACTERS = frozenset("^$\\.[](){}*+?|")
+
+# strptime formats of the date-time formats, the date first then an
+# optional time.
+_DATE_ORDERS = {
+    "year_month_day": ("%Y", "%m", "%d"),
+    "month_day_year": ("%m", "%d", "%Y"),
+    "day_month_year": ("%d", "%m", "%Y"),
+}
+_TIMES = ("", " %H:%M:%S", "T%H:%M:%S", "T%H%M%S", " %H%M%S", "%H%M%S")
+_DATE_FORMATS = {
+    name: [
+        separator.join(order) + clock
+        for separator in ("", "/", "-", ".")
+        for clock in _TIMES
+    ] + (["%B %d, %Y" + clock for clock in _TIMES] + ["%b %d, %Y" + clock for clock in _TIMES]
+         if name == "month_day_year" else [])
+    for name, order in _DATE_ORDERS.items()
+}
+# Seconds between 1601-01-01, the origin of Windows file times, and 1970.
+_FILETIME_EPOCH = 11644473600
+
+
+class VariableGraph:
+    """
+    The variables of a definitions document in dependency order.
+
+    :param definitions: The :class:`OvalDefinitions` of the variables.
+    :raises ValueError: If variables depend on themselves.
+    """
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.variables = {}
+        if definitions.variables is not None:
+            for name in VARIABLE_FIELDS:
+                for variable in getattr(definitions.variables, name):
+                    self.variables[variable.id] = variable
+        self._dependencies = {}
+        # The compiled regex_capture patterns, or their errors, by pattern.
+        self._patterns = {}
+        #: The variable ids, every variable coming after its dependencies.
+        self.order = self._sort()
+
+    def dependencies(self, id):
+        """Return the ids of the variables a variable or object directly
+        depends on, through objects for object components."""
+        dependencies = self._dependencies.get(id)
+        if dependencies is None:
+            # Set first, so objects of sets referencing each other end.
+            references = self._dependencies[id] = set()
+            variable = self.variables.get(id)
+            if variable is not None:
+                for component in _walk(variable):
+                    if hasattr(component, "var_ref"):
+                        references.add(component.var_ref)
+                    elif hasattr(component, "object_ref"):
+                        references.update(self.dependencies(component.object_ref))
+            else:
+                try:
+                    references.update(self._element_references(self.definitions.get_object(id)))
+                except KeyError:
+                    pass
+            dependencies = references
+        return dependencies
+
+    def compute(self, system_characteristics=None, external=None):
+        """
+        Compute the values of the variables for a host.
+
+        :param system_characteristics: The items collected on the host, for
+            object components.
+        :param external: The values of external variables by id, as lists
+            of strings.
+        :return: The values of every variable by id, as lists of strings.
+            Variables that cannot be computed, or whose external value is
+            missing, are left out.
+        """
+        computation = _Computation(system_characteristics, self._patterns)
+        values = computation.values
+        external = external or {}
+        for id in self.order:
+            variable = self.variables[id]
+            if isinstance(variable, ConstantVariable):
+                values[id] = [value_string(value) for value in variable.value]
+            elif isinstance(variable, ExternalVariable):
+                if id in external:
+                    values[id] = list(external[id])
+            else:
+                try:
+                    values[id] = computation.evaluate(_components(variable)[0])
+                except (ValueError, IndexError, KeyError, OverflowError):
+                    pass
+        return values
+
+    def _sort(self):
+        order, done, active = [], set(), []
+        for id in self.variables:
+            if id in done:
+                continue
+            # Depth first, with the path kept to report cycles.
+            stack = [(id, iter(self.dependencies(id)))]
+            active.append(id)
+            while stack:
+                node, pending = stack[-1]
+                for dependency in pending:
+                    if dependency in done:
+                        continue
+                    if dependency in active:
+                        cycle = active[active.index(dependency):] + [dependency]
+                        raise ValueError("Variables depend on themselves: " + " -> ".join(cycle))
+                    active.append(dependency)
+                    stack.append((dependency, iter(self.dependencies(dependency))))
+                    break
+                else:
+                    stack.pop()
+                    active.pop()
+                    done.add(node)
+                    if node in self.variables:
+                        order.append(node)
+        return order
+
+    def _element_references(self, element):
+        """Return the ids of the variables used by an object, its filters
+        and the objects of its sets."""
+        references = set()
+        pending = [element]
+        while pending:
+            element = pending.pop()
+            for child in element.children:
+                if not isinstance(child, AnyElement):
+                    continue
+                var_ref = oval_id(child, "var_ref")
+                if var_ref is not None:
+                    references.add(var_ref)
+                name = child.qname.rpartition("}")[2]
+                if name == "object_reference":
+                    references.update(self.dependencies(_text_id(child.text)))
+                elif name == "filter":
+                    try:
+                        pending.append(self.definitions.get_state(_text_id(child.text)))
+                    except KeyError:
+                        pass
+                pending.append(child)
+        return references
+
+
+class _Computation:
+    """The values of the variables of one host."""
+
+    def __init__(self, system_characteristics, patterns=None):
+        self.system_characteristics = system_characteristics
+        self.values = {}
+        self.patterns = {} if patterns is None else patterns
+
+    def evaluate(self, component):
+        """Return the values of a component or function."""
+        if isinstance(component, LiteralComponentType):
+            return [value_string(component.value)]
+        if isinstance(component, VariableComponentType):
+            return self.values[component.var_ref]
+        if isinstance(component, ObjectComponentType):
+            return self._object_values(component)
+
+        function = getattr(self, "_" + _FUNCTIONS[type(component)])
+        return function(component, [self.evaluate(child) for child in _components(component)])
+
+    def _object_values(self, component):
+        try:
+            if self.system_characteristics is None:
+                raise KeyError(component.object_ref)
+            collected = self.system_characteristics.get_collected_object(component.object_ref)
+        except KeyError:
+            raise ValueError(f"Object {component.object_ref} was not collected") from None
+        values = []
+        for reference in collected.reference:
+            try:
+                item = self.system_characteristics.get_item(reference.item_ref)
+            except KeyError:
+                continue
+            if item.attributes.get("status", "exists") != "exists":
+                continue
+            for entity in item.children:
+                if not isinstance(entity, AnyElement):
+                    continue
+                if entity.qname.rpartition("}")[2] != component.item_field:
+                    continue
+                if entity.attributes.get("status", "exists") != "exists":
+                    continue
+                if component.record_field is None:
+                    values.append(entity.text or "")
+                else:
+                    values.extend(
+                        field.text or ""
+                        for field in entity.children
+                        if isinstance(field, AnyElement)
+                        and field.attributes.get("name") == component.record_field
+                    )
+        if not values:
+            raise ValueError(f"Object {component.object_ref} has no {component.item_field}")
+        return values
+
+    def _arithmetic(self, function, components):
+        operation = getattr(function.arithmetic_operation, "value", function.arithmetic_operation)
+        results = []
+        for operands in itertools.product(*components):
+            numbers = [_number(operand) for operand in operands]
+            result = sum(numbers) if operation == "add" else math.prod(numbers)
+            results.append(str(result))
+        return results
+
+    def _begin(self, function, components):
+        character = function.character or ""
+        return [value if value.startswith(character) else character + value for value in components[0]]
+
+    def _end(self, function, components):
+        character = function.character or ""
+        return [value if value.endswith(character) else value + character for value in components[0]]
+
+    def _concat(self, function, components):
+        return ["".join(values) for values in itertools.product(*components)]
+
+    def _split(self, function, components):
+        if not function.delimiter:
+            raise ValueError("Split without a delimiter")
+        return [part for value in components[0] for part in value.split(function.delimiter)]
+
+    def _substring(self, function, components):
+        start = max(function.substring_start or 1, 1) - 1
+        length = function.substring_length
+        results = []
+        for value in components[0]:
+            if start > len(value):
+                raise ValueError(f"Substring start beyond {value!r}")
+            results.append(value[start:] if length is None or length < 0 else value[start:start + length])
+        return results
+
+    def _time_difference(self, function, components):
+        format_1 = getattr(function.format_1, "value", function.format_1) or "year_month_day"
+        format_2 = getattr(function.format_2, "value", function.format_2) or "year_month_day"
+        if len(components) == 1:
+            now = int(time.time())
+            return [str(now - _timestamp(value, format_2)) for value in components[0]]
+        first = [_timestamp(value, format_1) for value in components[0]]
+        second = [_timestamp(value, format_2) for value in components[1]]
+        return [str(a - b) for a, b in itertools.product(first, second)]
+
+    def _regex_capture(self, function, components):
+        pattern = self._pattern(function.pattern or "")
+        results = []
+        for value in components[0]:
+            match = pattern.search(value)
+            results.append(match.group(1) or "" if match and pattern.groups else "")
+        return results
+
+    def _pattern(self, pattern):
+        compiled = self.patterns.get(pattern)
+        if compiled is None:
+            try:
+                compiled = re.compile(pattern)
+            except re.error as error:
+                compiled = error
+            self.patterns[pattern] = compiled
+        if isinstance(compiled, re.error):
+            raise ValueError(f"Invalid pattern {pattern!r}: {compiled}")
+        return compiled
+
+    def _unique(self, function, components):
+        return list(dict.fromkeys(value for values in components for value in values))
+
+    def _count(self, function, components):
+        return [str(sum(len(values) for values in components))]
+
+    def _escape_regex(self, function, components):
+        return [
+            "".join("\\" + char if char in REGEX_METACHARACTERS else char for char in value)
+            for value in components[0]
+        ]
+
+    def _glob_to_regex(self, function, components):
+        return [glob_to_regex(value, function.glob_noescape) for value in components[0]]
+
+
+_FUNCTIONS = {
+    ArithmeticFunctionType: "arithmetic",
+    BeginFunctionType: "begin",
+    ConcatFunctionType: "concat",
+    EndFunctionType: "end",
+    EscapeRegexFunctionType: "escape_regex",
+    SplitFunctionType: "split",
+    SubstringFunctionType: "substring",
+    TimeDifferenceFunctionType: "time_difference",
+    RegexCaptureFunctionType: "regex_capture",
+    UniqueFunctionType: "unique",
+    CountFunctionType: "count",
+    GlobToRegexFunctionType: "glob_to_regex",
+}
+
+
+def glob_to_regex(glob, noescape=False):
+    """
+    Convert a shell glob to a regular expression, like the glob_to_regex
+    function: ``*`` and ``?`` do not match slashes, nor a leading dot.
+
+    :param noescape: Whether backslashes are literal rather than escapes.
+    :raises ValueError: If a bracket expression is not closed.
+    """
+    parts = ["^"]
+    index, size = 0, len(glob)
+    while index < size:
+        char = glob[index]
+        start = index == 0 or glob[index - 1] == "/"
+        if char == "\\" and not noescape and index + 1 < size:
+            parts.append(re.escape(glob[index + 1]))
+            index += 2
+            continue
+        if char in "*?[" and start:
+            parts.append(r"(?=[^.])")
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = index + 1
+            if end < size and glob[end] in "!^":
+                end += 1
+            if end < size and glob[end] == "]":
+                end += 1
+            end = glob.find("]", end)
+            if end == -1:
+                raise ValueError(f"Unclosed bracket in {glob!r}")
+            body = glob[index + 1:end]
+            if body[:1] == "!":
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            index = end
+        else:
+            parts.append("\\" + char if char in REGEX_METACHARACTERS else char)
+        index += 1
+    parts.append("$")
+    return "".join(parts)
+
+
+def _components(function):
+    """Return the components of a function or variable in document order,
+    functions of several components keeping them in their ``choice``
+    field."""
+    choice = getattr(function, "choice", None)
+    if choice is not None:
+        return list(choice)
+    components = []
+    for name in COMPONENT_FIELDS:
+        value = getattr(function, name, None)
+        if value is not None:
+            components.append(value)
+    return components
+
+
+def _walk(function):
+    """Yield the variable and object components under a function."""
+    for component in _components(function):
+        if hasattr(component, "var_ref") or hasattr(component, "object_ref"):
+            yield component
+        else:
+            yield from _walk(component)
+
+
+def value_string(value):
+    """Return the text of a value of a literal component, constant or
+    external variable as written in OVAL, booleans in lowercase."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+def _number(value):
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _timestamp(value, format):
+    """Return the seconds since the epoch of a date-time, in UTC."""
+    value = value.strip()
+    if format == "seconds_since_epoch":
+        return int(value)
+    if format == "win_filetime":
+        return int(value, 16) // 10 ** 7 - _FILETIME_EPOCH
+    if format == "cim_datetime":
+        moment = datetime.strptime(value[:14], "%Y%m%d%H%M%S")
+        offset = int(value[21:25] or 0) if len(value) >= 25 else 0
+        return calendar.timegm((moment - timedelta(minutes=offset)).timetuple())
+    for pattern in _DATE_FORMATS[format]:
+        try:
+            moment = datetime.strptime(value, pattern)
+        except ValueError:
+            continue
+        return calendar.timegm(moment.timetuple())
+    raise ValueError(f"Invalid {format} date-time {value!r}")
+
+
+def _text_id(text):
+    """Return an id held in the text of an element."""
+    text = (text or "").strip()
+    if text[:1] == "{":
+        text = "oval:" + text.partition("}")[2]
+    return text
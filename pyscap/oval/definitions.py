@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Union
+from typing import List, Optional, Type, Union
 
 from .common import (
     CheckEnumeration,
@@ -14,12 +14,45 @@ from .common import (
     SimpleDatatypeEnumeration,
     Notes as CommonNotes,
 )
-from ..common.utils import ParsableElement
+from ..common.utils import ParsableElement, cached_index, element_id
 from ..common.xmldsig import Signature
 
 OVAL_DEFINITIONS_5_NAMESPACE = "http://oval.mitre.org/XMLSchema/oval-definitions-5"
 
 
+def _components(type_name):
+    def components(self):
+        clazz = globals()[type_name]
+        return [component for component in self.choice if type(component) is clazz]
+
+    return property(components, doc=f"The {type_name} components, read-only.")
+
+
+class FunctionComponents:
+    """
+    Read-only access to the components of a function by element name.
+
+    Functions taking several components keep them in document order in
+    their ``choice`` field, these properties return new lists of the
+    components of one kind and changing them has no effect on the function.
+    """
+    object_component = _components("ObjectComponentType")
+    variable_component = _components("VariableComponentType")
+    literal_component = _components("LiteralComponentType")
+    arithmetic = _components("ArithmeticFunctionType")
+    begin = _components("BeginFunctionType")
+    concat = _components("ConcatFunctionType")
+    end = _components("EndFunctionType")
+    escape_regex = _components("EscapeRegexFunctionType")
+    split = _components("SplitFunctionType")
+    substring = _components("SubstringFunctionType")
+    time_difference = _components("TimeDifferenceFunctionType")
+    regex_capture = _components("RegexCaptureFunctionType")
+    unique = _components("UniqueFunctionType")
+    count = _components("CountFunctionType")
+    glob_to_regex = _components("GlobToRegexFunctionType")
+
+
 class ArithmeticEnumeration(Enum):
     """The ArithmeticEnumeration simple type defines basic arithmetic
     operations.
@@ -3730,7 +3763,7 @@ class Variable(VariableType):
 
 
 @dataclass
-class CountFunctionType:
+class CountFunctionType(FunctionComponents):
     """The count function takes one or more components and returns the count of
     all of the values represented by the components.
 
@@ -3746,109 +3779,72 @@ class CountFunctionType:
     these two components, the function will resolve to a local_variable
     with the values '3'.
     """
-    object_component: List[ObjectComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    variable_component: List[VariableComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    literal_component: List[LiteralComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    arithmetic: List["ArithmeticFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    begin: List["BeginFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    concat: List["ConcatFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    end: List["EndFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    escape_regex: List["EscapeRegexFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    split: List["SplitFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    substring: List["SubstringFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    time_difference: List["TimeDifferenceFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    regex_capture: List["RegexCaptureFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    unique: List["UniqueFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    count: List["CountFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    glob_to_regex: List[GlobToRegexFunctionType] = field(
+    choice: List[object] = field(
         default_factory=list,
         metadata={
-            "type": "Element",
-            "sequential": True,
+            "type": "Elements",
+            "choices": (
+                {
+                    "name": "object_component",
+                    "type": ObjectComponentType,
+                },
+                {
+                    "name": "variable_component",
+                    "type": VariableComponentType,
+                },
+                {
+                    "name": "literal_component",
+                    "type": LiteralComponentType,
+                },
+                {
+                    "name": "arithmetic",
+                    "type": Type["ArithmeticFunctionType"],
+                },
+                {
+                    "name": "begin",
+                    "type": Type["BeginFunctionType"],
+                },
+                {
+                    "name": "concat",
+                    "type": Type["ConcatFunctionType"],
+                },
+                {
+                    "name": "end",
+                    "type": Type["EndFunctionType"],
+                },
+                {
+                    "name": "escape_regex",
+                    "type": Type["EscapeRegexFunctionType"],
+                },
+                {
+                    "name": "split",
+                    "type": Type["SplitFunctionType"],
+                },
+                {
+                    "name": "substring",
+                    "type": Type["SubstringFunctionType"],
+                },
+                {
+                    "name": "time_difference",
+                    "type": Type["TimeDifferenceFunctionType"],
+                },
+                {
+                    "name": "regex_capture",
+                    "type": Type["RegexCaptureFunctionType"],
+                },
+                {
+                    "name": "unique",
+                    "type": Type["UniqueFunctionType"],
+                },
+                {
+                    "name": "count",
+                    "type": Type["CountFunctionType"],
+                },
+                {
+                    "name": "glob_to_regex",
+                    "type": Type["GlobToRegexFunctionType"],
+                },
+            ),
         }
     )
 
@@ -4572,7 +4568,7 @@ class ExternalVariable(VariableType):
 
 
 @dataclass
-class UniqueFunctionType:
+class UniqueFunctionType(FunctionComponents):
     """The unique function takes one or more components and removes any
     duplicate value from the set of components.
 
@@ -4591,109 +4587,72 @@ class UniqueFunctionType:
     local_variable that is a collection of two string values, 'foo' and
     'bar'.
     """
-    object_component: List[ObjectComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    variable_component: List[VariableComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    literal_component: List[LiteralComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    arithmetic: List["ArithmeticFunctionType"] = field(
+    choice: List[object] = field(
         default_factory=list,
         metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    begin: List["BeginFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    concat: List["ConcatFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    end: List["EndFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    escape_regex: List["EscapeRegexFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    split: List["SplitFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    substring: List["SubstringFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    time_difference: List["TimeDifferenceFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    regex_capture: List["RegexCaptureFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    unique: List["UniqueFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    count: List[CountFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
-        }
-    )
-    glob_to_regex: List[GlobToRegexFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "sequential": True,
+            "type": "Elements",
+            "choices": (
+                {
+                    "name": "object_component",
+                    "type": ObjectComponentType,
+                },
+                {
+                    "name": "variable_component",
+                    "type": VariableComponentType,
+                },
+                {
+                    "name": "literal_component",
+                    "type": LiteralComponentType,
+                },
+                {
+                    "name": "arithmetic",
+                    "type": Type["ArithmeticFunctionType"],
+                },
+                {
+                    "name": "begin",
+                    "type": Type["BeginFunctionType"],
+                },
+                {
+                    "name": "concat",
+                    "type": Type["ConcatFunctionType"],
+                },
+                {
+                    "name": "end",
+                    "type": Type["EndFunctionType"],
+                },
+                {
+                    "name": "escape_regex",
+                    "type": Type["EscapeRegexFunctionType"],
+                },
+                {
+                    "name": "split",
+                    "type": Type["SplitFunctionType"],
+                },
+                {
+                    "name": "substring",
+                    "type": Type["SubstringFunctionType"],
+                },
+                {
+                    "name": "time_difference",
+                    "type": Type["TimeDifferenceFunctionType"],
+                },
+                {
+                    "name": "regex_capture",
+                    "type": Type["RegexCaptureFunctionType"],
+                },
+                {
+                    "name": "unique",
+                    "type": Type["UniqueFunctionType"],
+                },
+                {
+                    "name": "count",
+                    "type": Type["CountFunctionType"],
+                },
+                {
+                    "name": "glob_to_regex",
+                    "type": Type["GlobToRegexFunctionType"],
+                },
+            ),
         }
     )
 
@@ -4840,129 +4799,78 @@ class RegexCaptureFunctionType:
 
 
 @dataclass
-class TimeDifferenceFunctionType:
+class TimeDifferenceFunctionType(FunctionComponents):
     """The time_difference function calculates the difference in seconds between date-time values. If one component is specified, the values of that component are subtracted from the current time (UTC). The current time is the time at which the function is evaluated. If two components are specified, the value of the second component is subtracted from the value of the first component. If the component(s) contain a collection of values, the operation is performed multiple times on the Cartesian product of the component(s) and the result is also a collection of time difference values. For example, assume a local_variable specifies the time_difference function and has two sub-components under this function: the first component returns "04/02/2009" and "04/03/2009", and the second component returns "02/02/2005" and "02/03/2005" and "02/04/2005". The local_variable element would evaluate to a collection of six values: (ToSeconds("04/02/2009") - ToSeconds("02/02/2005")), (ToSeconds("04/02/2009") - ToSeconds("02/03/2005")),
     (ToSeconds("04/02/2009") - ToSeconds("02/04/2005")), (ToSeconds("04/03/2009") - ToSeconds("02/02/2005")), (ToSeconds("04/03/2009") - ToSeconds("02/03/2005")), and (ToSeconds("04/03/2009") - ToSeconds("02/04/2005")).
     The date-time format of each component is determined by the two format attributes. The format1 attribute applies to the first component, and the format2 attribute applies to the second component. Valid values for the attributes are 'win_filetime', 'seconds_since_epoch', 'day_month_year', 'year_month_day', and 'month_day_year'. Please see the DateTimeFormatEnumeration for more information about each of these values. If an input value is not understood, the result is an error. If only one input is specified, specify the format with the format2 attribute, as the first input is considered to be the implied 'current time' input.
     Note that the datatype associated with the components should be 'string' or 'int' depending on which date time format is specified.  The result of this function though is always an integer."""
-    object_component: List[ObjectComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    variable_component: List[VariableComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    literal_component: List[LiteralComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    arithmetic: List["ArithmeticFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    begin: List["BeginFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    concat: List["ConcatFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    end: List["EndFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    escape_regex: List["EscapeRegexFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    split: List["SplitFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    substring: List["SubstringFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    time_difference: List["TimeDifferenceFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    regex_capture: List[RegexCaptureFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    unique: List[UniqueFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    count: List[CountFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "max_occurs": 2,
-            "sequential": True,
-        }
-    )
-    glob_to_regex: List[GlobToRegexFunctionType] = field(
+    choice: List[object] = field(
         default_factory=list,
         metadata={
-            "type": "Element",
+            "type": "Elements",
+            "choices": (
+                {
+                    "name": "object_component",
+                    "type": ObjectComponentType,
+                },
+                {
+                    "name": "variable_component",
+                    "type": VariableComponentType,
+                },
+                {
+                    "name": "literal_component",
+                    "type": LiteralComponentType,
+                },
+                {
+                    "name": "arithmetic",
+                    "type": Type["ArithmeticFunctionType"],
+                },
+                {
+                    "name": "begin",
+                    "type": Type["BeginFunctionType"],
+                },
+                {
+                    "name": "concat",
+                    "type": Type["ConcatFunctionType"],
+                },
+                {
+                    "name": "end",
+                    "type": Type["EndFunctionType"],
+                },
+                {
+                    "name": "escape_regex",
+                    "type": Type["EscapeRegexFunctionType"],
+                },
+                {
+                    "name": "split",
+                    "type": Type["SplitFunctionType"],
+                },
+                {
+                    "name": "substring",
+                    "type": Type["SubstringFunctionType"],
+                },
+                {
+                    "name": "time_difference",
+                    "type": Type["TimeDifferenceFunctionType"],
+                },
+                {
+                    "name": "regex_capture",
+                    "type": Type["RegexCaptureFunctionType"],
+                },
+                {
+                    "name": "unique",
+                    "type": Type["UniqueFunctionType"],
+                },
+                {
+                    "name": "count",
+                    "type": Type["CountFunctionType"],
+                },
+                {
+                    "name": "glob_to_regex",
+                    "type": Type["GlobToRegexFunctionType"],
+                },
+            ),
             "max_occurs": 2,
-            "sequential": True,
         }
     )
     format_1: DateTimeFormatEnumeration = field(
@@ -5442,7 +5350,7 @@ class EndFunctionType:
 
 
 @dataclass
-class ConcatFunctionType:
+class ConcatFunctionType(FunctionComponents):
     """The concat function takes two or more components and concatenates them
     together to form a single string.
 
@@ -5458,124 +5366,73 @@ class ConcatFunctionType:
     exist, then the result of the concat operation should be does not
     exist.
     """
-    object_component: List[ObjectComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    variable_component: List[VariableComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    literal_component: List[LiteralComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    arithmetic: List["ArithmeticFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    begin: List["BeginFunctionType"] = field(
+    choice: List[object] = field(
         default_factory=list,
         metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    concat: List["ConcatFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    end: List[EndFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    escape_regex: List[EscapeRegexFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    split: List[SplitFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    substring: List[SubstringFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    time_difference: List[TimeDifferenceFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    regex_capture: List[RegexCaptureFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
+            "type": "Elements",
+            "choices": (
+                {
+                    "name": "object_component",
+                    "type": ObjectComponentType,
+                },
+                {
+                    "name": "variable_component",
+                    "type": VariableComponentType,
+                },
+                {
+                    "name": "literal_component",
+                    "type": LiteralComponentType,
+                },
+                {
+                    "name": "arithmetic",
+                    "type": Type["ArithmeticFunctionType"],
+                },
+                {
+                    "name": "begin",
+                    "type": Type["BeginFunctionType"],
+                },
+                {
+                    "name": "concat",
+                    "type": Type["ConcatFunctionType"],
+                },
+                {
+                    "name": "end",
+                    "type": Type["EndFunctionType"],
+                },
+                {
+                    "name": "escape_regex",
+                    "type": Type["EscapeRegexFunctionType"],
+                },
+                {
+                    "name": "split",
+                    "type": Type["SplitFunctionType"],
+                },
+                {
+                    "name": "substring",
+                    "type": Type["SubstringFunctionType"],
+                },
+                {
+                    "name": "time_difference",
+                    "type": Type["TimeDifferenceFunctionType"],
+                },
+                {
+                    "name": "regex_capture",
+                    "type": Type["RegexCaptureFunctionType"],
+                },
+                {
+                    "name": "unique",
+                    "type": Type["UniqueFunctionType"],
+                },
+                {
+                    "name": "count",
+                    "type": Type["CountFunctionType"],
+                },
+                {
+                    "name": "glob_to_regex",
+                    "type": Type["GlobToRegexFunctionType"],
+                },
+            ),
             "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    unique: List[UniqueFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    count: List[CountFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    glob_to_regex: List[GlobToRegexFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
         }
     )
 
@@ -5692,7 +5549,7 @@ class BeginFunctionType:
 
 
 @dataclass
-class ArithmeticFunctionType:
+class ArithmeticFunctionType(FunctionComponents):
     """The arithmetic function takes two or more integer or float components
     and performs a basic mathematical function on them.
 
@@ -5708,124 +5565,73 @@ class ArithmeticFunctionType:
     six values: 1+3, 1+4, 1+5, 2+3, 2+4, and 2+5. Note that if both an
     integer and float components are used then the result is a float.
     """
-    object_component: List[ObjectComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    variable_component: List[VariableComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    literal_component: List[LiteralComponentType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    arithmetic: List["ArithmeticFunctionType"] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    begin: List[BeginFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    concat: List[ConcatFunctionType] = field(
+    choice: List[object] = field(
         default_factory=list,
         metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    end: List[EndFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    escape_regex: List[EscapeRegexFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
+            "type": "Elements",
+            "choices": (
+                {
+                    "name": "object_component",
+                    "type": ObjectComponentType,
+                },
+                {
+                    "name": "variable_component",
+                    "type": VariableComponentType,
+                },
+                {
+                    "name": "literal_component",
+                    "type": LiteralComponentType,
+                },
+                {
+                    "name": "arithmetic",
+                    "type": Type["ArithmeticFunctionType"],
+                },
+                {
+                    "name": "begin",
+                    "type": Type["BeginFunctionType"],
+                },
+                {
+                    "name": "concat",
+                    "type": Type["ConcatFunctionType"],
+                },
+                {
+                    "name": "end",
+                    "type": Type["EndFunctionType"],
+                },
+                {
+                    "name": "escape_regex",
+                    "type": Type["EscapeRegexFunctionType"],
+                },
+                {
+                    "name": "split",
+                    "type": Type["SplitFunctionType"],
+                },
+                {
+                    "name": "substring",
+                    "type": Type["SubstringFunctionType"],
+                },
+                {
+                    "name": "time_difference",
+                    "type": Type["TimeDifferenceFunctionType"],
+                },
+                {
+                    "name": "regex_capture",
+                    "type": Type["RegexCaptureFunctionType"],
+                },
+                {
+                    "name": "unique",
+                    "type": Type["UniqueFunctionType"],
+                },
+                {
+                    "name": "count",
+                    "type": Type["CountFunctionType"],
+                },
+                {
+                    "name": "glob_to_regex",
+                    "type": Type["GlobToRegexFunctionType"],
+                },
+            ),
             "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    split: List[SplitFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    substring: List[SubstringFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    time_difference: List[TimeDifferenceFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    regex_capture: List[RegexCaptureFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    unique: List[UniqueFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    count: List[CountFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
-        }
-    )
-    glob_to_regex: List[GlobToRegexFunctionType] = field(
-        default_factory=list,
-        metadata={
-            "type": "Element",
-            "min_occurs": 2,
-            "sequential": True,
         }
     )
     arithmetic_operation: Optional[ArithmeticEnumeration] = field(
@@ -6068,3 +5874,56 @@ class OvalDefinitions(ParsableElement):
             "namespace": "http://www.w3.org/2000/09/xmldsig#",
         }
     )
+
+    def get_definition(self, id):
+        """Return the definition with the given id, see :meth:`get_test`."""
+        return cached_index(self, [(self.definitions, "definition")])[id]
+
+    def get_test(self, id):
+        """
+        Return the test with the given id.
+
+        The lookup goes through an index built on first use, rebuilt when
+        the list of tests is replaced, changes length or gets another first
+        or last element. Call :meth:`invalidate` after other modifications
+        of the list, see :func:`cached_index`.
+
+        :raises KeyError: If there is no such test.
+        """
+        return cached_index(self, [(self.tests, "test")], oval_id)[id]
+
+    def get_object(self, id):
+        """Return the object with the given id, see :meth:`get_test`."""
+        return cached_index(self, [(self.objects, "object_value")], oval_id)[id]
+
+    def get_state(self, id):
+        """Return the state with the given id, see :meth:`get_test`."""
+        return cached_index(self, [(self.states, "state")], oval_id)[id]
+
+    def get_variable(self, id):
+        """Return the variable with the given id, see :meth:`get_test`."""
+        sources = [
+            (self.variables, name)
+            for name in (
+                "local_variable",
+                "constant_variable",
+                "external_variable",
+                "variable",
+            )
+        ]
+        return cached_index(self, sources)[id]
+
+
+def oval_id(element, attribute="id"):
+    """
+    Return an id or reference attribute of an OVAL element.
+
+    xsdata reads prefixed attribute values of wildcard elements as qualified
+    names, so ``oval:org.example:tst:1`` comes back as
+    ``{http://oval.mitre.org/XMLSchema/oval-common-5}org.example:tst:1``
+    when the document binds the ``oval`` prefix, which is undone here.
+    """
+    value = element_id(element, attribute)
+    if value and value[0] == "{":
+        value = "oval:" + value.partition("}")[2]
+    return value
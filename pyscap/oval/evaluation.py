@@ -0,0 +1,687 @@
+"""
+Evaluation of OVAL definitions against system characteristics.
+
+:class:`OvalEvaluator` evaluates the criteria of definitions, and the tests
+they reference, against the items collected on a host, producing OVAL
+results. The results of tests and definitions are memoized per host, so a
+test shared by many definitions is evaluated once.
+"""
+import ipaddress
+import operator
+import re
+
+from xsdata.formats.dataclass.models.generics import AnyElement
+from xsdata.models.datatype import XmlDateTime
+
+from . import results as res, versions
+from .common import (
+    CheckEnumeration,
+    ExistenceEnumeration,
+    GeneratorType,
+    OperatorEnumeration,
+    SchemaVersionType,
+)
+from .computation import VariableGraph
+from .definitions import oval_id
+from .results import ResultEnumeration
+
+TRUE = ResultEnumeration.TRUE_VALUE
+FALSE = ResultEnumeration.FALSE_VALUE
+UNKNOWN = ResultEnumeration.UNKNOWN
+ERROR = ResultEnumeration.ERROR
+NOT_EVALUATED = ResultEnumeration.NOT_EVALUATED
+NOT_APPLICABLE = ResultEnumeration.NOT_APPLICABLE
+
+SCHEMA_VERSION = "5.11.2"
+# Children of tests, objects and states that are not entities.
+NON_ENTITIES = frozenset(("notes", "Signature", "filter", "set", "behaviors"))
+
+
+def negate(result):
+    """Return the negation of a result, only true and false change."""
+    if result is TRUE:
+        return FALSE
+    if result is FALSE:
+        return TRUE
+    return result
+
+
+def combine(operator, results):
+    """
+    Combine results with an operator, following the truth tables of the
+    OVAL specification.
+
+    :param operator: An :class:`OperatorEnumeration` or its value.
+    :param results: The results to combine.
+    :return: The combined result, not applicable when all the results
+        are, or there are none.
+    """
+    operator = getattr(operator, "value", operator)
+    t, f, undetermined = _count(results)
+    if undetermined is NOT_APPLICABLE:
+        return NOT_APPLICABLE
+    if operator == "AND":
+        return FALSE if f else undetermined or TRUE
+    if operator == "OR":
+        return TRUE if t else undetermined or FALSE
+    if operator == "ONE":
+        if t > 1:
+            return FALSE
+        return undetermined or (TRUE if t == 1 else FALSE)
+    if operator == "XOR":
+        return undetermined or (TRUE if t % 2 else FALSE)
+    raise ValueError(f"Unknown operator {operator}")
+
+
+def combine_check(check, results):
+    """
+    Combine the results of the items of a test with its check.
+
+    :param check: A :class:`CheckEnumeration` or its value.
+    :param results: The results of the items.
+    """
+    check = getattr(check, "value", check)
+    if check == "all":
+        return combine("AND", results)
+    if check == "at least one":
+        return combine("OR", results)
+    if check == "only one":
+        return combine("ONE", results)
+    if check in ("none satisfy", "none exist"):
+        t, f, undetermined = _count(results)
+        if undetermined is NOT_APPLICABLE:
+            return NOT_APPLICABLE
+        return FALSE if t else undetermined or TRUE
+    raise ValueError(f"Unknown check {check}")
+
+
+def check_existence(existence, statuses):
+    """
+    Return whether the items of an object satisfy a check_existence.
+
+    :param existence: An :class:`ExistenceEnumeration` or its value.
+    :param statuses: The status of every item, ``exists``, ``does not
+        exist``, ``error`` or ``not collected``.
+    """
+    existence = getattr(existence, "value", existence)
+    exists = missing = errors = not_collected = 0
+    for status in statuses:
+        if status == "exists":
+            exists += 1
+        elif status == "does not exist":
+            missing += 1
+        elif status == "error":
+            errors += 1
+        else:
+            not_collected += 1
+    undetermined = ERROR if errors else UNKNOWN if not_collected else None
+
+    if existence == "all_exist":
+        if missing:
+            return FALSE
+        return undetermined or (TRUE if exists else FALSE)
+    if existence == "any_exist":
+        return ERROR if errors and not exists else TRUE
+    if existence == "at_least_one_exists":
+        return TRUE if exists else undetermined or FALSE
+    if existence == "none_exist":
+        return FALSE if exists else undetermined or TRUE
+    if existence == "only_one_exists":
+        if exists > 1:
+            return FALSE
+        return undetermined or (TRUE if exists == 1 else FALSE)
+    raise ValueError(f"Unknown check_existence {existence}")
+
+
+def _count(results):
+    """Return the number of true and false results, and the result of the
+    others: error, unknown or not evaluated by precedence, not applicable
+    when there are only not applicable results, ``None`` otherwise."""
+    t = f = 0
+    seen = set()
+    for result in results:
+        if result is TRUE:
+            t += 1
+        elif result is FALSE:
+            f += 1
+        else:
+            seen.add(result)
+    for result in (ERROR, UNKNOWN, NOT_EVALUATED):
+        if result in seen:
+            return t, f, result
+    return t, f, NOT_APPLICABLE if not t and not f else None
+
+
+class OvalEvaluator:
+    """
+    Evaluate the definitions of an OVAL definitions document.
+
+    The references of tests are read once, and states compiled into
+    predicates with :func:`compile_state`, for the evaluations of every
+    host. The variables are computed once per host, see
+    :class:`VariableGraph`, and the states using them compiled per host.
+
+    :param definitions: The :class:`OvalDefinitions` to evaluate.
+    :param variables: The values of external variables by id, as lists of
+        strings, for the hosts evaluated without their own. A
+        :class:`BoundVariables` also provides the values converted for
+        their datatype, which states compare without parsing them again.
+    :raises ValueError: If variables depend on themselves.
+    """
+
+    def __init__(self, definitions, variables=None):
+        self.definitions = definitions
+        variables, typed = _bound(variables)
+        self.variables = dict(variables or {})
+        self.typed = dict(typed)
+        self.graph = VariableGraph(definitions)
+        self._tests = {}
+        self._states = {}
+        self._variable_states = set()
+
+    def results(self, system_characteristics, ids=None, variables=None):
+        """
+        Return the result of definitions on a host.
+
+        :param system_characteristics: The items collected on the host.
+        :param ids: The definition ids, defaults to all the definitions.
+        :param variables: The values of external variables on the host, a
+            mapping or :class:`BoundVariables`, defaults to those of the
+            evaluator.
+        :return: The :class:`ResultEnumeration` of every definition by id.
+        """
+        host = _Host(self, system_characteristics, variables)
+        return {id: host.definition(id)[0] for id in self._ids(ids)}
+
+    def evaluate(self, system_characteristics, ids=None, variables=None):
+        """
+        Return the full OVAL results of definitions on a host.
+
+        :param system_characteristics: The items collected on the host.
+        :param ids: The definition ids, defaults to all the definitions.
+        :param variables: The values of external variables on the host, a
+            mapping or :class:`BoundVariables`, defaults to those of the
+            evaluator.
+        :return: An :class:`OvalResults` with the results of the definitions,
+            of the tests they use and the system characteristics.
+        """
+        host = _Host(self, system_characteristics, variables)
+        definitions = [host.definition(id)[1] for id in self._ids(ids)]
+        system = res.SystemType(
+            definitions=res.DefinitionsType(definition=definitions),
+            tests=res.TestsType(test=[host.test(id)[1] for id in host.tests]),
+            oval_system_characteristics=system_characteristics,
+        )
+        directive = res.DirectiveType(reported=True)
+        return res.OvalResults(
+            generator=GeneratorType(
+                product_name="pyscap",
+                schema_version=[SchemaVersionType(value=SCHEMA_VERSION)],
+                timestamp=XmlDateTime.now(),
+            ),
+            directives=res.DefaultDirectivesType(
+                definition_true=directive,
+                definition_false=directive,
+                definition_unknown=directive,
+                definition_error=directive,
+                definition_not_evaluated=directive,
+                definition_not_applicable=directive,
+            ),
+            oval_definitions=self.definitions,
+            results=res.ResultsType(system=[system]),
+        )
+
+    def _ids(self, ids):
+        if ids is not None:
+            return ids
+        definitions = self.definitions.definitions
+        return [definition.id for definition in (definitions.definition if definitions else ())]
+
+    def _test(self, id):
+        """Return the test with its object id and state ids."""
+        info = self._tests.get(id)
+        if info is None:
+            test = self.definitions.get_test(id)
+            object_id, state_ids = None, []
+            for child in _children(test):
+                name = _local(child)
+                if name == "object":
+                    object_id = oval_id(child, "object_ref")
+                elif name == "state":
+                    state_ids.append(oval_id(child, "state_ref"))
+            info = self._tests[id] = (test, object_id, state_ids)
+        return info
+
+    def _state(self, id, variables, typed):
+        """Return the compiled predicate of a state, shared by all the hosts
+        unless the state uses variables."""
+        predicate = self._states.get(id)
+        if predicate is None:
+            state = self.definitions.get_state(id)
+            if id in self._variable_states or any(
+                "var_ref" in entity.attributes for entity in _children(state)
+            ):
+                self._variable_states.add(id)
+                return compile_state(state, variables, typed)
+            predicate = self._states[id] = compile_state(state)
+        return predicate
+
+
+class _Host:
+    """The memoized results of the evaluation of one host."""
+
+    def __init__(self, evaluator, system_characteristics, variables=None):
+        self.evaluator = evaluator
+        if variables is None:
+            self.typed = evaluator.typed
+            variables = evaluator.variables
+        else:
+            variables, self.typed = _bound(variables)
+        self.system_characteristics = system_characteristics
+        self.variables = evaluator.graph.compute(system_characteristics, variables)
+        self.tests = {}
+        self.definitions = {}
+        self.states = {}
+        self._item_entities = {}
+        self._pending = set()
+
+    def definition(self, id):
+        """Return the result of a definition and its results element.
+
+        :raises KeyError: If there is no such definition.
+        """
+        cached = self.definitions.get(id)
+        if cached is not None:
+            return cached
+
+        definition = self.evaluator.definitions.get_definition(id)
+        self._pending.add(id)
+        try:
+            if definition.criteria is None:
+                result, criteria = NOT_EVALUATED, None
+            else:
+                result, criteria = self._criteria(definition.criteria)
+        finally:
+            self._pending.discard(id)
+        element = res.DefinitionType(
+            criteria=criteria,
+            definition_id=id,
+            version=definition.version,
+            class_value=definition.class_value,
+            result=result,
+        )
+        cached = self.definitions[id] = (result, element)
+        return cached
+
+    def test(self, id):
+        """Return the result of a test and its results element."""
+        cached = self.tests.get(id)
+        if cached is None:
+            cached = self.tests[id] = self._evaluate_test(id)
+        return cached
+
+    def _criteria(self, criteria):
+        results = []
+        children = res.CriteriaType(
+            applicability_check=criteria.applicability_check,
+            operator=criteria.operator,
+            negate=criteria.negate,
+        )
+        for child in criteria.criteria:
+            result, element = self._criteria(child)
+            results.append(result)
+            children.criteria.append(element)
+        for criterion in criteria.criterion:
+            try:
+                test, _, _ = self.evaluator._test(criterion.test_ref)
+            except KeyError:
+                # A dangling reference fails this criterion only.
+                test, result = None, ERROR
+            else:
+                result = self.test(criterion.test_ref)[0]
+            if criterion.negate:
+                result = negate(result)
+            results.append(result)
+            children.criterion.append(res.CriterionType(
+                applicability_check=criterion.applicability_check,
+                test_ref=criterion.test_ref,
+                version=_int(test.attributes.get("version")) if test is not None else None,
+                negate=criterion.negate,
+                result=result,
+            ))
+        for extend in criteria.extend_definition:
+            # Definitions extending themselves, or unknown ones, give an
+            # error for the extension only.
+            result, version = ERROR, None
+            if extend.definition_ref not in self._pending:
+                try:
+                    result = self.definition(extend.definition_ref)[0]
+                    version = self.evaluator.definitions.get_definition(extend.definition_ref).version
+                except KeyError:
+                    pass
+            if extend.negate:
+                result = negate(result)
+            results.append(result)
+            children.extend_definition.append(res.ExtendDefinitionType(
+                applicability_check=extend.applicability_check,
+                definition_ref=extend.definition_ref,
+                version=version,
+                negate=extend.negate,
+                result=result,
+            ))
+
+        result = combine(criteria.operator, results)
+        if criteria.negate:
+            result = negate(result)
+        children.result = result
+        return result, children
+
+    def _evaluate_test(self, id):
+        test, object_id, state_ids = self.evaluator._test(id)
+        attributes = test.attributes
+        existence = ExistenceEnumeration(attributes.get("check_existence", "at_least_one_exists"))
+        check = CheckEnumeration(attributes.get("check", "all"))
+        state_operator = OperatorEnumeration(attributes.get("state_operator", "AND"))
+        element = res.TestType(
+            test_id=id,
+            version=_int(attributes.get("version")),
+            check_existence=existence,
+            check=check,
+            state_operator=state_operator,
+        )
+
+        collected = None
+        if object_id:
+            try:
+                collected = self.system_characteristics.get_collected_object(object_id)
+            except KeyError:
+                pass
+        flag = collected.flag.value if collected is not None else "not collected"
+        if flag in ("error", "not collected", "not applicable"):
+            element.result = {"error": ERROR, "not applicable": NOT_APPLICABLE}.get(flag, UNKNOWN)
+            return element.result, element
+
+        items = []
+        for reference in collected.reference:
+            try:
+                item = self.system_characteristics.get_item(reference.item_ref)
+            except KeyError:
+                item = None
+            items.append((reference.item_ref, item))
+        statuses = [
+            "error" if item is None else item.attributes.get("status", "exists")
+            for _, item in items
+        ]
+        result = check_existence(existence, statuses)
+
+        try:
+            states = [self._state(state_id) for state_id in state_ids]
+        except KeyError:
+            element.result = ERROR
+            return element.result, element
+        item_results = []
+        for (item_id, item), status in zip(items, statuses):
+            if result is TRUE and states and status == "exists":
+                entities = self._entities(item_id, item)
+                if len(states) == 1:
+                    item_result = states[0](entities)
+                else:
+                    item_result = combine(state_operator, [state(entities) for state in states])
+                item_results.append(item_result)
+            else:
+                item_result = NOT_EVALUATED
+            element.tested_item.append(res.TestedItemType(item_id=item_id, result=item_result))
+        if item_results:
+            result = combine_check(check, item_results)
+
+        if flag == "incomplete":
+            result = _incomplete(result, existence.value, check.value, bool(states))
+        element.result = result
+        return result, element
+
+    def _state(self, id):
+        predicate = self.states.get(id)
+        if predicate is None:
+            predicate = self.states[id] = self.evaluator._state(id, self.variables, self.typed)
+        return predicate
+
+    def _entities(self, item_id, item):
+        cached = self._item_entities.get(item_id)
+        if cached is None:
+            cached = self._item_entities[item_id] = item_entities(item)
+        return cached
+
+
+def _incomplete(result, existence, check, has_states):
+    """Return the result of a test on an object whose items were only
+    partly collected, unknown unless the missing items cannot change it."""
+    if result is FALSE and (
+        existence in ("none_exist", "only_one_exists")
+        or has_states and check in ("all", "none satisfy", "none exist", "only one")
+    ):
+        return result
+    if result is TRUE and existence in ("at_least_one_exists", "any_exist") and (
+        not has_states or check == "at least one"
+    ):
+        return result
+    return UNKNOWN if result in (TRUE, FALSE) else result
+
+
+def compile_state(state, variables=None, typed=None):
+    """
+    Compile a state into a predicate of items.
+
+    The values of the entities of the state are parsed once for their
+    datatype, and regular expressions compiled, so matching an item only
+    parses the values of the item.
+
+    :param state: The state, a wildcard element.
+    :param variables: The values of variables by id, as lists of strings,
+        for the ``var_ref`` of entities.
+    :param typed: The ``(datatype, values)`` of variables whose values are
+        already converted for their datatype, as in
+        :attr:`BoundVariables.typed`, used by the entities of a datatype
+        with the same conversion.
+    :return: A function of the entities of an item, as returned by
+        :func:`item_entities`, to a :class:`ResultEnumeration`.
+    """
+    operator = state.attributes.get("operator", "AND")
+    entities = [
+        (_local(entity), compile_entity(entity, variables, typed))
+        for entity in _children(state)
+        if _local(entity) not in NON_ENTITIES
+    ]
+    # A false entity decides AND, a true one OR, whatever the others are.
+    decisive = {"AND": FALSE, "OR": TRUE}.get(operator)
+
+    def predicate(item_entities):
+        results = []
+        for name, match in entities:
+            result = match(item_entities.get(name, ()))
+            if result is decisive:
+                return result
+            results.append(result)
+        return combine(operator, results) if results else TRUE
+
+    return predicate
+
+
+def compile_entity(entity, variables=None, typed=None):
+    """
+    Compile an entity of a state into a predicate of the item entities of
+    the same name, see :func:`compile_state`.
+
+    An entity whose values cannot be parsed, or whose variable has no
+    values, always gives an error.
+    """
+    attributes = entity.attributes
+    datatype = attributes.get("datatype", "string")
+    var_ref = oval_id(entity, "var_ref")
+    converted = None
+    if var_ref is None:
+        expected = [entity.text or ""]
+    else:
+        expected = (variables or {}).get(var_ref)
+        variable_datatype, values = (typed or {}).get(var_ref, (None, None))
+        if values is not None and KEYS.get(variable_datatype, str) is KEYS.get(datatype, str):
+            converted = values
+    if not expected:
+        return _constant(ERROR)
+    try:
+        test = compile_value(
+            attributes.get("operation", "equals"),
+            datatype,
+            expected,
+            attributes.get("var_check", "all"),
+            converted,
+        )
+    except (TypeError, ValueError, re.error):
+        return _constant(ERROR)
+    entity_check = attributes.get("entity_check", "all")
+
+    def match(values):
+        if len(values) == 1:
+            value = values[0]
+            if value.attributes.get("status", "exists") != "exists":
+                return FALSE
+            return test(value.text or "")
+        if not values:
+            return FALSE
+        return combine_check(entity_check, [
+            test(value.text or "") if value.attributes.get("status", "exists") == "exists" else FALSE
+            for value in values
+        ])
+
+    return match
+
+
+def item_entities(item):
+    """Return the entities of an item as lists by local name."""
+    entities = {}
+    for child in _children(item):
+        entities.setdefault(_local(child), []).append(child)
+    return entities
+
+
+def compile_value(operation, datatype, expected, var_check="all", typed=None):
+    """
+    Compile a comparison with expected values.
+
+    :param operation: The OVAL operation, e.g. ``greater than``.
+    :param datatype: The OVAL datatype of the values.
+    :param expected: The expected values as strings.
+    :param var_check: How the comparisons with several expected values
+        combine, a :class:`CheckEnumeration` value.
+    :param typed: The expected values already converted for the datatype,
+        used instead of converting ``expected`` by operations comparing
+        converted values.
+    :return: A function of a value string to the :class:`ResultEnumeration`
+        of ``value operation expected``, error when the value cannot be
+        parsed.
+    :raises ValueError: If the operation is unknown or an expected value
+        cannot be parsed, :class:`re.error` if a pattern is invalid.
+    """
+    if operation == "pattern match":
+        key, compare = str, _search
+        keys = [re.compile(value) for value in expected]
+    elif operation in ("case insensitive equals", "case insensitive not equal"):
+        key = str.lower
+        compare = operator.eq if operation == "case insensitive equals" else operator.ne
+        keys = [value.lower() for value in expected]
+    else:
+        compare = OPERATIONS.get(operation)
+        if compare is None:
+            raise ValueError(f"Unknown operation {operation}")
+        key = KEYS.get(datatype, str)
+        keys = list(typed) if typed is not None else [key(value) for value in expected]
+
+    if len(keys) == 1:
+        (other,) = keys
+
+        def test(value):
+            try:
+                return TRUE if compare(key(value), other) else FALSE
+            except (TypeError, ValueError, AttributeError):
+                return ERROR
+
+        return test
+
+    def test_all(value):
+        try:
+            value = key(value)
+        except (TypeError, ValueError, AttributeError):
+            return ERROR
+        results = []
+        for other in keys:
+            try:
+                results.append(TRUE if compare(value, other) else FALSE)
+            except (TypeError, AttributeError):
+                results.append(ERROR)
+        return combine_check(var_check, results)
+
+    return test_all
+
+
+def _constant(result):
+    return lambda values: result
+
+
+def _search(value, pattern):
+    return pattern.search(value) is not None
+
+
+def _boolean(value):
+    value = value.strip().lower()
+    if value in ("true", "1"):
+        return True
+    if value in ("false", "0"):
+        return False
+    raise ValueError(value)
+
+
+def _network(value):
+    return ipaddress.ip_network(value.strip(), strict=False)
+
+
+# Parsers of values into comparable keys by datatype, strings are kept.
+KEYS = {
+    "int": lambda value: int(value.strip()),
+    "float": lambda value: float(value.strip()),
+    "boolean": _boolean,
+    **versions.KEYS,
+    "ipv4_address": _network,
+    "ipv6_address": _network,
+    "binary": lambda value: value.strip().lower(),
+}
+OPERATIONS = {
+    "equals": operator.eq,
+    "not equal": operator.ne,
+    "greater than": operator.gt,
+    "less than": operator.lt,
+    "greater than or equal": operator.ge,
+    "less than or equal": operator.le,
+    "bitwise and": lambda value, other: value & other == other,
+    "bitwise or": lambda value, other: value | other == other,
+    "subset of": lambda value, other: value.subnet_of(other),
+    "superset of": lambda value, other: value.supernet_of(other),
+}
+
+
+def _bound(variables):
+    """Return the values and typed values of a :class:`BoundVariables`,
+    or a mapping of values without typed values."""
+    if hasattr(variables, "typed"):
+        return variables.values, variables.typed
+    return variables, {}
+
+
+def _children(element):
+    return [child for child in element.children if isinstance(child, AnyElement)]
+
+
+def _local(element):
+    return element.qname.rpartition("}")[2]
+
+
+def _int(value):
+    return None if value is None else int(value)
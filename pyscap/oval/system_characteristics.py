@@ -8,7 +8,7 @@ from .common import (
     MessageType,
     SimpleDatatypeEnumeration,
 )
-from ..common.utils import ParsableElement
+from ..common.utils import ParsableElement, cached_index, element_id, iter_children
 from ..common.xmldsig import Signature
 
 OVAL_SYSTEM_CHARACTERISTICS_5_NAMESPACE = "http://oval.mitre.org/XMLSchema/oval-system-characteristics-5"
@@ -1911,3 +1911,64 @@ class OvalSystemCharacteristics(ParsableElement):
             "namespace": "http://www.w3.org/2000/09/xmldsig#",
         }
     )
+
+    def get_collected_object(self, id):
+        """Return the collected object with the given id, see
+        :meth:`get_item`."""
+        return cached_index(self, [(self.collected_objects, "object")])[id]
+
+    def get_item(self, id):
+        """
+        Return the item with the given id.
+
+        The lookup goes through an index built on first use, rebuilt when
+        the list of items is replaced, changes length or gets another first
+        or last element. Call :meth:`invalidate` after other modifications
+        of the list, see :func:`cached_index`.
+
+        :param id: The id of the item, as the ``item_ref`` of references.
+        :raises KeyError: If there is no such item.
+        """
+        return cached_index(self, [(self.system_data, "item")], _item_id)[id]
+
+    @classmethod
+    def iter_items(cls, data):
+        """
+        Yield the items of the system_data section one at a time.
+
+        The items are parsed exactly as :meth:`parse` would parse them,
+        without keeping the rest of the document in memory.
+
+        :param data: The xml document as bytes, a buffer or a path.
+        """
+        return iter_children(
+            data,
+            (cls._qname(cls.Meta.name), cls._qname("system_data")),
+            SystemDataType,
+            "item",
+        )
+
+    @classmethod
+    def iter_collected_objects(cls, data):
+        """
+        Yield the objects of the collected_objects section one at a time.
+
+        :param data: The xml document as bytes, a buffer or a path.
+        """
+        return iter_children(
+            data,
+            (cls._qname(cls.Meta.name), cls._qname("collected_objects")),
+            CollectedObjectsType,
+            "object",
+        )
+
+    @staticmethod
+    def _qname(name):
+        return f"{{{OVAL_SYSTEM_CHARACTERISTICS_5_NAMESPACE}}}{name}"
+
+
+def _item_id(item):
+    """Return the id of an item as an int, ``None`` for text between
+    items."""
+    id = element_id(item) if not isinstance(item, str) else None
+    return None if id is None else int(id)
@@ -0,0 +1,170 @@
+"""
+Comparison of package and software versions.
+
+Versions are parsed into sortable keys, tuples that compare as the
+versions do, so comparing a state value with many installed versions is a
+tuple comparison each. Keys are cached, the same versions coming back for
+every host.
+
+* ``evr_string``: ``epoch:version-release`` compared like rpm does, the
+  version and release with the rpmvercmp rules.
+* ``debian_evr_string``: ``epoch:upstream-revision`` compared like dpkg.
+* ``version``: integers separated by single characters, missing trailing
+  components being zero.
+* ``ios_version``: Cisco IOS versions such as ``12.2(33)SXI4a``, compared
+  by their numbers and trains in order.
+"""
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 1 << 16
+
+_RPM_TOKENS = re.compile(r"[A-Za-z]+|[0-9]+|~|\^")
+_DPKG_PARTS = re.compile(r"([^0-9]*)([0-9]*)")
+_IOS_TOKENS = re.compile(r"[A-Za-z]+|[0-9]+")
+# Ranks of rpm tokens: a tilde sorts before the end of the version, which
+# sorts before a caret, then letters and numbers.
+_TILDE, _END, _CARET, _ALPHA, _NUMBER = range(5)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def rpm_version_key(value):
+    """Return the key of a version or release compared with rpmvercmp."""
+    key = []
+    for token in _RPM_TOKENS.findall(value):
+        if token == "~":
+            key.append((_TILDE, 0))
+        elif token == "^":
+            key.append((_CARET, 0))
+        elif token[0].isdigit():
+            key.append((_NUMBER, int(token)))
+        else:
+            key.append((_ALPHA, token))
+    key.append((_END, 0))
+    return tuple(key)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def evr_key(value):
+    """Return the key of an rpm ``epoch:version-release``, the epoch
+    defaulting to 0."""
+    epoch, version, release = _split_evr(value.strip())
+    return int(epoch or 0), rpm_version_key(version), rpm_version_key(release)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def dpkg_version_key(value):
+    """Return the key of an upstream version or revision compared like
+    dpkg: letters first, then a tilde, the end of the version, and other
+    characters, numbers being compared by value."""
+    key = []
+    for text, number in _DPKG_PARTS.findall(value):
+        if not text and not number:
+            continue
+        order = tuple(
+            -1 if char == "~" else ord(char) if char.isalpha() and char.isascii() else ord(char) + 256
+            for char in text
+        )
+        key.append((order + (0,), int(number or 0)))
+    if not key:
+        key.append(((0,), 0))
+    key.append(((0,), 0))
+    return tuple(key)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def debian_evr_key(value):
+    """Return the key of a dpkg ``epoch:upstream-revision``, the epoch
+    defaulting to 0 and the revision to empty."""
+    value = value.strip()
+    epoch, _, rest = value.partition(":") if ":" in value else ("", "", value)
+    upstream, _, revision = rest.rpartition("-") if "-" in rest else (rest, "", "")
+    return int(epoch or 0), dpkg_version_key(upstream), dpkg_version_key(revision)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def version_key(value):
+    """Return the key of a version, trailing zero components not
+    counting."""
+    key = [int(part) for part in re.split(r"[^0-9]", value.strip())]
+    while len(key) > 1 and key[-1] == 0:
+        key.pop()
+    return tuple(key)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def ios_version_key(value):
+    """Return the key of a Cisco IOS version, the numbers and letters of
+    the release, train and rebuild in order, numbers first."""
+    tokens = _IOS_TOKENS.findall(value)
+    if not tokens:
+        raise ValueError(f"Invalid IOS version {value!r}")
+    return tuple(
+        (0, int(token), "") if token.isdigit() else (1, 0, token.upper()) for token in tokens
+    )
+
+
+# Key functions by OVAL datatype.
+KEYS = {
+    "evr_string": evr_key,
+    "debian_evr_string": debian_evr_key,
+    "version": version_key,
+    "ios_version": ios_version_key,
+}
+
+
+def compare(datatype, value, other):
+    """
+    Compare two versions of a datatype.
+
+    :return: -1, 0 or 1 when ``value`` is lower, equal or greater.
+    :raises ValueError: If a version cannot be parsed.
+    """
+    key = KEYS[datatype]
+    a, b = key(value), key(other)
+    return (a > b) - (a < b)
+
+
+def compare_many(datatype, values, other):
+    """
+    Compare many versions with one, e.g. the installed versions of packages
+    with the version of a state.
+
+    :return: The list of -1, 0 or 1 for every value, ``None`` for the
+        values that cannot be parsed.
+    :raises ValueError: If ``other`` cannot be parsed.
+    """
+    key = KEYS[datatype]
+    b = key(other)
+    results = []
+    for value in values:
+        try:
+            a = key(value)
+        except ValueError:
+            results.append(None)
+            continue
+        results.append((a > b) - (a < b))
+    return results
+
+
+def rpmvercmp(value, other):
+    """Compare two versions or releases like rpm, see :func:`compare`."""
+    a, b = rpm_version_key(value), rpm_version_key(other)
+    return (a > b) - (a < b)
+
+
+def dpkg_compare(value, other):
+    """Compare two Debian versions like dpkg, see :func:`compare`."""
+    return compare("debian_evr_string", value, other)
+
+
+def clear_caches():
+    """Empty the caches of keys."""
+    for key in (rpm_version_key, dpkg_version_key, *KEYS.values()):
+        key.cache_clear()
+
+
+def _split_evr(value):
+    epoch, _, rest = value.partition(":") if ":" in value else ("", "", value)
+    version, _, release = rest.rpartition("-") if "-" in rest else (rest, "", "")
+    return epoch, version, release
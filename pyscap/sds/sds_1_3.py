@@ -1,11 +1,23 @@
+import mmap
+import re
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional, Union
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
 
+from xsdata.exceptions import ParserError
 from xsdata.models.datatype import XmlDateTime
 
 from ..common.catalog import Catalog
-from ..common.utils import ParsableElement
+from ..common.utils import (
+    ParsableElement,
+    cached_index,
+    map_file,
+    scap_parser,
+)
 from ..common.xmldsig import Signature
 from ..cpe import CpeList
 from ..ocil import Ocil
@@ -100,6 +112,36 @@ class Component:
     )
 
 
+class _LazyComponent(Component):
+    """A component created by a lazy parse, holding only its id until
+    another field is accessed. It then parses its recorded source and
+    becomes a plain :class:`Component`."""
+
+    class Meta(Component.Meta):
+        pass
+
+    def __getattribute__(self, name):
+        if name in _LAZY_COMPONENT_FIELDS:
+            state = object.__getattribute__(self, "__dict__")
+            source = state.pop("_source", None)
+            if source is not None:
+                state.update(_load_component(*source).__dict__)
+                object.__setattr__(self, "__class__", Component)
+
+        return object.__getattribute__(self, name)
+
+    def __eq__(self, other):
+        # Dataclasses only compare instances of the same class, loading
+        # first makes this one a plain Component.
+        self.timestamp
+        return Component.__eq__(self, other)
+
+
+_LAZY_COMPONENT_FIELDS = frozenset(
+    name for name in Component.__dataclass_fields__ if name != "id"
+)
+
+
 @dataclass
 class ComponentRef:
     """
@@ -383,3 +425,195 @@ class DataStreamCollection(ParsableElement):
             "required": True,
         }
     )
+
+    @classmethod
+    def parse(cls, data, data_format="xml", memory_map=False, lazy=False):
+        """
+        Parse a data stream collection.
+
+        With ``lazy`` enabled only the position and id of every component
+        are recorded. A component is parsed the first time one of its other
+        fields is accessed, e.g. after :meth:`get_component`. Combined
+        with ``memory_map`` the components are read from the mapped file,
+        which stays open as long as the collection references it.
+        """
+        if not lazy:
+            return super().parse(data, data_format, memory_map)
+        if data_format != "xml":
+            raise ValueError
+
+        if isinstance(data, (bytes, memoryview, mmap.mmap)):
+            pass
+        elif memory_map:
+            data = map_file(data)
+        else:
+            data = Path(data).read_bytes()
+
+        head, spans = _scan_components(data)
+        skeleton, last = [], 0
+        for start, end, _, _ in spans:
+            skeleton.append(data[last:start])
+            last = end
+        skeleton.append(data[last:])
+
+        collection = scap_parser.from_bytes(b"".join(skeleton), cls)
+        for start, end, id, declarations in spans:
+            component = _LazyComponent.__new__(_LazyComponent)
+            component.__dict__["id"] = id
+            component.__dict__["_source"] = (head, declarations, data, start, end)
+            collection.component.append(component)
+
+        return collection
+
+    def get_component(self, ref):
+        """
+        Return the component pointed to by a component reference.
+
+        :param ref: A :class:`ComponentRef`, an ``#id`` href or a
+            component id.
+        """
+        if isinstance(ref, ComponentRef):
+            ref = ref.href
+        ref = ref[1:] if ref.startswith("#") else ref
+        return cached_index(self, [(self, "component")])[ref]
+
+
+# A start tag, the quoted attribute values may hold ">".
+_START_TAG = re.compile(rb"<[^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*>")
+_NAME_END = re.compile(rb"[\s/>]")
+# The markup found between the elements of the root, in the prolog and
+# at the top level of the root.
+_MARKUP = re.compile(rb"<!--|<!\[CDATA\[|<\?|<!DOCTYPE[^\[>]*(?:\[.*?\])?\s*>|</|<", re.S)
+# The ends of the markup whose content may look like tags.
+_SKIPPED = {
+    b"<!--": re.compile(rb"-->"),
+    b"<![CDATA[": re.compile(rb"]]>"),
+    b"<?": re.compile(rb"\?>"),
+}
+
+
+def _scan_components(data):
+    """
+    Return the document prologue and the ``(start, end, id, namespace
+    declarations)`` of every top level component, without binding their
+    content.
+
+    Only the start tags of the root and of its children are parsed. The
+    content of a child is skipped by searching for its end tag, past
+    comments, CDATA sections and processing instructions, so scanning
+    costs little more than a search through the bytes of the document.
+    The declarations are those of the root element that the component
+    start tag does not override, to be added to it when it is parsed alone.
+    """
+    root, spans = None, []
+    position = 0
+    while True:
+        match = _MARKUP.search(data, position)
+        if match is None:
+            raise ParserError("Unterminated root element" if root else "No root element")
+        token = match.group()
+        if token in _SKIPPED:
+            position = _skip(data, match)
+            continue
+        if token.startswith(b"<!"):
+            position = match.end()
+            continue
+        if token == b"</":
+            break
+
+        start = match.start()
+        tag_end = _tag_end(data, start)
+        tag = bytes(data[start:tag_end])
+        name, attributes = _start_tag(tag)
+        declared = {
+            key[6:] or None: value
+            for key, value in attributes.items()
+            if key == "xmlns" or key.startswith("xmlns:")
+        }
+        if root is None:
+            root = (start, declared)
+            if tag.endswith(b"/>"):
+                break
+            position = tag_end
+            continue
+
+        end = tag_end if tag.endswith(b"/>") else _element_end(data, name, tag_end)
+        prefix, _, local = name.rpartition(":")
+        uri = declared.get(prefix or None, root[1].get(prefix or None))
+        if uri == SDS_1_2_NAMESPACE and local == "component":
+            declarations = {
+                prefix: uri for prefix, uri in root[1].items() if prefix not in declared
+            }
+            spans.append((start, end, attributes.get("id"), declarations))
+        position = end
+
+    return bytes(data[:root[0]]), spans
+
+
+def _start_tag(tag):
+    """Return the name and attributes of a start tag, the namespace
+    declarations included."""
+    parser = expat.ParserCreate()
+    result = []
+    parser.StartElementHandler = lambda name, attributes: result.extend((name, attributes))
+    parser.Parse(tag if tag.endswith(b"/>") else tag[:-1] + b"/>", True)
+    return result
+
+
+def _skip(data, match):
+    """Return the position after a comment, CDATA section or processing
+    instruction starting at ``match``."""
+    end = _SKIPPED[match.group()].search(data, match.end())
+    if end is None:
+        raise ParserError(f"Unterminated {match.group().decode()} at {match.start()}")
+    return end.end()
+
+
+@lru_cache(maxsize=None)
+def _element_markup(name):
+    name = re.escape(name.encode())
+    return re.compile(rb"<!--|<!\[CDATA\[|<\?|</" + name + rb"\s*>|<" + name + rb"[\s/>]")
+
+
+def _element_end(data, name, position):
+    """Return the position after the end tag of the element named ``name``
+    whose content starts at ``position``, counting the nested elements of
+    the same name."""
+    pattern = _element_markup(name)
+    depth = 1
+    while True:
+        match = pattern.search(data, position)
+        if match is None:
+            raise ParserError(f"Unterminated element {name}")
+        token = match.group()
+        if token in _SKIPPED:
+            position = _skip(data, match)
+        elif token.startswith(b"</"):
+            depth -= 1
+            position = match.end()
+            if not depth:
+                return position
+        else:
+            position = _tag_end(data, match.start())
+            if data[position - 2:position] != b"/>":
+                depth += 1
+
+
+def _tag_end(data, start):
+    """Return the position after the start tag at ``start``."""
+    return _START_TAG.match(data, start).end()
+
+
+def _load_component(head, declarations, data, start, end):
+    """Parse a component alone, with the namespace declarations of the
+    root added to its start tag so prefixed values resolve as they would
+    in the whole document."""
+    name = _tag_end(data, start)
+    tag = bytes(data[start:name])
+    split = _NAME_END.search(tag, 1).start()
+    attributes = b"".join(
+        (f" xmlns={quoteattr(uri)}" if prefix is None else f" xmlns:{prefix}={quoteattr(uri)}").encode()
+        for prefix, uri in declarations.items()
+    )
+    document = b"".join((head, tag[:split], attributes, tag[split:], data[name:end]))
+    return scap_parser.from_bytes(document, Component)
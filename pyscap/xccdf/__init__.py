@@ -77,3 +77,13 @@ from .xccdf_1_2 import (
     Group,
     Benchmark
 )
+from .profiles import ProfileResolution, ProfileResolver
+from .resolution import BenchmarkResolver
+from .tailoring import TailoredBenchmark
+from .scoring import Scorer
+from .export import DictionaryColumn, RuleResultColumns, iter_test_results
+from .aggregation import ResultAggregator
+from .conversion import Converter, convert, convert_file
+from .checks import CheckDispatcher, CheckTarget
+from .text import Template, TextRenderer
+from .remediation import RemediationGenerator
@@ -0,0 +1,224 @@
+"""
+Aggregation of XCCDF test results across hosts and runs.
+"""
+import sys
+from array import array
+
+from .export import iter_test_results
+from .scoring import IGNORED_RESULTS, PASSING_RESULTS
+
+RESULTS = (
+    "pass",
+    "fail",
+    "error",
+    "unknown",
+    "notapplicable",
+    "notchecked",
+    "notselected",
+    "informational",
+    "fixed",
+)
+# Results are stored as one byte per rule, 0 standing for no result.
+_CODES = {result: code for code, result in enumerate(RESULTS, 1)}
+_PASSING = frozenset(_CODES[result] for result in PASSING_RESULTS)
+_COUNTED = frozenset(_CODES[result] for result in RESULTS if result not in IGNORED_RESULTS)
+
+
+class ResultAggregator:
+    """
+    Per rule counts, per host scores and diffs over a stream of test
+    results.
+
+    Every host is represented by its latest test result: adding a result
+    for a known host replaces the previous one and returns the changes
+    between both runs. Rule ids are interned into indexes and the results
+    of a host are kept as one byte per rule, hosts with the same results
+    sharing the same bytes, so memory does not grow with the number of
+    runs. Counts and scores are computed per distinct set of results,
+    which are usually far fewer than hosts. Rules with several results take
+    the first one that does not pass.
+    """
+
+    def __init__(self):
+        self.idrefs = []
+        self._rules = {}
+        self._hosts = {}
+        # Distinct result vectors with the number of hosts using them and
+        # their score once computed.
+        self._vectors = {}
+        self._counts = None
+
+    def __len__(self):
+        return len(self._hosts)
+
+    @property
+    def hosts(self):
+        """The aggregated hosts."""
+        return list(self._hosts)
+
+    def add(self, test_result, host=None):
+        """
+        Add a bound 1.1 or 1.2 test result, or an ARF report holding one.
+
+        :param test_result: The test result or report.
+        :param host: The host name, defaults to the first target of the
+            test result, or its id.
+        :return: The changes from the previous result of the host, see
+            :meth:`add_results`.
+        """
+        content = getattr(test_result, "content", None)
+        if content is not None:
+            test_result = content.other_element
+        if host is None:
+            host = test_result.target[0] if test_result.target else test_result.id
+        return self.add_results(
+            host,
+            (
+                (rule_result.idref, rule_result.result and rule_result.result.value)
+                for rule_result in test_result.rule_result
+            ),
+        )
+
+    def add_document(self, data):
+        """
+        Add every test result of an xml document without binding it, see
+        :func:`iter_test_results`. Use :meth:`add_results` on the rows of
+        :func:`iter_test_results` to get the changes of every host.
+
+        :param data: The xml document as bytes, a buffer or a path.
+        :return: The number of test results added.
+        """
+        added = 0
+        for id, target, rows in iter_test_results(data):
+            self.add_results(target or id, ((row[0], row[1]) for row in rows))
+            added += 1
+        return added
+
+    def add_results(self, host, results):
+        """
+        Set the results of a host.
+
+        :param host: The host name.
+        :param results: ``(idref, result)`` pairs of strings.
+        :return: The ``(idref, previous result, result)`` triples of the
+            rules whose result changed since the previous run of the host,
+            a missing result being ``None``.
+        """
+        codes = bytearray(len(self.idrefs))
+        for idref, result in results:
+            index = self._rules.get(idref)
+            if index is None:
+                index = self._intern(idref)
+                codes.append(0)
+            if codes[index] == 0 or codes[index] in _PASSING:
+                codes[index] = _CODES.get(result, 0)
+
+        host = sys.intern(host)
+        previous = self._hosts.get(host)
+        vector = self._hosts[host] = self._acquire(bytes(codes))
+        if previous is None:
+            return []
+        self._release(previous)
+        if previous is vector:
+            return []
+        return [
+            (self.idrefs[index], _result(old), _result(new))
+            for index, (old, new) in enumerate(_padded(previous, vector))
+            if old != new
+        ]
+
+    def remove(self, host):
+        """Remove the results of a host from the aggregation."""
+        self._release(self._hosts.pop(host))
+
+    def counts(self, idref):
+        """Return the number of hosts by result of a rule."""
+        if self._counts is None:
+            counts = [array("L", [0]) * len(self.idrefs) for _ in RESULTS]
+            for vector, hosts, _ in self._vectors.values():
+                for index, code in enumerate(vector):
+                    if code:
+                        counts[code - 1][index] += hosts
+            self._counts = counts
+
+        index = self._rules[idref]
+        return {
+            result: counts[index]
+            for result, counts in zip(RESULTS, self._counts)
+            if counts[index]
+        }
+
+    def rule_counts(self):
+        """Yield the ``(idref, counts)`` of every rule, see :meth:`counts`."""
+        for idref in self.idrefs:
+            yield idref, self.counts(idref)
+
+    def results(self, host):
+        """Return the result of every rule of a host by idref."""
+        return {
+            self.idrefs[index]: RESULTS[code - 1]
+            for index, code in enumerate(self._hosts[host])
+            if code
+        }
+
+    def score(self, host):
+        """
+        Return the compliance of a host, the percentage of its evaluated
+        rules that pass, as in the flat unweighted scoring model.
+        """
+        entry = self._vectors[self._hosts[host]]
+        if entry[2] is None:
+            counted = passed = 0
+            for code in entry[0]:
+                if code in _COUNTED:
+                    counted += 1
+                    if code in _PASSING:
+                        passed += 1
+            entry[2] = passed * 100 / counted if counted else 0.0
+        return entry[2]
+
+    def scores(self):
+        """Return the score of every host, see :meth:`score`."""
+        return {host: self.score(host) for host in self._hosts}
+
+    def diff(self, host, other):
+        """Return the ``(idref, result, other result)`` triples of the rules
+        whose result differs between two hosts."""
+        vector, other = self._hosts[host], self._hosts[other]
+        if vector is other:
+            return []
+        return [
+            (self.idrefs[index], _result(a), _result(b))
+            for index, (a, b) in enumerate(_padded(vector, other))
+            if a != b
+        ]
+
+    def _intern(self, idref):
+        index = self._rules[idref] = len(self.idrefs)
+        self.idrefs.append(sys.intern(idref))
+        self._counts = None
+        return index
+
+    def _acquire(self, vector):
+        entry = self._vectors.get(vector)
+        if entry is None:
+            entry = self._vectors[vector] = [vector, 0, None]
+        entry[1] += 1
+        self._counts = None
+        return entry[0]
+
+    def _release(self, vector):
+        entry = self._vectors[vector]
+        entry[1] -= 1
+        self._counts = None
+        if not entry[1]:
+            del self._vectors[vector]
+
+
+def _result(code):
+    return RESULTS[code - 1] if code else None
+
+
+def _padded(vector, other):
+    size = max(len(vector), len(other))
+    return zip(vector.ljust(size, b"\0"), other.ljust(size, b"\0"))
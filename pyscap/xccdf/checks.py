@@ -0,0 +1,256 @@
+"""
+Dispatch of XCCDF rule checks to the check systems.
+
+A :class:`CheckDispatcher` resolves the ``check-content-ref`` of every rule
+of a benchmark once, to the OVAL definition or OCIL questionnaire it names
+in the components of a data stream or in separate documents, so evaluating
+many hosts only looks up the prepared targets.
+"""
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from .items import ITEM_FIELDS
+from ..common.utils import cached_index, cached_tree_index
+
+# Check system URIs, as literals so that the OVAL and OCIL bindings are
+# only imported with the documents using them.
+OVAL_SYSTEM = "http://oval.mitre.org/XMLSchema/oval-definitions-5"
+OCIL_SYSTEM = "http://scap.nist.gov/schema/ocil/2"
+# The OCIL 2.0 namespace, also found as the system of OCIL checks.
+OCIL_2_0_SYSTEM = "http://scap.nist.gov/schema/ocil/2.0"
+# Fields of a component holding check content, by check system.
+COMPONENT_FIELDS = {
+    OVAL_SYSTEM: "oval_definitions",
+    OCIL_SYSTEM: "ocil",
+    OCIL_2_0_SYSTEM: "ocil",
+}
+
+
+@dataclass
+class CheckTarget:
+    """
+    A check of a rule resolved to the content to evaluate.
+
+    :ivar rule: The rule id.
+    :ivar check: The check element.
+    :ivar system: The check system URI.
+    :ivar href: The href of the check content reference.
+    :ivar name: The name of the content to evaluate, ``None`` for all the
+        content of the document. Multi-checks are expanded to one target
+        per definition, named after it.
+    :ivar document: The OVAL definitions or OCIL document, ``None`` when the
+        href could not be resolved.
+    :ivar content: The OVAL definition or OCIL questionnaire named by
+        :attr:`name`, ``None`` when there is no name or it was not found.
+    :ivar exports: The ``(value id, export name)`` pairs of the check.
+    """
+    rule: str
+    check: Any
+    system: Optional[str]
+    href: Optional[str]
+    name: Optional[str] = None
+    document: Any = None
+    content: Any = None
+    exports: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def resolved(self):
+        """Whether the document, and the named content if any, were found."""
+        return self.document is not None and (self.name is None or self.content is not None)
+
+
+class CheckDispatcher:
+    """
+    The check targets of every rule of a benchmark.
+
+    Check content references are resolved through the catalogs of the data
+    streams of a collection, which map the hrefs of the benchmark to
+    component references, or through a mapping of hrefs to documents for
+    standalone content. The table is built on first use and rebuilt with
+    the item index of the benchmark, see :func:`cached_tree_index`.
+
+    :param benchmark: The 1.1 or 1.2 benchmark.
+    :param collection: The data stream collection holding the benchmark and
+        its check components.
+    :param documents: OVAL definitions or OCIL documents by href, taking
+        precedence over the collection.
+    :param handlers: Check system evaluators by system URI, see
+        :meth:`register`.
+    """
+
+    def __init__(self, benchmark, collection=None, documents=None, handlers=None):
+        self.benchmark = benchmark
+        self.collection = collection
+        self.documents = dict(documents or {})
+        self.handlers = dict(handlers or {})
+        self._index = None
+
+    def register(self, system, handler):
+        """
+        Set the evaluator of a check system.
+
+        :param system: The check system URI.
+        :param handler: Called as ``handler(target, *args, **kwargs)`` by
+            :meth:`evaluate`.
+        """
+        self.handlers[system] = handler
+
+    @property
+    def table(self):
+        """The checks of every rule by rule id, each check being the list
+        of its :class:`CheckTarget`, in document order."""
+        self._prepare()
+        return self._table
+
+    def targets(self, rule, selector=None):
+        """
+        Return the targets of the checks of a rule for a selector.
+
+        Checks without a selector are used when none has the requested one.
+
+        :param rule: A rule or its id.
+        :param selector: The check selector, e.g. set by a profile.
+        :raises KeyError: If the rule is unknown.
+        """
+        return [target for targets in self._checks(rule, selector) for target in targets]
+
+    def evaluate(self, rule, *args, selector=None, **kwargs):
+        """
+        Evaluate a rule with the handler of its first check whose system
+        has one.
+
+        :return: ``(target, result)`` pairs, one per target of the check,
+            empty when no check of the rule has a handler.
+        """
+        for targets in self._checks(rule, selector):
+            handler = self.handlers.get(targets[0].system)
+            if handler is not None:
+                return [(target, handler(target, *args, **kwargs)) for target in targets]
+        return []
+
+    def _checks(self, rule, selector):
+        checks = self.table[getattr(rule, "id", rule)]
+        matched = [targets for targets in checks if (targets[0].check.selector or None) == (selector or None)]
+        if not matched and selector:
+            matched = [targets for targets in checks if not targets[0].check.selector]
+        return matched
+
+    def _prepare(self):
+        index = cached_tree_index(self.benchmark, ITEM_FIELDS, "group")
+        if index is self._index:
+            return
+        self._index = index
+        self._components = self._component_hrefs()
+        self._table = {}
+        for id, (kind, rule, _) in index.items():
+            if kind != "rule":
+                continue
+            checks = list(rule.check)
+            complex_check = getattr(rule, "complex_check", None)
+            pending = [complex_check] if complex_check is not None else []
+            # Complex checks are flattened, their operators are left to the
+            # handlers.
+            while pending:
+                complex_check = pending.pop(0)
+                checks.extend(complex_check.check)
+                pending.extend(complex_check.complex_check)
+            self._table[id] = [
+                targets for targets in (self._resolve(id, check) for check in checks) if targets
+            ]
+
+    def _component_hrefs(self):
+        """Return the components of the collection by the hrefs that the
+        checklist of the benchmark points to them with: the names of the
+        catalog of its component reference, and the ids of the references
+        and components of its data stream."""
+        hrefs = {}
+        if self.collection is None:
+            return hrefs
+        components = cached_index(self.collection, [(self.collection, "component")])
+
+        def component(ref):
+            return components.get((ref.href or "").lstrip("#")) if ref is not None else None
+
+        for data_stream in self.collection.data_stream:
+            checklists = data_stream.checklists.component_ref if data_stream.checklists else []
+            holder = next(
+                (ref for ref in checklists if getattr(component(ref), "benchmark", None) is self.benchmark),
+                None,
+            )
+            if holder is None:
+                continue
+            refs = {}
+            for name in ("dictionaries", "checklists", "checks"):
+                ref_list = getattr(data_stream, name)
+                if ref_list is not None:
+                    refs.update((ref.id, ref) for ref in ref_list.component_ref)
+            for ref in refs.values():
+                target = component(ref)
+                if target is not None:
+                    hrefs[f"#{ref.id}"] = target
+                    hrefs[f"#{target.id}"] = target
+            if holder.catalog is not None:
+                for uri in holder.catalog.uri:
+                    target = component(refs.get((uri.uri or "").lstrip("#")))
+                    if target is not None:
+                        hrefs[uri.name] = target
+            break
+        return hrefs
+
+    def _document(self, system, href):
+        document = self.documents.get(href)
+        if document is None:
+            component = self._components.get(href)
+            if component is not None:
+                document = getattr(component, COMPONENT_FIELDS.get(system, ""), None)
+        return document
+
+    def _resolve(self, rule, check):
+        exports = tuple((export.value_id, export.export_name) for export in check.check_export)
+        for ref in check.check_content_ref:
+            document = self._document(check.system, ref.href)
+            if document is None:
+                continue
+            if ref.name is None and getattr(check, "multi_check", False):
+                names = _names(check.system, document)
+            else:
+                names = [ref.name]
+            return [
+                CheckTarget(
+                    rule,
+                    check,
+                    check.system,
+                    ref.href,
+                    name,
+                    document,
+                    None if name is None else _content(check.system, document, name),
+                    exports,
+                )
+                for name in names
+            ]
+        # Unresolved references are kept to report them as errors.
+        if check.check_content_ref:
+            ref = check.check_content_ref[0]
+            return [CheckTarget(rule, check, check.system, ref.href, ref.name, exports=exports)]
+        return []
+
+
+def _names(system, document):
+    if system == OVAL_SYSTEM:
+        definitions = document.definitions
+        return [definition.id for definition in (definitions.definition if definitions else ())]
+    questionnaires = document.questionnaires
+    return [item.id for item in (questionnaires.questionnaire if questionnaires else ())]
+
+
+def _content(system, document, name):
+    try:
+        if system == OVAL_SYSTEM:
+            return document.get_definition(name)
+        if document.questionnaires is None:
+            return None
+        return cached_index(
+            document, [(document.questionnaires, "questionnaire")]
+        )[name]
+    except KeyError:
+        return None
@@ -0,0 +1,408 @@
+"""
+Conversion of benchmarks between the XCCDF 1.1 and 1.2 bindings.
+
+Fields are matched by their xml names, which are mostly shared by both
+versions, so a converted element serializes to the same document with the
+other namespace. Fields that only exist in the source version, such as the
+CPE 2.0 platform definitions of 1.1 benchmarks, are dropped. Item ids are
+rewritten to and from the ``xccdf_<namespace>_<kind>_<name>`` form required
+by 1.2, along with every reference to them.
+"""
+import dataclasses
+import re
+from enum import Enum
+from xml.etree import ElementTree
+
+from xsdata.formats.converter import converter
+from xsdata.formats.dataclass.models.generics import AnyElement, DerivedElement
+
+from . import xccdf_1_1, xccdf_1_2
+from ..common.utils import iterparse_source, scap_context, scap_element_parser, scap_serializer
+
+# The kind of the 1.2 id of every element with one, by local name.
+ID_KINDS = {
+    "Benchmark": "benchmark",
+    "Profile": "profile",
+    "Value": "value",
+    "Group": "group",
+    "Rule": "rule",
+    "TestResult": "testresult",
+    "Tailoring": "tailoring",
+}
+# Attributes holding item ids, or lists of them.
+ID_ATTRIBUTES = frozenset(("id", "idref", "extends", "value-id"))
+
+_ID_PATTERN = re.compile(
+    rf"^xccdf_[^_]+_({'|'.join(ID_KINDS.values())})_(.+)$"
+)
+# 1.1 ids are xml ids, which cannot start with a digit.
+_NCNAME = re.compile(r"^[A-Za-z_][\w.-]*$")
+_NAMESPACES = {
+    xccdf_1_1: xccdf_1_1.XCCDF_1_1_NAMESPACE,
+    xccdf_1_2: xccdf_1_2.XCCDF_1_2_NAMESPACE,
+}
+_NS_MAP = {
+    None: None,
+    "xhtml": "http://www.w3.org/1999/xhtml",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "xsi": "http://www.w3.org/2001/XMLSchema-instance",
+}
+# Field mappings by (source class, target class).
+_MAPPINGS = {}
+
+
+class Converter:
+    """
+    Convert bound elements from one XCCDF version to the other.
+
+    The ids of the items to rename are collected with :meth:`collect`, or
+    by :func:`convert` for a whole benchmark, before converting anything
+    that references them. References to unknown ids are left unchanged.
+
+    :param source: The :mod:`xccdf_1_1` or :mod:`xccdf_1_2` module of the
+        elements to convert.
+    :param namespace: The namespace of the 1.2 ids, a reverse domain name
+        without underscores such as ``org.example``. Only used from 1.1.
+    """
+
+    def __init__(self, source, namespace=None):
+        if source not in _NAMESPACES:
+            raise ValueError(f"Unknown XCCDF module {source.__name__}")
+        if source is xccdf_1_1:
+            if not namespace or "_" in namespace:
+                raise ValueError(f"Invalid 1.2 id namespace {namespace!r}")
+            self.target = xccdf_1_2
+        else:
+            self.target = xccdf_1_1
+        self.source = source
+        self.namespace = namespace
+        self.ids = {}
+        self._taken = set()
+
+    def collect(self, kind, id):
+        """
+        Register the id of an item and return its converted id.
+
+        :param kind: The local name of the element, see :data:`ID_KINDS`.
+        """
+        new = self.ids.get(id)
+        if new is None:
+            new = self.ids[id] = self._new_id(ID_KINDS[kind], id)
+            self._taken.add(new)
+        return new
+
+    def collect_tree(self, element):
+        """Register the ids of a bound element and the items it holds."""
+        kind = type(element).__name__
+        if kind in ID_KINDS and getattr(element, "id", None):
+            self.collect(kind, element.id)
+        for name in ("profile", "value", "group", "rule", "test_result", "tailoring"):
+            for child in getattr(element, name, ()) or ():
+                self.collect_tree(child)
+
+    def convert(self, element):
+        """Return the counterpart of a bound element in the target version."""
+        target = self._counterpart(type(element))
+        if target is None:
+            raise ValueError(f"No {self.target.__name__} counterpart for {type(element).__name__}")
+        return self._dataclass(element, target)
+
+    def _new_id(self, kind, id):
+        if self.target is xccdf_1_2:
+            if _ID_PATTERN.match(id):
+                return id
+            return f"xccdf_{self.namespace}_{kind}_{id}"
+
+        match = _ID_PATTERN.match(id)
+        if match is None:
+            return id
+        # Keep the full id when several namespaces share the same name.
+        short = match.group(2)
+        if short in self._taken or not _NCNAME.match(short):
+            return id
+        return short
+
+    def _counterpart(self, cls):
+        """Return the target class of a source class, ``None`` for classes
+        of other standards."""
+        if cls.__module__ != self.source.__name__:
+            return None
+        name = cls.__name__
+        for candidate in (name, name[:-4] if name.endswith("Type") else name + "Type"):
+            target = getattr(self.target, candidate, None)
+            if isinstance(target, type) and dataclasses.is_dataclass(target):
+                return target
+        # Classes named after their element, e.g. 1.1 WarningType and 1.2 Warning.
+        local_name = _meta(cls).qname.rpartition("}")[2]
+        for target in vars(self.target).values():
+            if (
+                isinstance(target, type)
+                and dataclasses.is_dataclass(target)
+                and _meta(target).qname.rpartition("}")[2] == local_name
+            ):
+                return target
+        return None
+
+    def _mapping(self, source, target):
+        mapping = _MAPPINGS.get((source, target))
+        if mapping is None:
+            sources = {}
+            for var in _meta(source).get_all_vars():
+                sources.setdefault((_kind(var), var.local_name), var)
+            mapping = []
+            for var in _meta(target).get_all_vars():
+                source_var = sources.get((_kind(var), var.local_name))
+                if source_var is not None:
+                    mapping.append((source_var.name, var))
+            mapping = _MAPPINGS[(source, target)] = mapping
+        return mapping
+
+    def _dataclass(self, element, target):
+        values = {}
+        for name, var in self._mapping(type(element), target):
+            value = getattr(element, name)
+            if var.list_element or isinstance(value, list):
+                # Lists of elements and of tokens, such as the idrefs of
+                # requires, are converted item by item.
+                items = value if isinstance(value, list) else [value]
+                value = [self._value(item, var, type(element), target) for item in items]
+                value = [item for item in value if item is not None]
+                if value:
+                    values[var.name] = value
+            else:
+                value = self._value(value, var, type(element), target)
+                if value is not None:
+                    values[var.name] = value
+        return target(**values)
+
+    def _value(self, value, var, source, target):
+        if value is None:
+            return None
+        if isinstance(value, AnyElement):
+            return self._any(value)
+        if var.is_wildcard and (
+            isinstance(value, DerivedElement) or dataclasses.is_dataclass(value)
+        ):
+            return self._wildcard(value, source, target)
+        if dataclasses.is_dataclass(value):
+            target = self._counterpart(type(value))
+            if target is None:
+                # Elements of other standards are shared by both versions.
+                return value
+            types = [t for t in var.types if dataclasses.is_dataclass(t)]
+            if target not in types and len(types) == 1:
+                target = types[0]
+            return self._dataclass(value, target)
+        if isinstance(value, Enum):
+            for cls in var.types:
+                if isinstance(cls, type) and issubclass(cls, Enum):
+                    try:
+                        return cls(value.value)
+                    except ValueError:
+                        pass
+            return None
+        if isinstance(value, str) and var.is_attribute and var.local_name in ID_ATTRIBUTES:
+            return " ".join(self.ids.get(id, id) for id in value.split())
+        return value
+
+    def _wildcard(self, value, source, target):
+        """Convert an element of mixed content, e.g. a ``sub`` in a text,
+        to the type the target class declares for it, or to a generic
+        element when it declares none."""
+        if isinstance(value, DerivedElement):
+            qname, value = self._qname(value.qname), value.value
+        else:
+            # Elements of mixed content are bound without their name.
+            qname = _meta(type(value)).qname
+            for var in _meta(source).get_all_vars():
+                if var.is_element and type(value) in var.types:
+                    qname = var.qname
+                    break
+            qname = self._qname(qname)
+        if not dataclasses.is_dataclass(value):
+            return AnyElement(qname=qname, text=str(value))
+
+        cls = None
+        local_name = qname.rpartition("}")[2]
+        for var in _meta(target).get_all_vars():
+            if var.is_element and var.local_name == local_name:
+                cls = next((t for t in var.types if dataclasses.is_dataclass(t)), None)
+                break
+        if cls is None:
+            cls = self._counterpart(type(value))
+            if cls is None:
+                # Elements of other standards are shared by both versions.
+                return value
+        converted = self._dataclass(value, cls)
+        if _meta(cls).qname == qname:
+            return converted
+        # Types shared by several elements, such as the 1.1 idrefType of
+        # sub, would be written with their type name.
+        return _any_element(qname, converted)
+
+    def _any(self, element):
+        return AnyElement(
+            qname=self._qname(element.qname),
+            text=element.text,
+            tail=element.tail,
+            children=[
+                self._any(child) if isinstance(child, AnyElement) else child
+                for child in element.children
+            ],
+            attributes=dict(element.attributes),
+        )
+
+    def _qname(self, qname):
+        namespace = _NAMESPACES[self.source]
+        if qname and qname.startswith(f"{{{namespace}}}"):
+            return f"{{{_NAMESPACES[self.target]}}}{qname[len(namespace) + 2:]}"
+        return qname
+
+
+def convert(element, namespace=None):
+    """
+    Convert a bound element, usually a benchmark, to the other XCCDF
+    version.
+
+    :param element: A 1.1 or 1.2 element.
+    :param namespace: The namespace of the 1.2 ids when converting from 1.1,
+        see :class:`Converter`.
+    :return: The converted element, sharing nothing with the original except
+        elements of other standards such as CPE platforms and signatures.
+    """
+    converter = Converter(_module(type(element)), namespace)
+    converter.collect_tree(element)
+    return converter.convert(element)
+
+
+def convert_file(source, destination, namespace=None):
+    """
+    Convert an XCCDF document to the other version, one top level element
+    at a time.
+
+    The source is read twice, first to collect the ids, then to convert
+    and write every child of the root element as soon as it is parsed, so
+    only the largest child is ever held in memory.
+
+    :param source: The xml document as bytes, a buffer or a path, buffers
+        must be seekable.
+    :param destination: The path or binary file to write to.
+    :param namespace: The namespace of the 1.2 ids when converting from 1.1,
+        see :class:`Converter`.
+    """
+    converter = root = None
+    stack = []
+    for event, element in ElementTree.iterparse(_rewind(source), ("start", "end")):
+        if event == "end":
+            stack.pop()
+            if stack:
+                stack[-1].remove(element)
+            continue
+        stack.append(element)
+        namespace_uri, _, name = element.tag[1:].partition("}")
+        if converter is None:
+            module = next((m for m, uri in _NAMESPACES.items() if uri == namespace_uri), None)
+            root = getattr(module, name, None) if module else None
+            if root is None:
+                raise ValueError(f"Not an XCCDF document element: {element.tag}")
+            converter = Converter(module, namespace)
+        if namespace_uri == _NAMESPACES[converter.source] and name in ID_KINDS:
+            id = element.get("id")
+            if id:
+                converter.collect(name, id)
+
+    def render(document):
+        bound = scap_element_parser.parse(document, root)
+        return _split(scap_serializer.render(converter.convert(bound), ns_map))
+
+    ns_map = {**_NS_MAP, None: _NAMESPACES[converter.target]}
+    output = destination if hasattr(destination, "write") else open(destination, "wb")
+    try:
+        output.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+        for event, element in ElementTree.iterparse(_rewind(source), ("start", "end")):
+            if event == "start":
+                stack.append(element)
+                if len(stack) == 1:
+                    start, _, end = render(ElementTree.Element(element.tag, element.attrib))
+                    output.write(start.encode("utf-8"))
+                continue
+
+            stack.pop()
+            if len(stack) == 1:
+                wrapper = ElementTree.Element(stack[0].tag, stack[0].attrib)
+                wrapper.append(element)
+                output.write(render(wrapper)[1].encode("utf-8"))
+                stack[0].remove(element)
+        output.write(f"{end}\n".encode("utf-8"))
+    finally:
+        if output is not destination:
+            output.close()
+
+
+def _any_element(qname, element):
+    """Return a generic element with the attributes, text and children of a
+    bound element."""
+    attributes, children, text = {}, [], None
+    for var in _meta(type(element)).get_all_vars():
+        value = getattr(element, var.name)
+        if value is None or value == []:
+            continue
+        if var.is_attribute:
+            attributes[var.qname] = converter.serialize(value)
+        elif var.is_text:
+            text = converter.serialize(value)
+        elif var.is_element:
+            for child in value if isinstance(value, list) else [value]:
+                if dataclasses.is_dataclass(child):
+                    children.append(_any_element(var.qname, child))
+                else:
+                    children.append(AnyElement(qname=var.qname, text=converter.serialize(child)))
+    return AnyElement(qname=qname, text=text, children=children, attributes=attributes)
+
+
+def _kind(var):
+    if var.is_text:
+        return "text"
+    if var.is_attribute or var.is_attributes:
+        return "attribute"
+    if var.is_wildcard:
+        return "wildcard"
+    return "element"
+
+
+def _meta(cls):
+    """Return the binding metadata of a class. Classes without a namespace
+    get the one of their XCCDF version, as when the parser first meets
+    them inside a document, the metadata being cached for both."""
+    namespace = next(
+        (uri for module, uri in _NAMESPACES.items() if cls.__module__ == module.__name__), None
+    )
+    return scap_context.build(cls, namespace)
+
+
+def _module(cls):
+    for module in _NAMESPACES:
+        if cls.__module__ == module.__name__:
+            return module
+    raise ValueError(f"Not an XCCDF element: {cls.__name__}")
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return iterparse_source(source)
+
+
+def _split(rendered):
+    """Split a rendered document into the start tag of its root, its
+    content and the end tag of its root."""
+    if rendered.startswith("<?xml"):
+        rendered = rendered[rendered.index("?>") + 2:].lstrip()
+    # Attribute values are escaped, so the first ">" closes the start tag.
+    position = rendered.index(">") + 1
+    start = rendered[:position]
+    name = re.match(r"<([^\s/>]+)", start).group(1)
+    if start.endswith("/>"):
+        return start[:-2].rstrip() + ">", "", f"</{name}>"
+    end = rendered.rindex("</")
+    return start, rendered[position:end], rendered[end:].strip()
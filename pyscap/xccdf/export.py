@@ -0,0 +1,240 @@
+"""
+Columnar export of XCCDF rule results.
+
+:class:`RuleResultColumns` stores the rule results of many test results as
+one array per column, with the repetitive string columns dictionary encoded.
+The columns convert to an Arrow table or a NumPy structured array without
+going through a Python object per row, when those packages are installed.
+"""
+from array import array
+from datetime import datetime, timezone
+from xml.etree import ElementTree
+
+from .xccdf_1_2 import XCCDF_1_2_NAMESPACE
+from .xccdf_1_1 import XCCDF_1_1_NAMESPACE
+from ..common.utils import iterparse_source
+
+# Stands for a missing time, the same value as NumPy's NaT.
+MISSING_TIME = -(2 ** 63)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAMESPACES = (XCCDF_1_2_NAMESPACE, XCCDF_1_1_NAMESPACE)
+
+
+class DictionaryColumn:
+    """
+    A dictionary encoded column of strings.
+
+    :ivar codes: The index of the value of every row in :attr:`dictionary`.
+    :ivar dictionary: The distinct values, in order of appearance.
+    """
+
+    def __init__(self):
+        self.codes = array("i")
+        self.dictionary = []
+        self._lookup = {}
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.codes.append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        return self.dictionary[self.codes[row]]
+
+
+class RuleResultColumns:
+    """
+    The rule results of many test results, stored by column.
+
+    Every row is a rule result, with the id and target of its test result.
+    The ``test_result``, ``target``, ``idref``, ``result``, ``severity``
+    and ``ident`` columns are :class:`DictionaryColumn`, ``ident`` joining
+    the identifiers of a rule result with spaces. ``weight`` holds floats,
+    NaN when missing, and ``time`` microseconds since the epoch, UTC being
+    assumed for times without a timezone and :data:`MISSING_TIME` standing
+    for a missing time.
+    """
+
+    DICTIONARY_COLUMNS = ("test_result", "target", "idref", "result", "severity", "ident")
+    COLUMNS = DICTIONARY_COLUMNS + ("weight", "time")
+
+    def __init__(self):
+        for name in self.DICTIONARY_COLUMNS:
+            setattr(self, name, DictionaryColumn())
+        self.weight = array("d")
+        self.time = array("q")
+
+    def __len__(self):
+        return len(self.idref)
+
+    def append(self, test_result, target, idref, result, severity, ident, weight, time):
+        """Append a row of plain values, ``time`` being a string or ``None``."""
+        self.test_result.append(test_result)
+        self.target.append(target)
+        self.idref.append(idref)
+        self.result.append(result)
+        self.severity.append(severity)
+        self.ident.append(ident)
+        self.weight.append(float("nan") if weight is None else float(weight))
+        self.time.append(_microseconds(time))
+
+    def add_test_result(self, test_result):
+        """Append the rule results of a bound 1.1 or 1.2 test result."""
+        target = test_result.target[0] if test_result.target else None
+        for rule_result in test_result.rule_result:
+            self.append(
+                test_result.id,
+                target,
+                rule_result.idref,
+                _enum_value(rule_result.result),
+                _enum_value(rule_result.severity) or "unknown",
+                " ".join(ident.value for ident in rule_result.ident),
+                rule_result.weight,
+                None if rule_result.time is None else str(rule_result.time),
+            )
+
+    def add_document(self, data):
+        """
+        Append the rule results of an xml document without binding it, see
+        :func:`iter_test_results`.
+
+        :param data: The xml document as bytes, a buffer or a path.
+        """
+        for test_result, target, rows in iter_test_results(data):
+            for row in rows:
+                self.append(test_result, target, *row)
+
+    @classmethod
+    def from_test_results(cls, test_results):
+        """Return the columns of bound test results."""
+        columns = cls()
+        for test_result in test_results:
+            columns.add_test_result(test_result)
+        return columns
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Return the columns of many xml documents, see
+        :meth:`add_document`."""
+        columns = cls()
+        for data in documents:
+            columns.add_document(data)
+        return columns
+
+    def to_arrow(self):
+        """Return a ``pyarrow.Table``, sharing the code and weight buffers."""
+        import pyarrow
+
+        arrays = {}
+        for name in self.DICTIONARY_COLUMNS:
+            column = getattr(self, name)
+            codes = pyarrow.Array.from_buffers(
+                pyarrow.int32(), len(column), [None, pyarrow.py_buffer(column.codes)]
+            )
+            arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                codes, pyarrow.array(column.dictionary, pyarrow.string())
+            )
+        arrays["weight"] = pyarrow.Array.from_buffers(
+            pyarrow.float64(), len(self), [None, pyarrow.py_buffer(self.weight)]
+        )
+        arrays["time"] = pyarrow.array(
+            [None if time == MISSING_TIME else time for time in self.time],
+            pyarrow.timestamp("us", "UTC"),
+        )
+        return pyarrow.table(arrays)
+
+    def to_numpy(self):
+        """
+        Return a NumPy structured array of the columns.
+
+        Dictionary encoded columns hold their codes, the values are in the
+        ``dictionary`` of the column.
+        """
+        import numpy
+
+        dtype = [(name, numpy.int32) for name in self.DICTIONARY_COLUMNS]
+        dtype += [("weight", numpy.float64), ("time", "datetime64[us]")]
+        rows = numpy.empty(len(self), dtype)
+        for name in self.DICTIONARY_COLUMNS:
+            rows[name] = numpy.frombuffer(getattr(self, name).codes, numpy.int32)
+        rows["weight"] = numpy.frombuffer(self.weight, numpy.float64)
+        rows["time"] = numpy.frombuffer(self.time, numpy.int64).view("datetime64[us]")
+        return rows
+
+
+def iter_test_results(data):
+    """
+    Yield the rule results of the test results of an xml document.
+
+    Any document holding 1.1 or 1.2 test results can be read, such as a
+    results file, a benchmark or an ARF collection, without binding it.
+    Elements are dropped once read, so only one test result is held in
+    memory at a time.
+
+    :param data: The xml document as bytes, a buffer or a path.
+    :return: A generator of ``(id, target, rows)`` tuples, one per test
+        result, ``rows`` being ``(idref, result, severity, ident, weight,
+        time)`` tuples of strings in the order of the arguments of
+        :meth:`RuleResultColumns.append`.
+    """
+    test_result = target = None
+    rows = []
+    stack = []
+    for event, element in ElementTree.iterparse(iterparse_source(data), ("start", "end")):
+        if event == "start":
+            stack.append(element)
+            if _local(element.tag) == "TestResult":
+                test_result = element.get("id")
+                target = None
+            continue
+
+        stack.pop()
+        name = _local(element.tag)
+        if name == "target" and target is None:
+            target = element.text
+        elif name == "rule-result":
+            namespace = element.tag[1:].partition("}")[0]
+            rows.append((
+                element.get("idref"),
+                element.findtext(f"{{{namespace}}}result"),
+                element.get("severity", "unknown"),
+                " ".join(
+                    ident.text or ""
+                    for ident in element.iterfind(f"{{{namespace}}}ident")
+                ),
+                element.get("weight"),
+                element.get("time"),
+            ))
+        elif name == "TestResult":
+            yield test_result, target, rows
+            rows = []
+        # The children of a rule result are read at its end.
+        if stack and _local(stack[-1].tag) != "rule-result":
+            stack[-1].remove(element)
+
+
+def _local(tag):
+    namespace, _, name = tag[1:].partition("}")
+    return name if namespace in _NAMESPACES else None
+
+
+def _enum_value(value):
+    return None if value is None else value.value
+
+
+def _microseconds(time):
+    if not time:
+        return MISSING_TIME
+    if time.endswith("Z"):
+        time = time[:-1] + "+00:00"
+    value = datetime.fromisoformat(time)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
@@ -0,0 +1,72 @@
+"""
+Lookups of the items of XCCDF benchmarks, shared by the 1.1 and 1.2
+bindings.
+"""
+from ..common.utils import cached_tree_index
+
+# Benchmark fields sharing the id space of items, groups nest the last three.
+ITEM_FIELDS = ("profile", "value", "group", "rule")
+
+
+class ItemLookup:
+    """
+    Id lookups of the profiles, values, groups and rules of a benchmark.
+
+    The classes using it name the list fields holding the items in
+    :attr:`ITEM_FIELDS` and the field of groups nesting them in
+    :attr:`NESTED_FIELD`.
+    """
+
+    ITEM_FIELDS = ITEM_FIELDS
+    NESTED_FIELD = "group"
+
+    def find_rule(self, rule_id):
+        try:
+            return self.get_rule(rule_id)
+        except KeyError:
+            return None
+
+    def _lookup(self, id, kinds):
+        kind, item, parent = cached_tree_index(self, self.ITEM_FIELDS, self.NESTED_FIELD)[id]
+        if kind not in kinds:
+            raise KeyError(id)
+        return item, parent
+
+    def get_item(self, id):
+        """
+        Return the group, rule or value with the given id.
+
+        The lookup goes through an index of the whole tree of groups, built
+        on first use and checked in constant time, see
+        :func:`cached_tree_index`. Call :meth:`invalidate` after modifying
+        the plain lists of nested groups.
+
+        :raises KeyError: If there is no such item.
+        """
+        return self._lookup(id, ("group", "rule", "value"))[0]
+
+    def get_group(self, id):
+        """Return the group with the given id, see :meth:`get_item`."""
+        return self._lookup(id, ("group",))[0]
+
+    def get_rule(self, id):
+        """Return the rule with the given id, see :meth:`get_item`."""
+        return self._lookup(id, ("rule",))[0]
+
+    def get_value(self, id):
+        """Return the value with the given id, see :meth:`get_item`."""
+        return self._lookup(id, ("value",))[0]
+
+    def get_profile(self, id):
+        """Return the profile with the given id, see :meth:`get_item`."""
+        return self._lookup(id, ("profile",))[0]
+
+    def get_parent(self, item):
+        """
+        Return the group or benchmark directly containing an item.
+
+        :param item: An item or the id of one.
+        :raises KeyError: If the item is not part of this benchmark.
+        """
+        id = item if isinstance(item, str) else item.id
+        return self._lookup(id, self.ITEM_FIELDS)[1]
@@ -0,0 +1,284 @@
+"""
+Application of XCCDF profiles to a benchmark.
+
+A profile selects groups and rules, binds values and refines rules, on top
+of the profile it extends. :class:`ProfileResolver` computes the outcome of
+these statements for the profiles of a benchmark and of its tailorings.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .items import ITEM_FIELDS
+from ..common.utils import cached_index, cached_tree_index
+
+REFINED_ATTRIBUTES = ("weight", "severity", "role", "selector")
+
+
+@dataclass
+class ProfileResolution:
+    """
+    The effective selection and values of a benchmark under a profile.
+
+    :ivar profile: The profile id, ``None`` for the benchmark defaults.
+    :ivar selected: The selection of every group and rule by id.
+    :ivar rules: The ids of the rules to check, i.e. the selected rules of
+        which all groups are selected, in benchmark order.
+    :ivar values: The value of every value by id, a list of strings for
+        complex values.
+    :ivar operators: The operators of the values refined by the profile.
+    :ivar refinements: The weight, severity, role and check selector set by
+        the profile, by rule or group id.
+    """
+    profile: Optional[str]
+    selected: Dict[str, bool] = field(default_factory=dict)
+    rules: List[str] = field(default_factory=list)
+    values: Dict[str, Any] = field(default_factory=dict)
+    operators: Dict[str, Any] = field(default_factory=dict)
+    refinements: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class _Statements:
+    """The statements of a profile merged with those of the profiles it
+    extends, later ones winning."""
+    selected: Dict[str, bool] = field(default_factory=dict)
+    values: Dict[str, Any] = field(default_factory=dict)
+    selectors: Dict[str, str] = field(default_factory=dict)
+    operators: Dict[str, Any] = field(default_factory=dict)
+    refinements: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def copy(self):
+        # Refinements are replaced rather than updated, so the inner dicts
+        # can be shared.
+        return _Statements(
+            dict(self.selected),
+            dict(self.values),
+            dict(self.selectors),
+            dict(self.operators),
+            dict(self.refinements),
+        )
+
+
+class ProfileResolver:
+    """
+    Resolve the profiles of a 1.1 or 1.2 benchmark.
+
+    The benchmark is walked once, then every profile is applied to the
+    collected defaults. The statements and results are memoized per profile
+    id, and on the tailoring for tailored profiles, until the item index of
+    the benchmark or the profiles of the tailoring are rebuilt, see
+    :func:`cached_tree_index`. Changing the
+    attributes of an item or a profile in place is not detected.
+
+    :param benchmark: The benchmark to resolve profiles of.
+    """
+
+    def __init__(self, benchmark):
+        self.benchmark = benchmark
+        self._index = None
+
+    def resolve(self, profile=None, tailoring=None):
+        """
+        Return the :class:`ProfileResolution` of a profile.
+
+        :param profile: A profile or its id, ``None`` for the defaults of
+            the benchmark.
+        :param tailoring: A tailoring whose profiles take precedence over
+            those of the benchmark.
+        :raises KeyError: If the profile, or one it extends, is unknown.
+        :raises ValueError: If the profile extends itself.
+        """
+        self._prepare()
+        profile = getattr(profile, "id", profile)
+        _, _, results = self._caches(tailoring)
+        result = results.get(profile)
+        if result is None:
+            if profile is None:
+                statements = _Statements()
+            else:
+                statements = self._statements(profile, tailoring, ())
+            result = results[profile] = self._apply(profile, statements)
+        return result
+
+    def resolve_all(self, tailoring=None):
+        """Return the :class:`ProfileResolution` of every concrete profile
+        by id, those of the tailoring included."""
+        profiles = list(self.benchmark.profile)
+        if tailoring is not None:
+            profiles.extend(tailoring.profile)
+        return {
+            profile.id: self.resolve(profile.id, tailoring)
+            for profile in profiles
+            if not profile.abstract
+        }
+
+    def _prepare(self):
+        index = cached_tree_index(self.benchmark, ITEM_FIELDS, "group")
+        if index is self._index:
+            return
+
+        self._index = index
+        # Groups and rules as (id, parent id, is rule), parents first.
+        self._order = []
+        self._selected = {}
+        self._values = {}
+        self._clusters = {}
+        self._walk(self.benchmark, None)
+        self._default_values = {
+            id: _value(value, "") for id, value in self._values.items()
+        }
+
+        self._statement_cache = {}
+        self._result_cache = {}
+
+    def _walk(self, container, parent):
+        for value in container.value:
+            if not value.abstract:
+                self._values[value.id] = value
+                self._cluster(value)
+        for group in container.group:
+            if not group.abstract:
+                self._order.append((group.id, parent, False))
+                self._selected[group.id] = group.selected
+                self._cluster(group)
+                self._walk(group, group.id)
+        for rule in container.rule:
+            if not rule.abstract:
+                self._order.append((rule.id, parent, True))
+                self._selected[rule.id] = rule.selected
+                self._cluster(rule)
+
+    def _cluster(self, item):
+        if item.cluster_id:
+            self._clusters.setdefault(item.cluster_id, []).append(item.id)
+
+    def _caches(self, tailoring):
+        if tailoring is None:
+            return None, self._statement_cache, self._result_cache
+
+        profiles = cached_index(tailoring, [(tailoring, "profile")])
+        # The caches are kept on the tailoring, to be freed with it.
+        cache = tailoring.__dict__.setdefault("_indexes", {})
+        cached = cache.get(self)
+        if cached is None or cached[0] is not self._index or cached[1] is not profiles:
+            cached = cache[self] = (self._index, profiles, {}, {})
+        return cached[1:]
+
+    def _statements(self, id, tailoring, chain):
+        profiles, statements_cache, _ = self._caches(tailoring)
+        if profiles is None or id not in profiles:
+            # Benchmark profiles only extend benchmark profiles.
+            tailoring = None
+            profile = self.benchmark.get_profile(id)
+            statements_cache = self._statement_cache
+        else:
+            profile = profiles[id]
+        if any(profile is other for other in chain):
+            raise ValueError(f"Profile {id} extends itself")
+
+        statements = statements_cache.get(id)
+        if statements is None:
+            if profile.extends:
+                # A tailored profile may extend the benchmark profile it
+                # replaces.
+                statements = self._statements(
+                    profile.extends,
+                    None if profile.extends == id else tailoring,
+                    chain + (profile,),
+                ).copy()
+            else:
+                statements = _Statements()
+            self._merge(statements, profile)
+            statements_cache[id] = statements
+        return statements
+
+    def _targets(self, idref, pool):
+        ids = [idref] if idref in self._index else self._clusters.get(idref, ())
+        return [id for id in ids if id in pool]
+
+    def _merge(self, statements, profile):
+        for select in profile.select:
+            if select.selected is not None:
+                for id in self._targets(select.idref, self._selected):
+                    statements.selected[id] = select.selected
+
+        for set_value in profile.set_value:
+            for id in self._targets(set_value.idref, self._values):
+                statements.values[id] = set_value.value
+        for set_value in getattr(profile, "set_complex_value", ()):
+            for id in self._targets(set_value.idref, self._values):
+                statements.values[id] = list(set_value.item)
+
+        for refine in profile.refine_value:
+            for id in self._targets(refine.idref, self._values):
+                if refine.selector is not None:
+                    statements.selectors[id] = refine.selector
+                if refine.operator is not None:
+                    statements.operators[id] = refine.operator
+
+        for refine in profile.refine_rule:
+            changes = {
+                name: getattr(refine, name)
+                for name in REFINED_ATTRIBUTES
+                if getattr(refine, name) is not None
+            }
+            for id in self._targets(refine.idref, self._selected):
+                statements.refinements[id] = {
+                    **statements.refinements.get(id, {}),
+                    **changes,
+                }
+
+    def _apply(self, profile, statements):
+        selected = {**self._selected, **statements.selected}
+        effective = {None: True}
+        rules = []
+        for id, parent, is_rule in self._order:
+            on = selected[id] and effective[parent]
+            if not is_rule:
+                effective[id] = on
+            elif on:
+                rules.append(id)
+
+        values = dict(self._default_values)
+        for id, selector in statements.selectors.items():
+            values[id] = _value(self._values[id], selector)
+        values.update(statements.values)
+
+        return ProfileResolution(
+            profile,
+            selected,
+            rules,
+            values,
+            dict(statements.operators),
+            dict(statements.refinements),
+        )
+
+
+def profile_resolver(benchmark):
+    """Return the :class:`ProfileResolver` of a benchmark, created on first
+    use and shared by all callers."""
+    cache = benchmark.__dict__.setdefault("_indexes", {})
+    resolver = cache.get(ProfileResolver)
+    if resolver is None:
+        resolver = cache[ProfileResolver] = ProfileResolver(benchmark)
+    return resolver
+
+
+def _value(value, selector):
+    """Return the value of a value for a selector, falling back to the one
+    without a selector, then to the first one."""
+    choices = [*value.value, *getattr(value, "complex_value", ())]
+    default = None
+    for choice in choices:
+        if choice.selector == selector:
+            break
+        if default is None and not choice.selector:
+            default = choice
+    else:
+        choice = default or (choices[0] if choices else None)
+
+    if choice is None:
+        return None
+    if hasattr(choice, "item"):
+        return list(choice.item)
+    return choice.value
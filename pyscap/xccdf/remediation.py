@@ -0,0 +1,125 @@
+"""
+Generation of remediation scripts from the fixes of XCCDF rules.
+"""
+from .profiles import profile_resolver
+from .text import TextRenderer
+
+SHELL_SYSTEM = "urn:xccdf:fix:script:sh"
+ANSIBLE_SYSTEM = "urn:xccdf:fix:script:ansible"
+# Fixes are ordered by strategy, software first and catch-alls last.
+STRATEGY_ORDER = (
+    "update",
+    "patch",
+    "configure",
+    "enable",
+    "disable",
+    "restrict",
+    "policy",
+    "combination",
+    "unknown",
+)
+COMPLEXITY_ORDER = ("low", "medium", "unknown", "high")
+FAILING_RESULTS = frozenset(("fail",))
+
+
+class RemediationGenerator:
+    """
+    Build per system remediation scripts for the failed rules of test
+    results.
+
+    The fixes of the rules selected by a profile are rendered once with the
+    values of the profile, only fixes with ``instance`` elements being
+    filled in again with the instances of every rule result. Fixes are
+    ordered so that those not requiring a reboot come first, then by
+    :data:`STRATEGY_ORDER`, complexity and benchmark order. A rule takes
+    the first of its fixes for every system.
+
+    :param benchmark: The 1.1 or 1.2 benchmark of the results.
+    :param profile: The profile, or its id, the results were computed with.
+    :param tailoring: The tailoring holding the profile, if any.
+    :param systems: The fix systems to generate scripts for, defaults to
+        all of them.
+    """
+
+    def __init__(self, benchmark, profile=None, tailoring=None, systems=None):
+        resolution = profile_resolver(benchmark).resolve(profile, tailoring)
+        renderer = TextRenderer(benchmark)
+        values = resolution.values
+        # The fixes of every rule as (rank, system, text or template) tuples.
+        self._fixes = {}
+        candidates = []
+        for position, id in enumerate(resolution.rules):
+            seen = set()
+            for fix in benchmark.get_rule(id).fix:
+                if fix.system in seen or (systems is not None and fix.system not in systems):
+                    continue
+                seen.add(fix.system)
+                template = renderer.compile(fix)
+                static = not any(kind == "instance" for kind, _ in template.slots)
+                key = (
+                    fix.reboot,
+                    _rank(STRATEGY_ORDER, fix.strategy),
+                    _rank(COMPLEXITY_ORDER, fix.complexity),
+                    position,
+                )
+                content = template.fill(values) if static else (template, values)
+                candidates.append((key, id, fix.system, content))
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        for rank, (key, id, system, content) in enumerate(candidates):
+            self._fixes.setdefault(id, []).append((rank, system, content))
+
+    def generate(self, rule_results):
+        """
+        Return the remediation scripts of failed rule results.
+
+        :param rule_results: A test result, or its rule results.
+        :return: The script of every fix system by system URI.
+        """
+        rule_results = getattr(rule_results, "rule_result", rule_results)
+        selected = []
+        for rule_result in rule_results:
+            result = rule_result.result
+            if result is None or result.value not in FAILING_RESULTS:
+                continue
+            for rank, system, content in self._fixes.get(rule_result.idref, ()):
+                if not isinstance(content, str):
+                    template, values = content
+                    instances = {
+                        instance.context: instance.value for instance in rule_result.instance
+                    }
+                    content = template.fill(values, instances)
+                selected.append((rank, system, rule_result.idref, content))
+
+        selected.sort(key=lambda item: item[0])
+        parts = {}
+        for _, system, idref, content in selected:
+            parts.setdefault(system, []).append(_format(system, idref, content))
+        return {system: _header(system) + "".join(fixes) for system, fixes in parts.items()}
+
+    def generate_many(self, test_results):
+        """Yield the scripts of many test results, see :meth:`generate`."""
+        for test_result in test_results:
+            yield self.generate(test_result)
+
+
+def _rank(order, value):
+    value = getattr(value, "value", value)
+    return order.index(value) if value in order else len(order)
+
+
+def _header(system):
+    if system == ANSIBLE_SYSTEM:
+        return "---\n- hosts: all\n  tasks:\n"
+    if system == SHELL_SYSTEM:
+        return "#!/bin/bash\n"
+    return ""
+
+
+def _format(system, idref, content):
+    content = content.strip("\n")
+    if system == ANSIBLE_SYSTEM:
+        # Fixes are lists of tasks, nested under the tasks of the play.
+        lines = [f"# {idref}", *content.splitlines()]
+        return "".join(f"    {line}\n" if line else "\n" for line in lines)
+    return f"# {idref}\n{content}\n\n"
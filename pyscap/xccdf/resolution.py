@@ -0,0 +1,221 @@
+"""
+Resolution of XCCDF benchmarks.
+
+Resolving a benchmark applies the ``extends`` inheritance of its groups,
+rules, values and profiles, then drops the abstract ones, as described in
+the loading process of the XCCDF specification.
+"""
+import copy
+from dataclasses import MISSING, fields
+from functools import lru_cache
+
+from .items import ITEM_FIELDS
+from ..common.utils import TrackedList, cached_tree_index
+
+CHILD_FIELDS = ("value", "group", "rule")
+NOT_INHERITED = frozenset(("id", "id_attribute", "abstract", "extends", "signature"))
+# List fields where the elements of an item replace those of the extended
+# item with the same selector.
+SELECTOR_FIELDS = frozenset((
+    "value",
+    "complex_value",
+    "default",
+    "complex_default",
+    "match",
+    "lower_bound",
+    "upper_bound",
+    "choices",
+    "check",
+))
+
+_LIST = object()
+
+
+class BenchmarkResolver:
+    """
+    Resolve a 1.1 or 1.2 benchmark into a new, resolved, benchmark.
+
+    The source benchmark is left untouched, the resolved one shares with it
+    the values that are not changed by inheritance. Resolved items are
+    kept between calls to :meth:`resolve`, after editing items in place
+    pass them to :meth:`update` to re-resolve only them and the items
+    extending them. Adding or removing items, or changing their
+    ``extends`` or ``abstract`` attributes, resolves the whole benchmark
+    again, below the root this is noticed after
+    :meth:`ParsableElement.invalidate` only.
+
+    The children of an extended group are not copied into the extending
+    group, as that would duplicate their ids.
+
+    :param benchmark: The benchmark to resolve.
+    """
+
+    def __init__(self, benchmark):
+        self.source = benchmark
+        self._index = None
+        self._dirty = set()
+
+    def update(self, *items):
+        """Mark items, or their ids, as modified since the last resolution."""
+        for item in items:
+            self._dirty.add(getattr(item, "id", item))
+
+    def resolve(self):
+        """
+        Return the resolved benchmark.
+
+        :raises KeyError: If an item extends an unknown item.
+        :raises ValueError: If an item extends itself.
+        """
+        index = cached_tree_index(self.source, ITEM_FIELDS, "group")
+        if index is not self._index or not self._refresh():
+            self._rebuild(index)
+        self._dirty.clear()
+
+        for field in fields(self.source):
+            if field.name not in ITEM_FIELDS and field.name != "resolved":
+                setattr(self._root, field.name, getattr(self.source, field.name))
+        return self._root
+
+    def _rebuild(self, index):
+        self._index = index
+        # The resolution of every item, abstract ones included as they can
+        # be extended, with the items extending them, their state and the
+        # resolved list holding them.
+        self._resolved = {}
+        self._dependents = {}
+        self._states = {}
+        self._lists = {}
+        for id in index:
+            self._item(id, ())
+
+        self._root = _copy(self.source)
+        self._root.resolved = True
+        self._root.profile = self._children(self.source.profile)
+        self._fill(self._root, self.source)
+
+    def _children(self, items):
+        # Tracked from the start, so that indexes of the resolved benchmark
+        # keep these lists and notice the items replaced in them.
+        resolved = TrackedList()
+        for item in items:
+            if not item.abstract:
+                resolved.append(self._resolved[item.id])
+                self._lists[item.id] = resolved
+        return resolved
+
+    def _fill(self, target, source):
+        for name in CHILD_FIELDS:
+            setattr(target, name, self._children(getattr(source, name)))
+        for group in source.group:
+            if not group.abstract:
+                self._fill(self._resolved[group.id], group)
+
+    def _item(self, id, chain):
+        resolved = self._resolved.get(id)
+        if resolved is not None:
+            return resolved
+        if id in chain:
+            raise ValueError(f"Item {id} extends itself")
+
+        kind, item, _ = self._index[id]
+        base = None
+        if item.extends:
+            base = self._item(item.extends, chain + (id,))
+            self._dependents.setdefault(item.extends, set()).add(id)
+
+        resolved = self._resolved[id] = _inherit(item, base, kind)
+        self._states[id] = (item.extends, item.abstract)
+        return resolved
+
+    def _refresh(self):
+        """Re-resolve the modified items, return ``False`` when the whole
+        benchmark must be resolved again instead."""
+        ids = set()
+        pending = list(self._dirty)
+        while pending:
+            id = pending.pop()
+            if id not in ids:
+                ids.add(id)
+                pending.extend(self._dependents.get(id, ()))
+
+        for id in ids:
+            entry = self._index.get(id)
+            if entry is None or (entry[1].extends, entry[1].abstract) != self._states[id]:
+                return False
+
+        previous = {id: self._resolved.pop(id) for id in ids}
+        for id in ids:
+            self._item(id, ())
+
+        for id, old in previous.items():
+            new = self._resolved[id]
+            if self._index[id][0] == "group":
+                for name in CHILD_FIELDS:
+                    setattr(new, name, getattr(old, name))
+            resolved = self._lists.get(id)
+            if resolved is not None:
+                position = next(i for i, item in enumerate(resolved) if item is old)
+                resolved[position] = new
+        return True
+
+
+def _copy(element):
+    resolved = copy.copy(element)
+    # The index cache belongs to the source element.
+    resolved.__dict__.pop("_indexes", None)
+    return resolved
+
+
+@lru_cache(maxsize=None)
+def _defaults(clazz):
+    return {
+        field.name: _LIST if field.default_factory is list else field.default
+        for field in fields(clazz)
+        if field.default is not MISSING or field.default_factory is not MISSING
+    }
+
+
+def _inherit(item, base, kind):
+    """Return a copy of ``item`` with the properties inherited from the
+    resolved ``base``. A property left to its default value is considered
+    as not set."""
+    resolved = _copy(item)
+    resolved.extends = None
+    if base is None:
+        return resolved
+
+    for name, default in _defaults(type(item)).items():
+        if name in NOT_INHERITED or (kind == "group" and name in CHILD_FIELDS):
+            continue
+        if not hasattr(base, name):
+            continue
+
+        own = getattr(item, name)
+        inherited = getattr(base, name)
+        if default is _LIST:
+            setattr(resolved, name, _merge(name, inherited, own))
+        elif own == default:
+            setattr(resolved, name, inherited)
+    return resolved
+
+
+def _merge(name, inherited, own):
+    if not own or not inherited:
+        return list(own or inherited)
+
+    if name in SELECTOR_FIELDS:
+        selectors = {element.selector for element in own}
+        inherited = [e for e in inherited if e.selector not in selectors]
+    else:
+        # Text elements with override set replace those of their language.
+        languages = {
+            getattr(element, "lang", None)
+            for element in own
+            if getattr(element, "override", False)
+        }
+        if languages:
+            inherited = [
+                e for e in inherited if getattr(e, "lang", None) not in languages
+            ]
+    return [*inherited, *own]
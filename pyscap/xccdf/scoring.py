@@ -0,0 +1,241 @@
+"""
+Scoring of XCCDF test results.
+
+Implements the default, flat, flat unweighted and absolute scoring models of
+the XCCDF specification. A :class:`Scorer` compiles the selected rules of a
+benchmark profile, their weights and the group hierarchy into arrays once,
+then scores any number of test results against them. When NumPy is
+installed, :meth:`Scorer.score_many` scores a batch of test results with
+array operations instead of looping over every result.
+"""
+import sys
+from decimal import Decimal
+
+from .profiles import profile_resolver
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_MODEL = "urn:xccdf:scoring:default"
+FLAT_MODEL = "urn:xccdf:scoring:flat"
+FLAT_UNWEIGHTED_MODEL = "urn:xccdf:scoring:flat-unweighted"
+ABSOLUTE_MODEL = "urn:xccdf:scoring:absolute"
+MODELS = (DEFAULT_MODEL, FLAT_MODEL, FLAT_UNWEIGHTED_MODEL, ABSOLUTE_MODEL)
+
+PASSING_RESULTS = frozenset(("pass", "fixed"))
+# Results of rules that were not evaluated, which do not count at all.
+IGNORED_RESULTS = frozenset(("notselected", "notapplicable", "informational", "notchecked"))
+
+IGNORED, PASSED, FAILED = 0, 1, 2
+
+
+class Scorer:
+    """
+    Score test results of a benchmark profile.
+
+    Only the rules selected by the profile count, weighted by their weight
+    or the one set by the profile. A rule counts when one of its results was
+    evaluated, and passes when none of those failed.
+
+    :param benchmark: The 1.1 or 1.2 benchmark the results are for.
+    :param profile: The profile, or its id, the results were computed with.
+    :param tailoring: The tailoring holding the profile, if any.
+    """
+
+    def __init__(self, benchmark, profile=None, tailoring=None):
+        module = sys.modules[type(benchmark).__module__]
+        self._score_class = getattr(module, "Score", None) or module.ScoreType
+        self.models = [model.system for model in benchmark.model] or [DEFAULT_MODEL]
+
+        resolution = profile_resolver(benchmark).resolve(profile, tailoring)
+        self.rules = list(resolution.rules)
+        self._positions = {id: column for column, id in enumerate(self.rules)}
+        self._outcomes = {}
+
+        # The default model works on the tree of selected groups and rules,
+        # with rules first then groups in post order so that the children of
+        # a group always come before it. Every group is stored as the list
+        # of the nodes of its children.
+        weights = [None] * len(self.rules)
+        groups = []
+
+        def weight(item):
+            refined = resolution.refinements.get(item.id, {}).get("weight")
+            return float(item.weight if refined is None else refined)
+
+        def walk(container):
+            children = []
+            for rule in container.rule:
+                column = self._positions.get(rule.id)
+                if column is not None:
+                    weights[column] = weight(rule)
+                    children.append(column)
+            for group in container.group:
+                if not group.abstract and resolution.selected.get(group.id):
+                    node = walk(group)
+                    weights.append(weight(group))
+                    children.append(node)
+            groups.append(children)
+            return len(self.rules) + len(groups) - 1
+
+        walk(benchmark)
+        # Nodes of the groups are numbered by post order, the last one being
+        # the benchmark itself with no weight of its own.
+        weights.append(1.0)
+        self._groups = groups
+        self._weights = weights
+
+    def score(self, test_result, models=None):
+        """
+        Return the scores of a test result.
+
+        :param test_result: A test result of the profile.
+        :param models: The scoring model URIs, defaults to the models of the
+            benchmark, or the default model if it has none.
+        :return: A list of scores, one per model.
+        """
+        return self.score_many([test_result], models)[0]
+
+    def score_many(self, test_results, models=None):
+        """Return the scores of many test results, see :meth:`score`."""
+        outcomes = [self._outcome(test_result) for test_result in test_results]
+        if not outcomes:
+            return []
+        counted = [outcome[0] for outcome in outcomes]
+        passed = [outcome[1] for outcome in outcomes]
+
+        if numpy is None:
+            def tree():
+                return self._tree(counted, passed)
+
+            def flat(weighted):
+                weights = self._weights if weighted else [1.0] * len(self.rules)
+                return [_flat(c, p, weights) for c, p in zip(counted, passed)]
+        else:
+            counted = numpy.array(counted, dtype=bool)
+            passed = numpy.array(passed, dtype=bool)
+            rule_weights = numpy.array(self._weights[:len(self.rules)], dtype=float)
+
+            def tree():
+                return self._tree_many(counted, passed)
+
+            def flat(weighted):
+                weights = rule_weights if weighted else numpy.ones_like(rule_weights)
+                return zip(
+                    ((counted & passed) @ weights).tolist(),
+                    (counted @ weights).tolist(),
+                )
+
+        columns = self._columns(models or self.models, tree, flat)
+        return [list(row) for row in zip(*columns)]
+
+    def _outcome(self, test_result):
+        counted = [False] * len(self.rules)
+        failed = [False] * len(self.rules)
+        positions, outcomes = self._positions, self._outcomes
+        for rule_result in test_result.rule_result:
+            column = positions.get(rule_result.idref)
+            if column is None:
+                continue
+            # Hashing the enum is cheaper than reading its value.
+            outcome = outcomes.get(rule_result.result)
+            if outcome is None:
+                outcome = outcomes[rule_result.result] = _classify(rule_result.result)
+            if outcome:
+                counted[column] = True
+                if outcome is FAILED:
+                    failed[column] = True
+        passed = [c and not f for c, f in zip(counted, failed)]
+        return counted, passed
+
+    def _tree(self, counted, passed):
+        """Return the default model score of every result."""
+        scores = []
+        for counts, passes in zip(counted, passed):
+            score = [100.0 if p else 0.0 for p in passes]
+            count = [1 if c else 0 for c in counts]
+            for children in self._groups:
+                total = accumulator = 0.0
+                number = 0
+                for node in children:
+                    if count[node]:
+                        total += score[node] * self._weights[node]
+                        accumulator += self._weights[node]
+                        number += count[node]
+                score.append(total / accumulator if accumulator else 0.0)
+                count.append(number)
+            scores.append(score[-1])
+        return scores
+
+    def _tree_many(self, counted, passed):
+        weights = numpy.array(self._weights, dtype=float)
+        nodes = len(self._weights)
+        score = numpy.zeros((nodes, len(counted)))
+        count = numpy.zeros((nodes, len(counted)))
+        score[:len(self.rules)] = passed.T * 100.0
+        count[:len(self.rules)] = counted.T
+        for node, children in enumerate(self._groups, len(self.rules)):
+            if not children:
+                continue
+            weighted = (count[children] > 0) * weights[children, None]
+            accumulator = weighted.sum(axis=0)
+            total = (score[children] * weighted).sum(axis=0)
+            numpy.divide(total, accumulator, out=score[node], where=accumulator > 0)
+            count[node] = count[children].sum(axis=0)
+        return score[-1].tolist()
+
+    def _columns(self, models, tree, flat):
+        """Return, for every model, the list of the scores of every result.
+
+        :param tree: Returns the default model scores.
+        :param flat: Returns the flat model score and maximum pairs, with or
+            without weights.
+        """
+        columns = []
+        for model in models:
+            if model == DEFAULT_MODEL:
+                column = [self._make(model, value, 100) for value in tree()]
+            elif model in (FLAT_MODEL, FLAT_UNWEIGHTED_MODEL):
+                column = [
+                    self._make(model, value, maximum)
+                    for value, maximum in flat(model == FLAT_MODEL)
+                ]
+            elif model == ABSOLUTE_MODEL:
+                column = [
+                    self._make(model, int(maximum > 0 and value == maximum), 1)
+                    for value, maximum in flat(True)
+                ]
+            else:
+                raise ValueError(f"Unknown scoring model {model}")
+            columns.append(column)
+        return columns
+
+    def _make(self, model, value, maximum):
+        return self._score_class(
+            value=_decimal(value),
+            system=model,
+            maximum=_decimal(maximum),
+        )
+
+
+def _classify(result):
+    if result is None or result.value in IGNORED_RESULTS:
+        return IGNORED
+    return PASSED if result.value in PASSING_RESULTS else FAILED
+
+
+def _flat(counted, passed, weights):
+    value = maximum = 0.0
+    for c, p, weight in zip(counted, passed, weights):
+        if c:
+            maximum += weight
+            if p:
+                value += weight
+    return value, maximum
+
+
+def _decimal(value):
+    value = round(float(value), 6)
+    return Decimal(int(value)) if value.is_integer() else Decimal(repr(value))
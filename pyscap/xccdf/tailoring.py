@@ -0,0 +1,80 @@
+"""
+Tailorings applied to a benchmark without copying it.
+"""
+from .items import ITEM_FIELDS
+from .profiles import profile_resolver
+from ..common.utils import cached_index, cached_tree_index
+
+
+class TailoredBenchmark:
+    """
+    A benchmark seen through a tailoring.
+
+    Attributes and methods are those of the benchmark, except that the
+    profiles of the tailoring are added to those of the benchmark,
+    replacing the ones with the same id. Nothing of the benchmark is
+    copied, only the merged list of profiles is allocated, so any number of
+    views can share a single benchmark. Changes to the benchmark or the
+    tailoring are visible through the view.
+
+    :param benchmark: The tailored benchmark.
+    :param tailoring: The tailoring to apply.
+    """
+
+    def __init__(self, benchmark, tailoring):
+        self.benchmark = benchmark
+        self.tailoring = tailoring
+        self._profiles = None
+
+    def __getattr__(self, name):
+        # Special lookups, e.g. by copy and pickle, happen before __init__.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.benchmark, name)
+
+    def __dir__(self):
+        return sorted({*super().__dir__(), *dir(self.benchmark)})
+
+    @property
+    def profile(self):
+        """The profiles of the benchmark and of the tailoring."""
+        tailored = cached_index(self.tailoring, [(self.tailoring, "profile")])
+        index = cached_tree_index(self.benchmark, ITEM_FIELDS, "group")
+        if (
+            self._profiles is None
+            or self._profiles[0] is not tailored
+            or self._profiles[1] is not index
+        ):
+            replaced = [tailored.get(profile.id, profile) for profile in self.benchmark.profile]
+            ids = {profile.id for profile in self.benchmark.profile}
+            replaced.extend(
+                profile for profile in self.tailoring.profile if profile.id not in ids
+            )
+            self._profiles = (tailored, index, replaced)
+        return self._profiles[2]
+
+    def get_profile(self, id):
+        """
+        Return the profile with the given id, looking into the tailoring
+        first.
+
+        :raises KeyError: If there is no such profile.
+        """
+        tailored = cached_index(self.tailoring, [(self.tailoring, "profile")])
+        if id in tailored:
+            return tailored[id]
+        return self.benchmark.get_profile(id)
+
+    def resolve(self, profile=None):
+        """Return the :class:`ProfileResolution` of a profile of the view,
+        see :meth:`ProfileResolver.resolve`."""
+        return profile_resolver(self.benchmark).resolve(profile, self.tailoring)
+
+    def resolve_all(self):
+        """Return the :class:`ProfileResolution` of every concrete profile
+        of the view by id."""
+        return {
+            profile.id: self.resolve(profile.id)
+            for profile in self.profile
+            if not profile.abstract
+        }
@@ -0,0 +1,200 @@
+"""
+Rendering of XCCDF texts with substitutions.
+
+Titles, descriptions, fix texts and fixes mix text with ``sub`` elements,
+which stand for the text of a plain-text, the title of a value or its
+value under the applied profile, and with ``instance`` elements in fixes.
+:class:`TextRenderer` compiles every text into a :class:`Template` once,
+resolving everything that does not depend on the profile, so rendering
+many reports only fills in the values.
+"""
+from xml.sax.saxutils import escape, quoteattr
+
+from xsdata.formats.dataclass.models.generics import AnyElement
+
+from .items import ITEM_FIELDS
+from .profiles import ProfileResolution, profile_resolver
+from ..common.utils import cached_index, cached_tree_index
+
+VALUE, INSTANCE = "value", "instance"
+
+
+class Template:
+    """
+    A compiled text.
+
+    :ivar literals: The text around the slots, one more than the slots.
+    :ivar slots: ``(kind, key)`` pairs, :data:`VALUE` with a value id or
+        :data:`INSTANCE` with an instance context.
+    """
+
+    __slots__ = ("literals", "slots")
+
+    def __init__(self, literals, slots):
+        self.literals = literals
+        self.slots = slots
+
+    def fill(self, values, instances=None, markup=False):
+        """
+        Return the text with its slots filled in.
+
+        :param values: The values by id, complex values being joined with
+            spaces. Missing values are left empty.
+        :param instances: The instance names by context, missing ones are
+            replaced with their context.
+        :param markup: Whether to escape the values for xml.
+        """
+        if not self.slots:
+            return self.literals[0]
+        parts = [self.literals[0]]
+        for (kind, key), literal in zip(self.slots, self.literals[1:]):
+            if kind == VALUE:
+                value = values.get(key)
+                if value is None:
+                    value = ""
+                elif isinstance(value, list):
+                    value = " ".join(value)
+            else:
+                value = key if instances is None else instances.get(key, key)
+            parts.append(escape(value) if markup else value)
+            parts.append(literal)
+        return "".join(parts)
+
+
+class TextRenderer:
+    """
+    Render the texts of a 1.1 or 1.2 benchmark.
+
+    Templates are cached per text element until the item index of the
+    benchmark is rebuilt, see :func:`cached_tree_index`. Changing a text, a plain-text or a value title in place
+    is not detected.
+
+    :param benchmark: The benchmark the texts belong to.
+    :param markup: Whether to render the xhtml elements of texts as
+        markup, escaping the text, rather than keeping their text only.
+    """
+
+    def __init__(self, benchmark, markup=False):
+        self.benchmark = benchmark
+        self.markup = markup
+        self._index = None
+
+    def compile(self, text):
+        """Return the :class:`Template` of a text element, or of a list of
+        them using the first one."""
+        if isinstance(text, list):
+            if not text:
+                return Template([""], [])
+            text = text[0]
+        self._prepare()
+        # The text is kept with its template so its id is not reused.
+        cached = self._templates.get(id(text))
+        if cached is None:
+            builder = _Builder()
+            self._walk(_content(text), builder, ())
+            cached = self._templates[id(text)] = (text, builder.template())
+        return cached[1]
+
+    def render(self, text, values=None, instances=None):
+        """
+        Render a text element.
+
+        :param text: A text element or a list of them, the first one being
+            rendered.
+        :param values: The values by id or a :class:`ProfileResolution`,
+            defaults to the values of the benchmark without a profile.
+        :param instances: The instance names by context, for fixes.
+        """
+        if values is None:
+            values = profile_resolver(self.benchmark).resolve()
+        if isinstance(values, ProfileResolution):
+            values = values.values
+        return self.compile(text).fill(values, instances, self.markup)
+
+    def _prepare(self):
+        index = cached_tree_index(self.benchmark, ITEM_FIELDS, "group")
+        plain_texts = cached_index(self.benchmark, [(self.benchmark, "plain_text")])
+        if index is not self._index or plain_texts is not self._plain_texts:
+            self._index = index
+            self._plain_texts = plain_texts
+            self._templates = {}
+
+    def _walk(self, content, builder, chain):
+        for part in content:
+            if isinstance(part, str):
+                builder.text(part, self.markup)
+            elif isinstance(part, AnyElement):
+                self._element(part, builder, chain)
+            elif hasattr(part, "idref"):
+                self._sub(part.idref, getattr(part, "use", None), builder, chain)
+            elif hasattr(part, "context"):
+                builder.slot(INSTANCE, part.context)
+
+    def _element(self, element, builder, chain):
+        name = element.qname.rpartition("}")[2]
+        if name == "sub":
+            attributes = element.attributes
+            self._sub(attributes.get("idref"), attributes.get("use"), builder, chain)
+        elif name == "instance":
+            builder.slot(INSTANCE, element.attributes.get("context", "undefined"))
+        else:
+            if self.markup:
+                attributes = "".join(
+                    f" {key.rpartition('}')[2]}={quoteattr(str(value))}"
+                    for key, value in element.attributes.items()
+                )
+                builder.literal(f"<{name}{attributes}>")
+            if element.text:
+                builder.text(element.text, self.markup)
+            self._walk(element.children, builder, chain)
+            if self.markup:
+                builder.literal(f"</{name}>")
+        if element.tail:
+            builder.text(element.tail, self.markup)
+
+    def _sub(self, idref, use, builder, chain):
+        use = getattr(use, "value", use) or "value"
+        plain_text = self._plain_texts.get(idref)
+        if plain_text is not None:
+            builder.text(plain_text.value or "", self.markup)
+            return
+
+        entry = self._index.get(idref)
+        if entry is None or entry[0] != "value":
+            return
+        if use != "title":
+            builder.slot(VALUE, idref)
+        elif idref not in chain and entry[1].title:
+            # Titles may hold substitutions too, which must not loop.
+            self._walk(_content(entry[1].title[0]), builder, chain + (idref,))
+
+
+class _Builder:
+    """Merge the consecutive literals of a template."""
+
+    def __init__(self):
+        self.literals = [[]]
+        self.slots = []
+
+    def text(self, text, markup):
+        self.literal(escape(text) if markup else text)
+
+    def literal(self, text):
+        self.literals[-1].append(text)
+
+    def slot(self, kind, key):
+        self.slots.append((kind, key))
+        self.literals.append([])
+
+    def template(self):
+        return Template(["".join(parts) for parts in self.literals], self.slots)
+
+
+def _content(text):
+    """Return the mixed content of a text element."""
+    for name in ("w3_org_1999_xhtml_element", "content"):
+        content = getattr(text, name, None)
+        if content:
+            return content
+    value = getattr(text, "value", None)
+    return [value] if isinstance(value, str) else []
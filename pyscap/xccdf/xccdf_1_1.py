@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from xsdata.models.datatype import XmlDate, XmlDateTime
 
+from .items import ItemLookup
 from .platform_0_2_3 import PlatformDefinitions
 from .xccdfp_1_1 import PlatformSpecification
 from ..common.utils import ParsableElement
@@ -2639,7 +2640,7 @@ class Group(GroupType):
 
 
 @dataclass
-class Benchmark(ParsableElement):
+class Benchmark(ItemLookup, ParsableElement):
     """The benchmark tag is the top level element representing a complete
     security checklist, including descriptive text, metadata, test items, and
     test results.
@@ -2853,13 +2854,3 @@ class Benchmark(ParsableElement):
             "namespace": "http://www.w3.org/XML/1998/namespace",
         }
     )
-
-    def find_rule(self, rule_id):
-        for rule in self.rule:
-            if rule.id == rule_id:
-                return rule
-        for group in self.group:
-            result = group.find_rule(rule_id)
-            if result is not None:
-                return result
-        return None
@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 
 from xsdata.models.datatype import XmlDate, XmlDateTime
 
+from .items import ItemLookup
 from ..common.utils import ParsableElement
 from ..cpe import PlatformSpecification
 
@@ -3247,7 +3248,7 @@ class Group(SelectableItem):
 
 
 @dataclass
-class Benchmark(ParsableElement):
+class Benchmark(ItemLookup, ParsableElement):
     """
 
     This is the root element of the XCCDF document; it must appear exactly once. It encloses the entire benchmark,
@@ -3463,13 +3464,3 @@ class Benchmark(ParsableElement):
             "namespace": "http://www.w3.org/XML/1998/namespace",
         }
     )
-
-    def find_rule(self, rule_id):
-        for rule in self.rule:
-            if rule.id == rule_id:
-                return rule
-        for group in self.group:
-            result = group.find_rule(rule_id)
-            if result is not None:
-                return result
-        return None